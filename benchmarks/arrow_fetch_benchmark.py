@@ -0,0 +1,72 @@
+import time
+
+import pandas as pd
+
+from config.db_config import DB_CONFIG
+from src.data_ingestion import active_fetch_backend, load_churn_data
+from src.sqlite_standin import build_standin, use_standin
+
+STANDIN_PATH = "benchmarks/results/arrow_fetch_standin.db"
+SIZES = [100_000, 500_000]
+REPEATS = 3
+
+
+def best_of(fn, repeats):
+    """Best-of-repeats wall time in seconds and the last result."""
+    timings = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        result = fn()
+        timings.append(time.perf_counter() - start)
+    return min(timings), result
+
+
+def run_benchmark(sizes=SIZES, repeats=REPEATS, path=STANDIN_PATH):
+    print("\n" + "="*60)
+    print("ARROW vs pd.read_sql FETCH BENCHMARK (SQLite stand-in)")
+    print("="*60)
+
+    results = []
+    configured = DB_CONFIG.get("fetch_backend", "pandas")
+    for n in sizes:
+        build_standin(n, path)
+        use_standin(path)
+
+        timings = {}
+        frames = {}
+        for backend in ["pandas", "arrow"]:
+            DB_CONFIG["fetch_backend"] = backend
+            if active_fetch_backend() != backend:
+                print("⚠️  Install adbc-driver-sqlite (arrow-odbc for SQL Server) to measure the Arrow path")
+                continue
+            print(f"\n🔄 {n:,} rows | {backend} fetch...")
+            timings[backend], frames[backend] = best_of(load_churn_data, repeats)
+            timings[backend + "_chunked"], _ = best_of(
+                lambda: load_churn_data(optimize_dtypes=True), repeats
+            )
+
+        row = {"rows": n}
+        row.update({f"{key}_s": round(value, 3) for key, value in timings.items()})
+        if "arrow" in frames:
+            # Both paths must hand the pipeline the same frame
+            pd.testing.assert_frame_equal(frames["pandas"], frames["arrow"])
+            row["speedup"] = round(timings["pandas"] / timings["arrow"], 2)
+            row["speedup_chunked"] = round(timings["pandas_chunked"] / timings["arrow_chunked"], 2)
+        results.append(row)
+
+    DB_CONFIG["fetch_backend"] = configured
+    results_df = pd.DataFrame(results)
+    print("\n" + results_df.to_string(index=False))
+    return results_df
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="pd.read_sql vs Arrow columnar fetch on the SQLite stand-in")
+    parser.add_argument("--sizes", nargs="+", type=int, default=SIZES)
+    parser.add_argument("--repeats", type=int, default=REPEATS)
+    parser.add_argument("--path", default=STANDIN_PATH)
+    args = parser.parse_args()
+
+    run_benchmark(args.sizes, args.repeats, args.path)
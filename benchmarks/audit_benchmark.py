@@ -0,0 +1,97 @@
+import os
+import shutil
+import time
+
+import numpy as np
+import pandas as pd
+
+RESULTS_DIR = "benchmarks/results"
+LOG_DIR = os.path.join(RESULTS_DIR, "audit_log")
+N_REQUESTS = 500
+N_APPENDS = 20_000
+
+from benchmarks.shadow_benchmark import latencies_ms, random_form
+from deployment.audit import BUFFER_ROWS, AuditLog, audit_summary, load_audit_log
+
+
+def append_throughput(n_appends=N_APPENDS, batch_rows=1, buffer_rows=BUFFER_ROWS):
+    """Appends per second straight into the ring, and whether every row reached disk."""
+    rng = np.random.default_rng(0)
+    frame = pd.DataFrame([random_form(rng) for _ in range(batch_rows)])
+    probs = rng.uniform(size=batch_rows)
+    audit = AuditLog(os.path.join(LOG_DIR, f"throughput_{batch_rows}_{buffer_rows}"), buffer_rows=buffer_rows)
+    timings = np.empty(n_appends)
+    for i in range(n_appends):
+        start = time.perf_counter()
+        audit.append("benchmark", frame, probs, "benchmark@0")
+        timings[i] = time.perf_counter() - start
+    close_start = time.perf_counter()
+    audit.close()
+    stats = audit.stats()
+    return {
+        "batch_rows": batch_rows,
+        "buffer_rows": buffer_rows,
+        "append_p50_us": round(float(np.percentile(timings, 50)) * 1e6, 1),
+        "append_p99_us": round(float(np.percentile(timings, 99)) * 1e6, 1),
+        "rows_per_s": int(n_appends * batch_rows / timings.sum()),
+        "close_s": round(time.perf_counter() - close_start, 3),
+        "written": stats["written"],
+        "overflowed": stats["overflowed"]
+    }
+
+
+def run_benchmark(n_requests=N_REQUESTS, n_appends=N_APPENDS):
+    print("\n" + "="*60)
+    print("PREDICTION AUDIT LOG BENCHMARK")
+    print("="*60)
+
+    shutil.rmtree(LOG_DIR, ignore_errors=True)
+    from fastapi.testclient import TestClient
+    import deployment.app as app_module
+
+    client = TestClient(app_module.app)
+    rng = np.random.default_rng(42)
+    forms = [random_form(rng) for _ in range(n_requests)]
+    app_module.shadow = None
+    latencies_ms(client, forms[:50])  # warm-up
+
+    previous = app_module.audit
+    app_module.audit = None
+    off = latencies_ms(client, forms)
+
+    app_module.audit = AuditLog(os.path.join(LOG_DIR, "requests"))
+    on = latencies_ms(client, forms)
+    app_module.audit.close()
+    stats = app_module.audit.stats()
+    app_module.audit = previous
+    assert stats["written"] == n_requests and stats["overflowed"] == 0
+
+    latency = pd.DataFrame([
+        {"mode": label, "p50_ms": round(float(np.percentile(t, 50)), 2), "p99_ms": round(float(np.percentile(t, 99)), 2)}
+        for label, t in [("audit off", off), ("audit on", on)]
+    ])
+    # The last case uses a ring far too small for the rate, so appends spill to the overflow list
+    throughput = pd.DataFrame([
+        append_throughput(n_appends, rows, buffer_rows)
+        for rows, buffer_rows in [(1, BUFFER_ROWS), (100, BUFFER_ROWS), (100, 1_000)]
+    ])
+    assert (throughput["written"] == n_appends * throughput["batch_rows"]).all()
+
+    summary = audit_summary(load_audit_log(os.path.join(LOG_DIR, "requests")))
+    print("\n" + latency.to_string(index=False))
+    print("\n" + throughput.to_string(index=False))
+    print(f"\n📊 Audited {summary['rows']} /predict rows: {summary['rows_by_risk']}")
+    print("\n✅ Every request was audited and every appended row was on disk after close(), "
+          "including rows that overflowed the ring")
+    return latency, throughput
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Request latency and append throughput of the audit log")
+    parser.add_argument("--requests", type=int, default=N_REQUESTS)
+    parser.add_argument("--appends", type=int, default=N_APPENDS)
+    args = parser.parse_args()
+
+    run_benchmark(args.requests, args.appends)
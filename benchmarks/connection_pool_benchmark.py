@@ -0,0 +1,116 @@
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+from src.data_ingestion import ConnectionPool, build_query, get_connection
+from src.sqlite_standin import build_standin, use_standin
+
+STANDIN_PATH = "benchmarks/results/connection_pool_standin.db"
+N_ROWS = 20_000
+N_QUERIES = 2000
+THREADS = [1, 8]
+POOL_SIZE = 4
+
+# SQLite opens a connection in microseconds; SQL Server pays a TLS + auth
+# handshake. This sleep models that cost so the pool's effect is visible.
+CONNECT_LATENCY_MS = 20.0
+
+
+def slow_factory(latency_ms):
+    def factory():
+        time.sleep(latency_ms / 1000)
+        return get_connection()
+    return factory
+
+
+def lookup(conn, customer_id):
+    """The online-lookup pattern: one customer's deployment features."""
+    query, params = build_query(
+        "vw_churn_deployment_features", filters=[("customer_id", "==", customer_id)]
+    )
+    cursor = conn.cursor()
+    cursor.execute(query, params)
+    rows = cursor.fetchall()
+    cursor.close()
+    return rows
+
+
+def run_mode(mode, customer_ids, threads, latency_ms):
+    """Per-query latencies (ms) and wall time for fresh vs pooled connections."""
+    factory = slow_factory(latency_ms)
+    pool = ConnectionPool(factory=factory, max_size=POOL_SIZE) if mode == "pooled" else None
+
+    def one(customer_id):
+        start = time.perf_counter()
+        if pool is None:
+            conn = factory()
+            try:
+                lookup(conn, customer_id)
+            finally:
+                conn.close()
+        else:
+            with pool.connection() as conn:
+                lookup(conn, customer_id)
+        return (time.perf_counter() - start) * 1000
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=threads) as executor:
+        latencies = np.array(list(executor.map(one, customer_ids)))
+    wall = time.perf_counter() - start
+
+    stats = pool.stats() if pool else None
+    if pool:
+        pool.close()
+    return latencies, wall, stats
+
+
+def run_benchmark(n_queries=N_QUERIES, threads_list=THREADS, latency_ms=CONNECT_LATENCY_MS,
+                  n_rows=N_ROWS, path=STANDIN_PATH):
+    print("\n" + "="*60)
+    print("CONNECTION POOL BENCHMARK (SQLite stand-in)")
+    print("="*60)
+    print(f"\n🔌 Simulated connect latency: {latency_ms} ms | pool max_size: {POOL_SIZE}")
+
+    build_standin(n_rows, path)
+    use_standin(path)
+
+    rng = np.random.default_rng(42)
+    with get_connection() as conn:
+        all_ids = pd.read_sql("SELECT customer_id FROM vw_churn_deployment_features", conn)["customer_id"]
+    customer_ids = list(rng.choice(all_ids.to_numpy(), n_queries))
+
+    results = []
+    for threads in threads_list:
+        for mode in ["fresh", "pooled"]:
+            print(f"\n🔄 {mode} connections | {threads} thread(s) | {n_queries} lookups...")
+            latencies, wall, stats = run_mode(mode, customer_ids, threads, latency_ms)
+            results.append({
+                "mode": mode,
+                "threads": threads,
+                "p50_ms": round(float(np.percentile(latencies, 50)), 3),
+                "p99_ms": round(float(np.percentile(latencies, 99)), 3),
+                "queries_per_s": round(n_queries / wall, 1),
+                "connections_opened": n_queries if stats is None else stats["created"]
+            })
+            if stats:
+                print(f"   📊 Pool stats: {stats}")
+
+    results_df = pd.DataFrame(results)
+    print("\n" + results_df.to_string(index=False))
+    return results_df
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Fresh vs pooled connections for small lookups")
+    parser.add_argument("--queries", type=int, default=N_QUERIES)
+    parser.add_argument("--threads", nargs="+", type=int, default=THREADS)
+    parser.add_argument("--connect-latency-ms", type=float, default=CONNECT_LATENCY_MS)
+    parser.add_argument("--rows", type=int, default=N_ROWS)
+    parser.add_argument("--path", default=STANDIN_PATH)
+    args = parser.parse_args()
+
+    run_benchmark(args.queries, args.threads, args.connect_latency_ms, args.rows, args.path)
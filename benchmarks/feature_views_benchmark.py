@@ -0,0 +1,60 @@
+import sqlite3
+import time
+
+import pandas as pd
+
+from src.feature_views import SOURCE_TABLES, build_feature_views
+from src.sqlite_standin import build_standin
+from src.synthetic_data import AS_OF_DATE
+
+STANDIN_PATH = "benchmarks/results/feature_views_standin.db"
+SIZES = [100_000, 500_000]
+WORKERS = [1, 4]
+
+
+def run_benchmark(sizes=SIZES, workers_list=WORKERS, path=STANDIN_PATH):
+    print("\n" + "="*60)
+    print("IN-PROCESS FEATURE VIEWS vs SQL VIEWS (SQLite stand-in)")
+    print("="*60)
+
+    results = []
+    for n in sizes:
+        build_standin(n, path)
+        with sqlite3.connect(path) as conn:
+            tables = {table: pd.read_sql(f"SELECT * FROM {table}", conn) for table in SOURCE_TABLES}
+
+            print(f"\n🔄 {n:,} customers | SQL view...")
+            start = time.perf_counter()
+            expected = pd.read_sql("SELECT * FROM vw_churn_training_features", conn)
+            sql_s = time.perf_counter() - start
+        expected = expected.sort_values("customer_id", ignore_index=True)
+
+        row = {"customers": n, "sql_view_s": round(sql_s, 3)}
+        for workers in workers_list:
+            print(f"🔄 {n:,} customers | in-process, {workers} worker(s)...")
+            start = time.perf_counter()
+            views = build_feature_views(tables, AS_OF_DATE, workers=workers)
+            row[f"in_process_w{workers}_s"] = round(time.perf_counter() - start, 3)
+
+            # Same rows and values as the SQL definition (AVG rounding aside)
+            built = views["vw_churn_training_features"].sort_values("customer_id", ignore_index=True)
+            pd.testing.assert_frame_equal(built, expected, check_exact=False)
+
+        results.append(row)
+
+    results_df = pd.DataFrame(results)
+    print("\n" + results_df.to_string(index=False))
+    print("\n✅ In-process views matched the SQL views at every size")
+    return results_df
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="In-process feature views vs the SQL views")
+    parser.add_argument("--sizes", nargs="+", type=int, default=SIZES)
+    parser.add_argument("--workers", nargs="+", type=int, default=WORKERS)
+    parser.add_argument("--path", default=STANDIN_PATH)
+    args = parser.parse_args()
+
+    run_benchmark(args.sizes, args.workers, args.path)
@@ -0,0 +1,323 @@
+import asyncio
+import json
+import os
+import platform
+import subprocess
+import sys
+import time
+from datetime import datetime
+
+import httpx
+import numpy as np
+
+RESULTS_DIR = "benchmarks/results"
+RESULTS_PATH = os.path.join(RESULTS_DIR, "load_test.json")
+
+HOST = "127.0.0.1"
+PORT = 8765
+STARTUP_TIMEOUT = 60
+REQUEST_TIMEOUT = 10.0
+
+WORKERS = [1]
+RATES = [50]            # target requests per second (open loop)
+DURATION = 20           # seconds per configuration
+ENDPOINTS = ["predict", "predict_batch"]
+BATCH_SIZE = 100
+INVALID_FRACTION = 0.10
+RANDOM_STATE = 42
+
+# Form values accepted by /predict (see deployment/app.py VALID_CONTRACTS / VALID_PAYMENTS)
+CONTRACTS = ["month-to-month", "one year", "two year"]
+PAYMENTS = ["electronic check", "credit card", "bank transfer", "mailed check"]
+
+# Each invalid payload breaks exactly one /predict validation rule
+INVALID_MUTATIONS = [
+    ("tenure_months", 0),
+    ("tenure_months", 80),
+    ("monthly_charges", 10.0),
+    ("monthly_charges", 150.0),
+    ("support_ticket_count", 9),
+    ("avg_call_minutes", 300.0),
+    ("avg_data_usage_gb", 45.0),
+    ("contract_type", "weekly"),
+    ("payment_method", "bitcoin"),
+]
+
+
+# ============================================================================
+# PAYLOADS
+# ============================================================================
+def valid_customer(rng):
+    """A customer inside every /predict validation range."""
+    return {
+        "tenure_months": int(rng.integers(1, 76)),
+        "contract_type": str(rng.choice(CONTRACTS)),
+        "monthly_charges": round(float(rng.uniform(19, 119)), 2),
+        "payment_method": str(rng.choice(PAYMENTS)),
+        "support_ticket_count": int(rng.integers(0, 8)),
+        "avg_call_minutes": round(float(rng.uniform(0, 275)), 1),
+        "avg_data_usage_gb": round(float(rng.uniform(0, 30)), 2)
+    }
+
+
+def invalid_customer(rng):
+    customer = valid_customer(rng)
+    field, value = INVALID_MUTATIONS[rng.integers(len(INVALID_MUTATIONS))]
+    customer[field] = value
+    return customer
+
+
+def build_requests(endpoint, n_requests, rng, batch_size=BATCH_SIZE, invalid_fraction=INVALID_FRACTION):
+    """
+    (path, kwargs, expected status) per request. An invalid /predict_batch
+    request carries one bad customer, which rejects the whole batch.
+    """
+    requests = []
+    for _ in range(n_requests):
+        invalid = rng.random() < invalid_fraction
+        if endpoint == "predict":
+            customer = invalid_customer(rng) if invalid else valid_customer(rng)
+            requests.append(("/predict", {"data": customer}, 400 if invalid else 200))
+        else:
+            batch = [valid_customer(rng) for _ in range(batch_size)]
+            if invalid:
+                batch[rng.integers(batch_size)] = invalid_customer(rng)
+            requests.append(("/predict_batch", {"json": batch}, 400 if invalid else 200))
+    return requests
+
+
+# ============================================================================
+# SERVER
+# ============================================================================
+def start_server(workers, port=PORT):
+    """Start deployment.app under uvicorn and wait until /health answers."""
+    process = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "deployment.app:app",
+         "--host", HOST, "--port", str(port), "--workers", str(workers), "--log-level", "warning"],
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL
+    )
+
+    deadline = time.time() + STARTUP_TIMEOUT
+    while time.time() < deadline:
+        if process.poll() is not None:
+            raise RuntimeError(f"uvicorn exited with code {process.returncode}")
+        try:
+            if httpx.get(f"http://{HOST}:{port}/health", timeout=1.0).status_code == 200:
+                return process
+        except httpx.HTTPError:
+            pass
+        time.sleep(0.25)
+
+    stop_server(process)
+    raise RuntimeError(f"Server did not become healthy within {STARTUP_TIMEOUT}s")
+
+
+def stop_server(process):
+    process.terminate()
+    try:
+        process.wait(timeout=15)
+    except subprocess.TimeoutExpired:
+        process.kill()
+        process.wait()
+
+
+# ============================================================================
+# OPEN-LOOP LOAD
+# ============================================================================
+async def send(client, scheduled_at, path, kwargs, expected):
+    """
+    Fire one request at its scheduled time. Latency is measured from the
+    scheduled time, so queueing behind a slow server counts against it
+    (no coordinated omission).
+    """
+    delay = scheduled_at - time.perf_counter()
+    if delay > 0:
+        await asyncio.sleep(delay)
+    try:
+        response = await client.post(path, **kwargs)
+        status = response.status_code
+    except httpx.TimeoutException:
+        status = "timeout"
+    except httpx.HTTPError as e:
+        status = type(e).__name__
+    return (time.perf_counter() - scheduled_at) * 1000, status, expected
+
+
+async def drive(requests, rate, rng, port=PORT):
+    """Send requests with Poisson arrivals at `rate` per second."""
+    arrivals = np.cumsum(rng.exponential(1.0 / rate, len(requests)))
+    limits = httpx.Limits(max_connections=1000, max_keepalive_connections=100)
+
+    async with httpx.AsyncClient(base_url=f"http://{HOST}:{port}", timeout=REQUEST_TIMEOUT,
+                                 limits=limits) as client:
+        start = time.perf_counter() + 0.1
+        tasks = [
+            asyncio.create_task(send(client, start + offset, path, kwargs, expected))
+            for offset, (path, kwargs, expected) in zip(arrivals, requests)
+        ]
+        results = await asyncio.gather(*tasks)
+        elapsed = time.perf_counter() - start
+
+    return results, elapsed
+
+
+def summarize(results, elapsed):
+    """Latency percentiles (ms), status counts, errors and achieved RPS."""
+    latencies = np.array([latency for latency, status, _ in results if isinstance(status, int)])
+    status_counts = {}
+    for _, status, _ in results:
+        status_counts[str(status)] = status_counts.get(str(status), 0) + 1
+
+    unexpected = sum(1 for _, status, expected in results if status != expected)
+    transport_errors = sum(1 for _, status, _ in results if not isinstance(status, int))
+    completed = len(latencies)
+
+    def pct(q):
+        return round(float(np.percentile(latencies, q)), 2) if completed else None
+
+    return {
+        "requests": len(results),
+        "completed": completed,
+        "achieved_rps": round(completed / max(elapsed, 1e-9), 2),
+        "latency_ms": {
+            "p50": pct(50),
+            "p95": pct(95),
+            "p99": pct(99),
+            "p999": pct(99.9),
+            "max": round(float(latencies.max()), 2) if completed else None,
+            "mean": round(float(latencies.mean()), 2) if completed else None
+        },
+        "status_counts": dict(sorted(status_counts.items())),
+        "errors": {
+            "unexpected_status": unexpected,
+            "transport": transport_errors
+        }
+    }
+
+
+def run_configuration(endpoint, workers, rate, duration, batch_size, invalid_fraction, seed, port=PORT):
+    """One (endpoint, workers, rate) measurement against a fresh server."""
+    rng = np.random.default_rng([seed, workers, int(rate), ENDPOINTS.index(endpoint)])
+    requests = build_requests(endpoint, int(rate * duration), rng, batch_size, invalid_fraction)
+
+    process = start_server(workers, port)
+    try:
+        # Warm up every worker's model and the client connections
+        warmup = build_requests(endpoint, max(10, workers * 5), rng, batch_size, 0.0)
+        asyncio.run(drive(warmup, rate, rng, port))
+        results, elapsed = asyncio.run(drive(requests, rate, rng, port))
+    finally:
+        stop_server(process)
+
+    summary = summarize(results, elapsed)
+    return {
+        "endpoint": endpoint,
+        "workers": workers,
+        "target_rps": rate,
+        "duration_s": duration,
+        "batch_size": batch_size if endpoint == "predict_batch" else 1,
+        "invalid_fraction": invalid_fraction,
+        **summary
+    }
+
+
+# ============================================================================
+# REPORT
+# ============================================================================
+def compare_reports(previous, current):
+    """Print p50/p99 latency and achieved RPS changes per matching configuration."""
+    def key(c):
+        return (c["endpoint"], c["workers"], c["target_rps"], c["batch_size"])
+
+    old = {key(c): c for c in previous.get("configurations", [])}
+    print(f"\n🔍 Compared with: {previous.get('label') or previous.get('created_at')}")
+    for config in current["configurations"]:
+        base = old.get(key(config))
+        if base is None:
+            continue
+        changes = []
+        for metric in ["p50", "p99"]:
+            before, after = base["latency_ms"][metric], config["latency_ms"][metric]
+            if before and after:
+                changes.append(f"{metric} {before:.1f} -> {after:.1f} ms ({after / before:.2f}x)")
+        changes.append(f"rps {base['achieved_rps']} -> {config['achieved_rps']}")
+        print(f"   {config['endpoint']} w={config['workers']} @ {config['target_rps']} rps: " + ", ".join(changes))
+
+
+def run_load_test(workers=WORKERS, rates=RATES, endpoints=ENDPOINTS, duration=DURATION,
+                  batch_size=BATCH_SIZE, invalid_fraction=INVALID_FRACTION, seed=RANDOM_STATE,
+                  label=None, output_path=RESULTS_PATH, compare_path=None):
+    print("\n" + "="*60)
+    print("DEPLOYMENT LOAD TEST")
+    print("="*60)
+    print(f"\n🎯 Endpoints: {endpoints} | Workers: {workers} | Target RPS: {rates}")
+    print(f"⏱️  Duration: {duration}s per configuration | Invalid payloads: {invalid_fraction:.0%}")
+
+    configurations = []
+    for endpoint in endpoints:
+        for n_workers in workers:
+            for rate in rates:
+                print(f"\n🚀 {endpoint} | workers={n_workers} | {rate} rps ...")
+                config = run_configuration(endpoint, n_workers, rate, duration,
+                                           batch_size, invalid_fraction, seed)
+                configurations.append(config)
+                latency = config["latency_ms"]
+                print(f"   p50 {latency['p50']} ms | p95 {latency['p95']} ms | p99 {latency['p99']} ms | "
+                      f"p999 {latency['p999']} ms")
+                print(f"   achieved {config['achieved_rps']} rps | "
+                      f"unexpected status {config['errors']['unexpected_status']} | "
+                      f"transport errors {config['errors']['transport']}")
+
+    report = {
+        "label": label,
+        "created_at": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+        "host": {
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "cpu_count": os.cpu_count()
+        },
+        "seed": seed,
+        "configurations": configurations
+    }
+
+    os.makedirs(os.path.dirname(output_path), exist_ok=True)
+    with open(output_path, "w") as f:
+        json.dump(report, f, indent=2, sort_keys=True)
+    print(f"\n✅ Report saved to: {output_path}")
+
+    if compare_path:
+        with open(compare_path) as f:
+            compare_reports(json.load(f), report)
+
+    return report
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Open-loop load test for deployment/app.py")
+    parser.add_argument("--workers", nargs="+", type=int, default=WORKERS)
+    parser.add_argument("--rates", nargs="+", type=float, default=RATES)
+    parser.add_argument("--endpoints", nargs="+", choices=ENDPOINTS, default=ENDPOINTS)
+    parser.add_argument("--duration", type=float, default=DURATION)
+    parser.add_argument("--batch-size", type=int, default=BATCH_SIZE)
+    parser.add_argument("--invalid-fraction", type=float, default=INVALID_FRACTION)
+    parser.add_argument("--seed", type=int, default=RANDOM_STATE)
+    parser.add_argument("--label", default=None, help="Release tag stored in the report")
+    parser.add_argument("--output", default=RESULTS_PATH)
+    parser.add_argument("--compare", default=None, help="Previous report to compare against")
+    args = parser.parse_args()
+
+    run_load_test(
+        workers=args.workers,
+        rates=args.rates,
+        endpoints=args.endpoints,
+        duration=args.duration,
+        batch_size=args.batch_size,
+        invalid_fraction=args.invalid_fraction,
+        seed=args.seed,
+        label=args.label,
+        output_path=args.output,
+        compare_path=args.compare
+    )
@@ -0,0 +1,381 @@
+import gc
+import json
+import os
+import platform
+import resource
+import subprocess
+import sys
+import shutil
+import tempfile
+import time
+from datetime import datetime
+
+import joblib
+import numpy as np
+import pandas as pd
+
+from src.data_cleaning import clean_data, compute_cap_bounds
+from src.feature_engineering import engineer_features
+from src.encoding_scaling import encode_and_scale
+from src.model_training import build_models
+from src.threshold_tuning import threshold_metrics
+from src.batch_scoring import run_batch_scoring
+from src.synthetic_data import write_synthetic_parquet, RANDOM_STATE
+
+RESULTS_DIR = "benchmarks/results"
+RESULTS_PATH = os.path.join(RESULTS_DIR, "pipeline_benchmark.json")
+BASELINE_PATH = os.path.join(RESULTS_DIR, "pipeline_baseline.json")
+
+# Synthetic inputs are generated once per size and reused across stages
+DATA_CACHE_DIR = "data/synthetic/benchmark"
+
+SIZES = [10_000, 100_000, 1_000_000, 10_000_000]
+
+# Training all five models is far slower than the other stages; cap its size
+STAGE_MAX_ROWS = {"train_models": 1_000_000}
+
+# A stage regresses when wall time or peak RSS grows by more than this fraction
+TOLERANCE = 0.25
+# Wall-time comparisons below this many seconds are dominated by noise
+MIN_WALL_SECONDS = 0.05
+
+TRAIN_SAMPLE_ROWS = 10_000
+
+
+# ============================================================================
+# SYNTHETIC INPUTS
+# ============================================================================
+def input_path(n_rows, seed=RANDOM_STATE):
+    """Parquet directory of the synthetic training view for n_rows, generating it once."""
+    root = os.path.join(DATA_CACHE_DIR, f"rows-{n_rows}-seed-{seed}")
+    path = os.path.join(root, "vw_churn_training_features")
+    if not os.path.isdir(path):
+        write_synthetic_parquet(n_rows, output_dir=root, seed=seed, workers=os.cpu_count())
+    return path
+
+
+def load_input(n_rows, seed=RANDOM_STATE):
+    return pd.read_parquet(input_path(n_rows, seed))
+
+
+def fit_sample_model(df):
+    """LogisticRegression pipeline fitted on a small engineered sample (setup only)."""
+    X, y, preprocessor, _ = encode_and_scale(df.head(TRAIN_SAMPLE_ROWS))
+    model = build_models(preprocessor, scale_pos_weight=1.0)["LogisticRegression"]
+    return model.fit(X, y)
+
+
+# ============================================================================
+# STAGES: setup (untimed) returns the arguments of run (timed)
+# ============================================================================
+def setup_clean_data(n_rows, seed):
+    return (load_input(n_rows, seed),)
+
+
+def run_clean_data(df):
+    clean_data(df)
+
+
+def setup_engineer_features(n_rows, seed):
+    return (clean_data(load_input(n_rows, seed)),)
+
+
+def run_engineer_features(df):
+    engineer_features(df)
+
+
+def setup_encode_and_scale(n_rows, seed):
+    return (engineer_features(clean_data(load_input(n_rows, seed))),)
+
+
+def run_encode_and_scale(df):
+    X, y, preprocessor, _ = encode_and_scale(df)
+    preprocessor.fit_transform(X)
+
+
+def setup_train_models(n_rows, seed):
+    X, y, preprocessor, _ = encode_and_scale(engineer_features(clean_data(load_input(n_rows, seed))))
+    scale_pos_weight = y.value_counts()[0] / y.value_counts()[1]
+    return X, y, build_models(preprocessor, scale_pos_weight)
+
+
+def run_train_models(X, y, models):
+    for pipeline in models.values():
+        pipeline.fit(X, y)
+
+
+def setup_threshold_tuning(n_rows, seed):
+    df = engineer_features(clean_data(load_input(n_rows, seed)))
+    model = fit_sample_model(df)
+    X, y, _, _ = encode_and_scale(df)
+    return y.to_numpy(), model.predict_proba(X)[:, 1], np.arange(0.1, 0.9, 0.01)
+
+
+def run_threshold_tuning(y_true, y_prob, thresholds):
+    threshold_metrics(y_true, y_prob, thresholds)
+
+
+# Scratch directories created by stage setups, removed once the stage is measured
+_work_dirs = []
+
+
+def setup_batch_scoring(n_rows, seed):
+    source = input_path(n_rows, seed)
+    sample = pd.read_parquet(input_path(TRAIN_SAMPLE_ROWS, seed))
+    model = fit_sample_model(engineer_features(clean_data(sample)))
+
+    work_dir = tempfile.mkdtemp(prefix="batch_scoring_bench_")
+    _work_dirs.append(work_dir)
+    model_path = os.path.join(work_dir, "model.joblib")
+    joblib.dump({"model": model}, model_path)
+
+    # Frozen bounds, as the batch scorer would get from the dashboard build state
+    bounds_path = os.path.join(work_dir, "cap_bounds.json")
+    with open(bounds_path, "w") as f:
+        json.dump(compute_cap_bounds(clean_data(sample)), f)
+    return source, model_path, os.path.join(work_dir, "scores"), bounds_path
+
+
+def run_batch_scoring_stage(source, model_path, output_dir, bounds_path):
+    with open(bounds_path) as f:
+        cap_bounds = json.load(f)
+    run_batch_scoring(source=source, model_path=model_path, output_dir=output_dir,
+                      restart=True, cap_bounds=cap_bounds)
+
+
+STAGES = {
+    "clean_data": (setup_clean_data, run_clean_data),
+    "engineer_features": (setup_engineer_features, run_engineer_features),
+    "encode_and_scale": (setup_encode_and_scale, run_encode_and_scale),
+    "train_models": (setup_train_models, run_train_models),
+    "threshold_tuning": (setup_threshold_tuning, run_threshold_tuning),
+    "batch_scoring": (setup_batch_scoring, run_batch_scoring_stage),
+}
+
+
+# ============================================================================
+# MEASUREMENT (runs inside a fresh subprocess per stage and size)
+# ============================================================================
+def reset_peak_rss():
+    """Reset the kernel's peak-RSS counter so setup memory is not attributed to the stage."""
+    try:
+        with open("/proc/self/clear_refs", "w") as f:
+            f.write("5")
+        return True
+    except OSError:
+        return False
+
+
+def read_rss_mb(field):
+    """VmRSS / VmHWM from /proc/self/status in MB (None when unavailable)."""
+    try:
+        with open("/proc/self/status") as f:
+            for line in f:
+                if line.startswith(field + ":"):
+                    return int(line.split()[1]) / 1024
+    except OSError:
+        pass
+    return None
+
+
+def cpu_seconds(usage):
+    return usage.ru_utime + usage.ru_stime
+
+
+def measure_stage(stage, n_rows, seed=RANDOM_STATE):
+    """Run one stage once and return wall/CPU time, peak RSS and throughput."""
+    setup, run = STAGES[stage]
+    try:
+        return _measure(run, setup(n_rows, seed), stage, n_rows)
+    finally:
+        while _work_dirs:
+            shutil.rmtree(_work_dirs.pop(), ignore_errors=True)
+
+
+def _measure(run, args, stage, n_rows):
+    gc.collect()
+
+    peak_reset = reset_peak_rss()
+    rss_before = read_rss_mb("VmRSS")
+    self_before = resource.getrusage(resource.RUSAGE_SELF)
+    children_before = resource.getrusage(resource.RUSAGE_CHILDREN)
+    start = time.perf_counter()
+
+    run(*args)
+
+    wall = time.perf_counter() - start
+    self_after = resource.getrusage(resource.RUSAGE_SELF)
+    children_after = resource.getrusage(resource.RUSAGE_CHILDREN)
+
+    peak_self = read_rss_mb("VmHWM") if peak_reset else self_after.ru_maxrss / 1024
+    peak_children = children_after.ru_maxrss / 1024
+
+    return {
+        "stage": stage,
+        "rows": n_rows,
+        "wall_seconds": round(wall, 4),
+        "cpu_seconds": round(
+            cpu_seconds(self_after) - cpu_seconds(self_before)
+            + cpu_seconds(children_after) - cpu_seconds(children_before), 4
+        ),
+        "rss_before_mb": round(rss_before, 1) if rss_before is not None else None,
+        "peak_rss_mb": round(max(peak_self, peak_children), 1),
+        "rows_per_second": round(n_rows / max(wall, 1e-9), 1)
+    }
+
+
+def run_in_subprocess(stage, n_rows, seed, timeout, verbose):
+    """Measure a stage in a fresh interpreter so peak RSS and caches are isolated."""
+    with tempfile.NamedTemporaryFile(suffix=".json", delete=False) as f:
+        result_path = f.name
+
+    command = [
+        sys.executable, "-m", "benchmarks.pipeline_benchmark",
+        "--measure", stage, "--rows", str(n_rows), "--seed", str(seed), "--result-file", result_path
+    ]
+    output = None if verbose else subprocess.DEVNULL
+    try:
+        completed = subprocess.run(command, stdout=output, stderr=output, timeout=timeout)
+        if completed.returncode != 0:
+            return {"stage": stage, "rows": n_rows, "error": f"exit code {completed.returncode}"}
+        with open(result_path) as f:
+            return json.load(f)
+    except subprocess.TimeoutExpired:
+        return {"stage": stage, "rows": n_rows, "error": f"timeout after {timeout}s"}
+    finally:
+        os.remove(result_path)
+
+
+# ============================================================================
+# SUITE + BASELINE COMPARISON
+# ============================================================================
+def compare_to_baseline(results, baseline, tolerance=TOLERANCE):
+    """List of regressions: wall time or peak RSS above baseline * (1 + tolerance)."""
+    previous = {(r["stage"], r["rows"]): r for r in baseline.get("results", []) if "error" not in r}
+    regressions = []
+
+    for result in results:
+        base = previous.get((result["stage"], result["rows"]))
+        if base is None or "error" in result:
+            continue
+        for metric in ["wall_seconds", "peak_rss_mb"]:
+            if metric == "wall_seconds" and max(result[metric], base[metric]) < MIN_WALL_SECONDS:
+                continue
+            ratio = result[metric] / max(base[metric], 1e-9)
+            result[f"{metric}_vs_baseline"] = round(ratio, 3)
+            if ratio > 1 + tolerance:
+                regressions.append({
+                    "stage": result["stage"],
+                    "rows": result["rows"],
+                    "metric": metric,
+                    "baseline": base[metric],
+                    "current": result[metric],
+                    "ratio": round(ratio, 3)
+                })
+    return regressions
+
+
+def run_suite(stages=None, sizes=SIZES, repeats=1, seed=RANDOM_STATE, tolerance=TOLERANCE,
+              timeout=None, update_baseline=False, verbose=False):
+    print("\n" + "="*60)
+    print("PIPELINE BENCHMARK SUITE")
+    print("="*60)
+
+    stages = stages or list(STAGES)
+    print(f"\n🧪 Stages: {stages}")
+    print(f"📊 Sizes: {sizes} | Repeats: {repeats} | Seed: {seed}")
+
+    results = []
+    for stage in stages:
+        for n_rows in sizes:
+            if n_rows > STAGE_MAX_ROWS.get(stage, n_rows):
+                print(f"   ⏭️  {stage} @ {n_rows}: above the stage's size cap, skipped")
+                continue
+
+            # Keep the fastest repeat; each repeat is its own process
+            runs = [run_in_subprocess(stage, n_rows, seed, timeout, verbose) for _ in range(repeats)]
+            ok = [r for r in runs if "error" not in r]
+            result = min(ok, key=lambda r: r["wall_seconds"]) if ok else runs[0]
+            results.append(result)
+
+            if "error" in result:
+                print(f"   ❌ {stage} @ {n_rows}: {result['error']}")
+            else:
+                print(f"   ✅ {stage} @ {n_rows}: {result['wall_seconds']:.3f}s wall, "
+                      f"{result['cpu_seconds']:.3f}s CPU, {result['peak_rss_mb']:.0f} MB peak, "
+                      f"{result['rows_per_second']:.0f} rows/s")
+
+    regressions = []
+    if os.path.exists(BASELINE_PATH) and not update_baseline:
+        with open(BASELINE_PATH) as f:
+            regressions = compare_to_baseline(results, json.load(f), tolerance)
+
+    report = {
+        "created_at": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+        "host": {
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "cpu_count": os.cpu_count()
+        },
+        "seed": seed,
+        "tolerance": tolerance,
+        "results": results,
+        "regressions": regressions
+    }
+
+    os.makedirs(RESULTS_DIR, exist_ok=True)
+    with open(RESULTS_PATH, "w") as f:
+        json.dump(report, f, indent=2)
+    print(f"\n✅ Results saved to: {RESULTS_PATH}")
+
+    if update_baseline:
+        with open(BASELINE_PATH, "w") as f:
+            json.dump(report, f, indent=2)
+        print(f"📌 Baseline updated: {BASELINE_PATH}")
+    elif not os.path.exists(BASELINE_PATH):
+        print("ℹ️  No baseline found - run with --update-baseline to store one")
+    elif regressions:
+        print(f"\n⚠️  {len(regressions)} regression(s) beyond {tolerance:.0%}:")
+        for r in regressions:
+            print(f"   {r['stage']} @ {r['rows']}: {r['metric']} "
+                  f"{r['baseline']} -> {r['current']} ({r['ratio']:.2f}x)")
+    else:
+        print(f"\n✅ No regressions beyond {tolerance:.0%} against the baseline")
+
+    return report
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Benchmark pipeline stages across data sizes")
+    parser.add_argument("--stages", nargs="+", choices=list(STAGES), default=None)
+    parser.add_argument("--sizes", nargs="+", type=int, default=SIZES)
+    parser.add_argument("--repeats", type=int, default=1)
+    parser.add_argument("--seed", type=int, default=RANDOM_STATE)
+    parser.add_argument("--tolerance", type=float, default=TOLERANCE)
+    parser.add_argument("--timeout", type=int, default=None, help="Per-measurement timeout in seconds")
+    parser.add_argument("--update-baseline", action="store_true")
+    parser.add_argument("--verbose", action="store_true", help="Show stage output")
+    # Internal: measure a single stage in this process
+    parser.add_argument("--measure", choices=list(STAGES), help=argparse.SUPPRESS)
+    parser.add_argument("--rows", type=int, help=argparse.SUPPRESS)
+    parser.add_argument("--result-file", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.measure:
+        result = measure_stage(args.measure, args.rows, args.seed)
+        with open(args.result_file, "w") as f:
+            json.dump(result, f)
+    else:
+        report = run_suite(
+            stages=args.stages,
+            sizes=args.sizes,
+            repeats=args.repeats,
+            seed=args.seed,
+            tolerance=args.tolerance,
+            timeout=args.timeout,
+            update_baseline=args.update_baseline,
+            verbose=args.verbose
+        )
+        sys.exit(1 if report["regressions"] else 0)
@@ -0,0 +1,91 @@
+import time
+import joblib
+import numpy as np
+import pandas as pd
+
+from deployment.reason_codes import ReasonCodeExplainer, TOP_K
+
+MODEL_PATH = "artifacts/churn_deployment_model.joblib"
+BATCH_SIZES = [1, 100, 1000, 10000]
+MAX_OVERHEAD_PCT = 5.0
+
+
+def make_batch(n, seed=42):
+    """Random customers inside the /predict validation ranges."""
+    rng = np.random.default_rng(seed)
+    return pd.DataFrame({
+        "tenure_months": rng.integers(1, 76, n),
+        "contract_type": rng.choice(["Month-to-month", "One year", "Two year"], n),
+        "monthly_charges": rng.uniform(19, 119, n),
+        "payment_method": rng.choice([
+            "Electronic check", "Mailed check",
+            "Bank transfer (automatic)", "Credit card (automatic)"
+        ], n),
+        "support_ticket_count": rng.integers(0, 8, n),
+        "avg_call_minutes": rng.uniform(0, 275, n),
+        "avg_data_usage_gb": rng.uniform(0, 30, n)
+    })
+
+
+def time_call(fn, repeats):
+    """Best-of-repeats wall time of fn() in milliseconds (robust to noisy hosts)."""
+    timings = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        fn()
+        timings.append((time.perf_counter() - start) * 1000)
+    return float(np.min(timings))
+
+
+def run_benchmark():
+    print("\n" + "="*60)
+    print("REASON CODE LATENCY BENCHMARK")
+    print("="*60)
+
+    model = joblib.load(MODEL_PATH)["model"]
+    explainer = ReasonCodeExplainer(model)
+
+    results = []
+    for n in BATCH_SIZES:
+        df = make_batch(n)
+        repeats = 500 if n <= 1000 else 50
+
+        # Sanity check: contributions + intercept reproduce the model's logit exactly
+        probs, top, top_values = explainer.predict_with_reasons(df)
+        np.testing.assert_allclose(probs, model.predict_proba(df)[:, 1], rtol=1e-10)
+        logit = explainer.contributions(explainer.preprocessor.transform(df)).sum(axis=1)
+        np.testing.assert_allclose(
+            logit + explainer.clf.intercept_[0],
+            explainer.clf.decision_function(explainer.preprocessor.transform(df)),
+            rtol=1e-10
+        )
+
+        baseline_ms = time_call(lambda: model.predict_proba(df), repeats)
+        explained_ms = time_call(lambda: explainer.predict_with_reasons(df, top_k=TOP_K), repeats)
+        overhead = (explained_ms - baseline_ms) / baseline_ms * 100
+
+        # JSON-ready dicts are built once per response; reported separately
+        format_ms = time_call(lambda: explainer.format_reasons(top, top_values), repeats)
+
+        results.append({
+            "batch_size": n,
+            "predict_proba_ms": round(baseline_ms, 3),
+            "with_reasons_ms": round(explained_ms, 3),
+            "overhead_pct": round(overhead, 2),
+            "format_ms": round(format_ms, 3),
+            "within_budget": overhead < MAX_OVERHEAD_PCT
+        })
+
+    results_df = pd.DataFrame(results)
+    print("\n" + results_df.to_string(index=False))
+
+    if results_df["within_budget"].all():
+        print(f"\n✅ Reason codes add less than {MAX_OVERHEAD_PCT:.0f}% latency at every batch size")
+    else:
+        print(f"\n❌ Reason code overhead exceeds {MAX_OVERHEAD_PCT:.0f}% for some batch sizes")
+
+    return results_df
+
+
+if __name__ == "__main__":
+    run_benchmark()
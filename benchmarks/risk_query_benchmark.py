@@ -0,0 +1,125 @@
+import time
+
+import numpy as np
+import pandas as pd
+
+from src.create_dashboard_dataset import ACTION_CATEGORIES, RISK_BINS, RISK_LABELS, THRESHOLD
+from src.risk_query import RiskIndex, prepare_scored
+from src.synthetic_data import CONTRACTS, PAYMENT_METHODS
+
+N_ROWS = 1_000_000
+N_UPDATES = 20_000
+K = 500
+REPEATS = 20
+
+QUERIES = [
+    {},
+    {"contract_type": "Month-to-month", "payment_method": "Electronic check"},
+    {"contract_type": ["One year", "Two year"], "risk_segment": "High"},
+    {"contract_type": "Month-to-month", "tenure_bucket": "0-6", "risk_segment": ["High", "Medium"]}
+]
+
+
+def make_scored(n, seed=42, start=0):
+    """Random dashboard-shaped scored customers."""
+    rng = np.random.default_rng(seed)
+    prob = rng.beta(1.2, 2.5, n)
+    segment = pd.cut(prob, bins=RISK_BINS, labels=RISK_LABELS)
+    return pd.DataFrame({
+        "customer_id": [f"C{i:09d}" for i in range(start, start + n)],
+        "churn_probability": prob,
+        "churn_flag": (prob >= THRESHOLD).astype(int),
+        "risk_segment": segment,
+        "monthly_charges": rng.uniform(19, 119, n).round(2),
+        "tenure_months": rng.integers(1, 73, n),
+        "contract_type": rng.choice(CONTRACTS, n),
+        "cx_risk_score": rng.integers(0, 4, n),
+        "payment_method": rng.choice(PAYMENT_METHODS, n),
+        "stickiness_score": rng.integers(0, 4, n),
+        "action_category": segment.map(ACTION_CATEGORIES)
+    })
+
+
+def pandas_top_k(df, k, filters):
+    """Reference answer: boolean filter + sort over the full frame."""
+    mask = np.ones(len(df), dtype=bool)
+    for col, values in filters.items():
+        values = [values] if isinstance(values, str) else values
+        mask &= df[col].astype(str).str.lower().isin([v.lower() for v in values]).to_numpy()
+    matched = df[mask]
+    top = matched.sort_values(["churn_probability", "customer_id"], ascending=[False, True]).head(k)
+    return top.reset_index(drop=True), int(mask.sum())
+
+
+def best_ms(fn, repeats=REPEATS):
+    timings = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        fn()
+        timings.append((time.perf_counter() - start) * 1000)
+    return round(float(np.min(timings)), 2)
+
+
+def check_and_time(index, reference, label):
+    rows = []
+    for filters in QUERIES:
+        top = index.top_k(K, filters)
+        expected, expected_count = pandas_top_k(reference, K, filters)
+        assert top["customer_id"].tolist() == expected["customer_id"].tolist(), filters
+        assert index.count(filters) == expected_count, filters
+
+        rows.append({
+            "state": label,
+            "filters": " & ".join(f"{c}={v}" for c, v in filters.items()) or "(all)",
+            "matches": expected_count,
+            "top_k_ms": best_ms(lambda: index.top_k(K, filters)),
+            "count_ms": best_ms(lambda: index.count(filters)),
+            "pandas_ms": best_ms(lambda: pandas_top_k(reference, K, filters), repeats=3)
+        })
+    return rows
+
+
+def run_benchmark(n_rows=N_ROWS, n_updates=N_UPDATES):
+    print("\n" + "="*60)
+    print(f"RISK QUERY BENCHMARK (top-{K} over {n_rows:,} customers)")
+    print("="*60)
+
+    scored = make_scored(n_rows)
+    start = time.perf_counter()
+    index = RiskIndex(scored)
+    print(f"\n🏗️  Index built in {time.perf_counter() - start:.2f}s | {index.stats()}")
+
+    reference = prepare_scored(scored)
+    results = check_and_time(index, reference, "base")
+
+    # Re-score a random subset plus a few brand-new customers
+    rng = np.random.default_rng(7)
+    updated = make_scored(n_updates, seed=7)
+    updated["customer_id"] = reference["customer_id"].to_numpy()[rng.choice(n_rows, n_updates, replace=False)]
+    updated.loc[:99, "customer_id"] = [f"N{i:09d}" for i in range(100)]
+
+    start = time.perf_counter()
+    index.upsert(updated)
+    print(f"\n🔄 Upserted {n_updates:,} re-scored customers in {(time.perf_counter() - start) * 1000:.1f} ms "
+          f"| {index.stats()}")
+
+    reference = pd.concat([
+        reference[~reference["customer_id"].isin(updated["customer_id"])], prepare_scored(updated)
+    ], ignore_index=True)
+    results += check_and_time(index, reference, "after upsert")
+
+    results_df = pd.DataFrame(results)
+    print("\n" + results_df.to_string(index=False))
+    print("\n✅ Every top-K and count matched a full pandas scan")
+    return results_df
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Bitmap top-K / count queries vs pandas filtering")
+    parser.add_argument("--rows", type=int, default=N_ROWS)
+    parser.add_argument("--updates", type=int, default=N_UPDATES)
+    args = parser.parse_args()
+
+    run_benchmark(args.rows, args.updates)
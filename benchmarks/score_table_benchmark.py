@@ -0,0 +1,88 @@
+import time
+
+import joblib
+import numpy as np
+import pandas as pd
+
+from src.create_dashboard_dataset import MODEL_PATH, score_dashboard_frame
+from src.data_cleaning import clean_data
+from src.feature_engineering import engineer_features
+from src.score_table import SCORED_COLUMNS, ScoreTable, write_score_table
+from src.synthetic_data import generate_synthetic_data
+
+TABLE_PATH = "benchmarks/results/score_table.bin"
+N_ROWS = 1_000_000
+N_LOOKUPS = 10_000
+N_LIVE = 200
+
+
+def percentiles_us(timings):
+    timings = np.asarray(timings) * 1e6
+    return round(float(np.percentile(timings, 50)), 1), round(float(np.percentile(timings, 99)), 1)
+
+
+def run_benchmark(n_rows=N_ROWS, n_lookups=N_LOOKUPS, path=TABLE_PATH):
+    print("\n" + "="*60)
+    print("MEMORY-MAPPED SCORE TABLE vs LIVE SCORING")
+    print("="*60)
+
+    model = joblib.load(MODEL_PATH)["model"]
+    view = generate_synthetic_data(n_rows)
+    engineered = engineer_features(clean_data(view))
+
+    print(f"\n🔄 Precomputing {n_rows:,} scores...")
+    start = time.perf_counter()
+    scored = score_dashboard_frame(engineered.copy(), model)[SCORED_COLUMNS]
+    write_score_table(scored, path)
+    build_s = time.perf_counter() - start
+
+    table = ScoreTable(path)
+    rng = np.random.default_rng(0)
+    sample = rng.choice(len(scored), size=min(n_lookups, len(scored)), replace=False)
+    ids = scored["customer_id"].astype(str).to_numpy()
+
+    # Every sampled lookup must match the dashboard scoring
+    lookup_times = []
+    for row in sample:
+        start = time.perf_counter()
+        record = table.lookup(ids[row])
+        lookup_times.append(time.perf_counter() - start)
+
+        expected = scored.iloc[row]
+        assert record is not None
+        assert abs(record["churn_probability"] - expected["churn_probability"]) < 1e-6
+        assert record["churn_flag"] == expected["churn_flag"]
+        assert record["risk_segment"] == (None if pd.isna(expected["risk_segment"]) else expected["risk_segment"])
+        assert record["action_category"] == (None if pd.isna(expected["action_category"]) else expected["action_category"])
+    assert table.lookup("NOT-A-CUSTOMER") is None
+
+    live_times = []
+    for row in sample[:N_LIVE]:
+        one = engineered.iloc[[row]].copy()
+        start = time.perf_counter()
+        score_dashboard_frame(one, model)
+        live_times.append(time.perf_counter() - start)
+
+    lookup_p50, lookup_p99 = percentiles_us(lookup_times)
+    live_p50, live_p99 = percentiles_us(live_times)
+    results_df = pd.DataFrame([
+        {"method": "score table lookup", "p50_us": lookup_p50, "p99_us": lookup_p99},
+        {"method": "live score_dashboard_frame", "p50_us": live_p50, "p99_us": live_p99}
+    ])
+
+    print(f"\n⏱️  Precompute + write: {build_s:.2f}s | table size {table.stats()['size_mb']} MB")
+    print("\n" + results_df.to_string(index=False))
+    print(f"\n✅ {len(sample):,} lookups matched score_dashboard_frame ({live_p50 / lookup_p50:.0f}x faster at p50)")
+    return results_df
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Score table lookups vs live dashboard scoring")
+    parser.add_argument("--rows", type=int, default=N_ROWS)
+    parser.add_argument("--lookups", type=int, default=N_LOOKUPS)
+    parser.add_argument("--path", default=TABLE_PATH)
+    args = parser.parse_args()
+
+    run_benchmark(args.rows, args.lookups, args.path)
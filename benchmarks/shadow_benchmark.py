@@ -0,0 +1,132 @@
+import os
+import shutil
+import time
+
+import joblib
+import numpy as np
+import pandas as pd
+from sklearn.base import clone
+
+RESULTS_DIR = "benchmarks/results"
+CHALLENGER_PATH = os.path.join(RESULTS_DIR, "shadow_challenger.joblib")
+LOG_DIR = os.path.join(RESULTS_DIR, "shadow_log")
+N_REQUESTS = 500
+TRAIN_ROWS = 20_000
+
+from benchmarks.load_test import CONTRACTS, PAYMENTS
+from deployment.shadow import ShadowScorer, load_shadow_log, shadow_report
+from src.synthetic_data import generate_synthetic_data
+
+FEATURES = [
+    "tenure_months", "contract_type", "monthly_charges", "payment_method",
+    "support_ticket_count", "avg_call_minutes", "avg_data_usage_gb"
+]
+
+
+class SlowModel:
+    """Challenger stand-in that takes `delay_s` per call, to fill the queue."""
+
+    def __init__(self, model, delay_s):
+        self.model = model
+        self.delay_s = delay_s
+
+    def predict_proba(self, X):
+        time.sleep(self.delay_s)
+        return self.model.predict_proba(X)
+
+
+def build_challenger(champion, path=CHALLENGER_PATH, n_rows=TRAIN_ROWS):
+    """Refit the champion pipeline on synthetic view data as a stand-in challenger."""
+    view = generate_synthetic_data(n_rows)
+    challenger = clone(champion).fit(view[FEATURES], view["churn"])
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    joblib.dump({"model": challenger}, path)
+    return path
+
+
+def random_form(rng):
+    return {
+        "tenure_months": int(rng.integers(1, 76)),
+        "contract_type": str(rng.choice(CONTRACTS)),
+        "monthly_charges": float(rng.uniform(19, 119)),
+        "payment_method": str(rng.choice(PAYMENTS)),
+        "support_ticket_count": int(rng.integers(0, 8)),
+        "avg_call_minutes": float(rng.uniform(0, 275)),
+        "avg_data_usage_gb": float(rng.uniform(0, 30))
+    }
+
+
+def latencies_ms(client, forms):
+    timings = []
+    for form in forms:
+        start = time.perf_counter()
+        response = client.post("/predict", data=form)
+        timings.append((time.perf_counter() - start) * 1000)
+        assert response.status_code == 200
+    return np.asarray(timings)
+
+
+def run_benchmark(n_requests=N_REQUESTS):
+    print("\n" + "="*60)
+    print("SHADOW SCORING BENCHMARK")
+    print("="*60)
+
+    shutil.rmtree(LOG_DIR, ignore_errors=True)
+    from fastapi.testclient import TestClient
+    import deployment.app as app_module
+
+    challenger = joblib.load(build_challenger(app_module.model))["model"]
+    client = TestClient(app_module.app)
+    rng = np.random.default_rng(42)
+    forms = [random_form(rng) for _ in range(n_requests)]
+    latencies_ms(client, forms[:50])  # warm-up
+
+    results = []
+    app_module.shadow = None
+    off = latencies_ms(client, forms)
+
+    app_module.shadow = ShadowScorer(challenger, log_dir=LOG_DIR)
+    on = latencies_ms(client, forms)
+    app_module.shadow.close()
+    stats_on = app_module.shadow.stats()
+
+    # Under pressure: a slow challenger and a tiny queue must drop, not block
+    app_module.shadow = ShadowScorer(SlowModel(challenger, 0.5), log_dir=LOG_DIR, queue_size=8)
+    pressured = latencies_ms(client, forms)
+    app_module.shadow.close(timeout=30)
+    stats_pressured = app_module.shadow.stats()
+    app_module.shadow = None
+
+    for label, timings, stats in [("shadow off", off, None), ("shadow on", on, stats_on),
+                                  ("slow challenger, queue=8", pressured, stats_pressured)]:
+        results.append({
+            "mode": label,
+            "p50_ms": round(float(np.percentile(timings, 50)), 2),
+            "p99_ms": round(float(np.percentile(timings, 99)), 2),
+            "scored": stats["scored"] if stats else 0,
+            "dropped": stats["dropped"] if stats else 0
+        })
+
+    assert stats_on["scored"] == n_requests and stats_on["dropped"] == 0
+    assert stats_pressured["dropped"] > 0
+
+    report = shadow_report(load_shadow_log(LOG_DIR))
+    transitions = report.pop("band_transitions")
+
+    results_df = pd.DataFrame(results)
+    print("\n" + results_df.to_string(index=False))
+    print(f"\n📊 Report over {report['rows']} logged rows: flag agreement {report['flag_agreement']}, "
+          f"band agreement {report['band_agreement']}, mean |delta| {report['mean_abs_delta']}")
+    print(transitions.to_string())
+    print("\n✅ Shadow scoring logged every request and dropped work under pressure instead of blocking")
+    return results_df
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Request latency with and without shadow scoring")
+    parser.add_argument("--requests", type=int, default=N_REQUESTS)
+    args = parser.parse_args()
+
+    run_benchmark(args.requests)
@@ -2,5 +2,18 @@ DB_CONFIG = {
     "driver": "{ODBC Driver 17 for SQL Server}",
     "server": "localhost",  
     "database": "CustomerChurnDB",
-    "trusted_connection": "yes"
+    "trusted_connection": "yes",
+    # "sqlserver" (default) or "sqlite" for the stand-in built by src/sqlite_standin.py
+    "backend": "sqlserver",
+    "sqlite_path": "data/churn_standin.db",
+    # Connection pool (src/data_ingestion.py)
+    "pool_max_size": 4,
+    "pool_idle_timeout_s": 300,
+    "pool_borrow_timeout_s": 30,
+    "pool_health_check": True,
+    # "pandas": pd.read_sql; "arrow": columnar fetch over pooled arrow-odbc /
+    # adbc-driver-sqlite connections when installed (falls back to pd.read_sql).
+    # The ADBC path is checked against pd.read_sql by benchmarks/arrow_fetch_benchmark.py;
+    # arrow-odbc against SQL Server has not been, so it stays opt-in
+    "fetch_backend": "pandas"
 }
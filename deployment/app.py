@@ -1,11 +1,23 @@
-from fastapi import FastAPI, Request, Form, HTTPException
+from fastapi import FastAPI, Request, Form, HTTPException, Query
 from fastapi.responses import JSONResponse
 from fastapi.templating import Jinja2Templates
 from fastapi.staticfiles import StaticFiles
 from fastapi.middleware.cors import CORSMiddleware 
+from pydantic import BaseModel
+from typing import List, Optional
 import joblib
 import pandas as pd
 import os 
+import time
+
+from deployment.reason_codes import ReasonCodeExplainer, TOP_K
+from deployment.what_if import DISCOUNT_STEP, MAX_DISCOUNT, evaluate_what_if
+from deployment.shadow import CHALLENGER_PATH, ShadowScorer
+from deployment.model_registry import SINGLE_ARTIFACTS, ModelRegistry, discover_models, file_version, records_frame
+from deployment.audit import AUDIT_ENABLED, AuditLog
+from deployment.feature_store import FEATURE_STORE_PATH, MODEL_FEATURES, acquire_owner_lock, load_or_create
+from src.score_table import SCORE_TABLE_PATH, classify, load_score_table
+from src.risk_query import load_risk_index
 
 app = FastAPI()
 
@@ -28,13 +40,152 @@ app.mount("/static", StaticFiles(directory=os.path.join(BASE_DIR, "static")), na
 # Flexible model path (works in both local and production)
 MODEL_PATH = os.getenv("MODEL_PATH", os.path.join(os.path.dirname(BASE_DIR), "artifacts", "churn_deployment_model.joblib"))
 
+# Accepted form values for the categorical inputs
+VALID_CONTRACTS = ["month-to-month", "one year", "two year"]
+VALID_PAYMENTS = ["electronic check", "credit card", "bank transfer", "mailed check"]
+
+# Largest batch accepted by /predict_batch
+MAX_BATCH_SIZE = 10000
+
+
+def build_category_map(pipeline):
+    """
+    Map the lowercase form values (e.g. "bank transfer") to the category labels the
+    encoder was fitted on (e.g. "Bank transfer (automatic)"). Without this the
+    OneHotEncoder (handle_unknown="ignore") silently encodes them as all zeros.
+    """
+    preprocessor = pipeline.named_steps["preprocessing"]
+    name, encoder, columns = preprocessor.transformers_[1]
+    fitted = dict(zip(columns, encoder.categories_))
+
+    category_map = {}
+    for column, values in [("contract_type", VALID_CONTRACTS), ("payment_method", VALID_PAYMENTS)]:
+        category_map[column] = {}
+        for value in values:
+            for category in fitted.get(column, []):
+                label = str(category).lower()
+                if label == value or label.startswith(value + " ("):
+                    category_map[column][value] = category
+                    break
+    return category_map
+
+
+def to_model_categories(df):
+    """Rewrite form category values in place to the model's fitted labels."""
+    for column, mapping in category_map.items():
+        df[column] = df[column].replace(mapping)
+    return df
+
+
 # Load model with error handling
 try:
     model_bundle = joblib.load(MODEL_PATH)
     model = model_bundle["model"]
+    explainer = ReasonCodeExplainer(model)
+    category_map = build_category_map(model)
+    model_version = f"deployment@{file_version(MODEL_PATH)}"
 except Exception as e:
     print(f"❌ Failed to load model: {e}")
     model = None
+    explainer = None
+    category_map = {}
+    model_version = None
+
+# Audit trail of every prediction, written off the response path (AUDIT_ENABLED=0 disables)
+audit = AuditLog() if AUDIT_ENABLED else None
+
+# Named/versioned models for /models/{model}/predict, loaded on first use
+try:
+    registry = ModelRegistry(discover_models(single_artifacts={**SINGLE_ARTIFACTS, "deployment": MODEL_PATH}))
+except Exception as e:
+    print(f"❌ Failed to build model registry: {e}")
+    registry = None
+
+# Optional challenger, scored off the response path (CHALLENGER_MODEL_PATH)
+shadow = None
+if CHALLENGER_PATH:
+    try:
+        shadow = ShadowScorer(joblib.load(CHALLENGER_PATH)["model"])
+        print(f"👥 Shadow scoring with challenger: {CHALLENGER_PATH}")
+    except Exception as e:
+        print(f"❌ Failed to load challenger model: {e}")
+
+# Online feature store for /predict_by_id (restored from its last snapshot).
+# It is per-process state: with several workers only the one holding the owner
+# lock serves it, the others answer 503 instead of 404s or stale features
+feature_store = None
+feature_store_lock = acquire_owner_lock(FEATURE_STORE_PATH)
+if feature_store_lock is None:
+    print(f"⚠️  Feature store owned by another worker (pid {os.getpid()} serves 503); "
+          f"run a single worker to use /feature_store and /predict_by_id")
+else:
+    try:
+        feature_store = load_or_create(FEATURE_STORE_PATH)
+    except Exception as e:
+        print(f"❌ Failed to load feature store snapshot: {e}")
+        from deployment.feature_store import OnlineFeatureStore
+        feature_store = OnlineFeatureStore()
+
+# Precomputed scores for /score/{customer_id} (memory-mapped, shared by all workers)
+try:
+    score_table = load_score_table(SCORE_TABLE_PATH)
+except Exception as e:
+    print(f"❌ Failed to open score table: {e}")
+    score_table = None
+
+# Bitmap-indexed scored base for /risk/top and /risk/count
+try:
+    risk_index = load_risk_index(os.getenv("RISK_QUERY_SOURCE"))
+except Exception as e:
+    print(f"❌ Failed to build risk query index: {e}")
+    risk_index = None
+
+class CustomerFeatures(BaseModel):
+    tenure_months: int
+    contract_type: str
+    monthly_charges: float
+    payment_method: str
+    support_ticket_count: int
+    avg_call_minutes: float
+    avg_data_usage_gb: float
+
+
+class CustomerProfile(BaseModel):
+    customer_id: str
+    tenure_months: int
+    contract_type: str
+    monthly_charges: float
+    payment_method: str
+
+
+class TicketEvent(BaseModel):
+    customer_id: str
+    resolution_time_hr: float
+    satisfaction_score: Optional[int] = None
+    ticket_date: str
+
+
+class UsageEvent(BaseModel):
+    customer_id: str
+    avg_call_minutes: float
+    avg_data_usage_gb: float
+
+
+class WhatIfRequest(CustomerFeatures):
+    max_discount: float = MAX_DISCOUNT
+    discount_step: float = DISCOUNT_STEP
+
+
+class ScoredCustomer(BaseModel):
+    customer_id: str
+    churn_probability: float
+    monthly_charges: float
+    tenure_months: int
+    contract_type: str
+    payment_method: str
+    cx_risk_score: Optional[int] = None
+    stickiness_score: Optional[int] = None
+
 
 def get_action_suggestion(prob):
     if prob >= 0.70:
@@ -44,6 +195,66 @@ def get_action_suggestion(prob):
     else:
         return "Low Risk – No immediate action needed. Continue normal engagement."
 
+def get_risk_level(prob):
+    if prob >= 0.70:
+        return "HIGH"
+    elif prob >= 0.40:
+        return "MEDIUM"
+    else:
+        return "LOW"
+
+def validate_profile(data):
+    """The /predict rules for profile fields (tenure, charges, contract, payment method)."""
+    if data["tenure_months"] < 1 or data["tenure_months"] > 75:
+        raise HTTPException(status_code=400, detail="Invalid tenure value. Must be between 1-75 months")
+    
+    if data["monthly_charges"] < 19 or data["monthly_charges"] > 119:
+        raise HTTPException(status_code=400, detail="Monthly charges must be between $19 and $119")
+
+    if data["contract_type"] not in VALID_CONTRACTS:
+        raise HTTPException(status_code=400, detail="Invalid contract type")
+
+    if data["payment_method"] not in VALID_PAYMENTS:
+        raise HTTPException(status_code=400, detail="Invalid payment method")
+
+def validate_ticket(data):
+    if data["resolution_time_hr"] < 0:
+        raise HTTPException(status_code=400, detail="Resolution time must be non-negative")
+
+    score = data["satisfaction_score"]
+    if score is not None and (score < 1 or score > 5):
+        raise HTTPException(status_code=400, detail="Satisfaction score must be between 1-5")
+
+def validate_usage(data):
+    if data["avg_call_minutes"] < 0 or data["avg_data_usage_gb"] < 0:
+        raise HTTPException(status_code=400, detail="Call minutes and data usage must be non-negative")
+
+def require_feature_store():
+    if feature_store is None:
+        raise HTTPException(status_code=503,
+                            detail="The online feature store is served by a single worker; run uvicorn with --workers 1")
+
+def validate_records(records, validate, label):
+    """Run a validator over a batch; the first bad record rejects the whole batch with 400."""
+    for i, record in enumerate(records):
+        try:
+            validate(record)
+        except HTTPException as e:
+            raise HTTPException(status_code=400, detail=f"{label} {i}: {e.detail}")
+
+def validate_input(data):
+    """Apply the /predict validation rules; raises HTTPException(400) on failure."""
+    validate_profile(data)
+
+    if data["support_ticket_count"] < 0 or data["support_ticket_count"] > 7:
+        raise HTTPException(status_code=400, detail="Support tickets must be between 0-7")
+    
+    if data["avg_call_minutes"] < 0 or data["avg_call_minutes"] > 275:
+        raise HTTPException(status_code=400, detail="Call minutes must be between 0-275")
+    
+    if data["avg_data_usage_gb"] < 0 or data["avg_data_usage_gb"] > 30:
+        raise HTTPException(status_code=400, detail="Data usage must be between 0-30 GB")
+
 @app.get("/")
 def home(request: Request):
     return templates.TemplateResponse("index.html", {"request": request})
@@ -72,30 +283,6 @@ async def predict(
     if model is None:
         raise HTTPException(status_code=500, detail="Model not loaded. Please try again later.")
     
-    # ---------------- VALIDATION RULES ----------------
-    if tenure_months < 1 or tenure_months > 75:
-        raise HTTPException(status_code=400, detail="Invalid tenure value. Must be between 1-75 months")
-    
-    if monthly_charges < 19 or monthly_charges > 119:
-        raise HTTPException(status_code=400, detail="Monthly charges must be between $19 and $119")
-    
-    if support_ticket_count < 0 or support_ticket_count > 7:
-        raise HTTPException(status_code=400, detail="Support tickets must be between 0-7")
-    
-    if avg_call_minutes < 0 or avg_call_minutes > 275:
-        raise HTTPException(status_code=400, detail="Call minutes must be between 0-275")
-    
-    if avg_data_usage_gb < 0 or avg_data_usage_gb > 30:
-        raise HTTPException(status_code=400, detail="Data usage must be between 0-30 GB")
-
-    valid_contracts = ["month-to-month", "one year", "two year"]
-    if contract_type not in valid_contracts:
-        raise HTTPException(status_code=400, detail="Invalid contract type")
-
-    valid_payments = ["electronic check", "credit card", "bank transfer", "mailed check"]
-    if payment_method not in valid_payments:
-        raise HTTPException(status_code=400, detail="Invalid payment method")
-
     # Prepare input data
     input_data = {
         "tenure_months": tenure_months,
@@ -107,28 +294,407 @@ async def predict(
         "avg_data_usage_gb": avg_data_usage_gb
     }
 
-    df = pd.DataFrame([input_data])
+    # ---------------- VALIDATION RULES ----------------
+    validate_input(input_data)
+
+    df = to_model_categories(pd.DataFrame([input_data]))
     
     try:
-        prob = float(model.predict_proba(df)[:, 1][0])
-        
-        if prob >= 0.70:
-            risk = "HIGH"
-        elif prob >= 0.40:
-            risk = "MEDIUM"
-        else:
-            risk = "LOW"
+        probs, top, top_values = explainer.predict_with_reasons(df, top_k=TOP_K)
+        reasons = explainer.format_reasons(top, top_values)
+        prob = float(probs[0])
+        if audit is not None:
+            audit.append("predict", df, probs, model_version)
+        if shadow is not None:
+            shadow.submit("predict", df, probs)
 
-        suggestion = get_action_suggestion(prob)
+        return JSONResponse({
+            "probability": round(prob * 100, 2),
+            "risk": get_risk_level(prob),
+            "suggestion": get_action_suggestion(prob),
+            "reasons": reasons[0]
+        })
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Prediction failed: {str(e)}")
+
+@app.post("/predict_batch")
+async def predict_batch(customers: List[CustomerFeatures]):
+    """Score and explain a batch of customers with one vectorized model call."""
+    if model is None:
+        raise HTTPException(status_code=500, detail="Model not loaded. Please try again later.")
+
+    if not customers or len(customers) > MAX_BATCH_SIZE:
+        raise HTTPException(status_code=400, detail=f"Batch must contain 1-{MAX_BATCH_SIZE} customers")
+
+    records = [customer.model_dump() for customer in customers]
+    validate_records(records, validate_input, "Customer")
+
+    df = to_model_categories(pd.DataFrame(records))
+
+    try:
+        probs, top, top_values = explainer.predict_with_reasons(df, top_k=TOP_K)
+        reasons = explainer.format_reasons(top, top_values)
+        if audit is not None:
+            audit.append("predict_batch", df, probs, model_version)
+        if shadow is not None:
+            shadow.submit("predict_batch", df, probs)
+
+        return JSONResponse({
+            "predictions": [
+                {
+                    "probability": round(float(prob) * 100, 2),
+                    "risk": get_risk_level(prob),
+                    "suggestion": get_action_suggestion(prob),
+                    "reasons": row_reasons
+                }
+                for prob, row_reasons in zip(probs, reasons)
+            ]
+        })
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Prediction failed: {str(e)}")
+
+@app.post("/what_if")
+def what_if(request: WhatIfRequest):
+    """
+    Score a grid of contract / payment method / discount changes for one
+    customer in a single model call and return the cheapest change that
+    moves them below the HIGH (0.70) and MEDIUM (0.40) bands.
+    """
+    if model is None:
+        raise HTTPException(status_code=500, detail="Model not loaded. Please try again later.")
+
+    customer = request.model_dump()
+    max_discount = customer.pop("max_discount")
+    discount_step = customer.pop("discount_step")
+    validate_input(customer)
+    if discount_step <= 0 or max_discount < 0:
+        raise HTTPException(status_code=400, detail="discount_step must be positive and max_discount non-negative")
+
+    customer = to_model_categories(pd.DataFrame([customer])).iloc[0].to_dict()
+    contracts = [category_map.get("contract_type", {}).get(v, v) for v in VALID_CONTRACTS]
+    payments = [category_map.get("payment_method", {}).get(v, v) for v in VALID_PAYMENTS]
+    form_values = {label: value for mapping in category_map.values() for value, label in mapping.items()}
+
+    start = time.perf_counter()
+    try:
+        result = evaluate_what_if(model, customer, contracts, payments, max_discount, discount_step)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    elapsed_ms = (time.perf_counter() - start) * 1000
+
+    options = {}
+    for band, option in result["options"].items():
+        if option is not None:
+            option = {
+                **option,
+                "contract_type": form_values.get(option["contract_type"], option["contract_type"]),
+                "payment_method": form_values.get(option["payment_method"], option["payment_method"]),
+                "probability": round(option["probability"] * 100, 2),
+                "risk": get_risk_level(option["probability"])
+            }
+        options[band] = option
+
+    baseline = result["baseline_probability"]
+    return {
+        "probability": round(baseline * 100, 2),
+        "risk": get_risk_level(baseline),
+        "variants_scored": result["variants_scored"],
+        "scoring_ms": round(elapsed_ms, 2),
+        "options": options
+    }
+
+# ---------------- ONLINE FEATURE STORE ----------------
+@app.post("/feature_store/customers")
+def upsert_customers(profiles: List[CustomerProfile]):
+    """Create or update customer profiles (contract, billing, tenure)."""
+    require_feature_store()
+    if not profiles or len(profiles) > MAX_BATCH_SIZE:
+        raise HTTPException(status_code=400, detail=f"Batch must contain 1-{MAX_BATCH_SIZE} records")
+    records = [p.model_dump() for p in profiles]
+    validate_records(records, validate_profile, "Profile")
+    df = to_model_categories(pd.DataFrame(records))
+    feature_store.upsert_profiles(
+        df["customer_id"].tolist(), df["tenure_months"].to_numpy(), df["contract_type"].tolist(),
+        df["monthly_charges"].to_numpy(), df["payment_method"].tolist()
+    )
+    return {"ingested": len(profiles)}
+
+@app.post("/feature_store/tickets")
+def ingest_tickets(events: List[TicketEvent]):
+    """Support ticket events; updates running ticket counts and averages."""
+    require_feature_store()
+    if not events or len(events) > MAX_BATCH_SIZE:
+        raise HTTPException(status_code=400, detail=f"Batch must contain 1-{MAX_BATCH_SIZE} events")
+    records = [e.model_dump() for e in events]
+    validate_records(records, validate_ticket, "Event")
+    df = pd.DataFrame(records)
+    try:
+        ticket_date = pd.to_datetime(df["ticket_date"])
+    except (ValueError, TypeError):
+        raise HTTPException(status_code=400, detail="ticket_date must be an ISO date")
+    feature_store.ingest_tickets(
+        df["customer_id"].tolist(), df["resolution_time_hr"].to_numpy(),
+        df["satisfaction_score"].to_numpy(dtype=float, na_value=float("nan")), ticket_date
+    )
+    return {"ingested": len(events)}
+
+@app.post("/feature_store/usage")
+def ingest_usage(events: List[UsageEvent]):
+    """Usage events; updates running call-minute and data-usage means."""
+    require_feature_store()
+    if not events or len(events) > MAX_BATCH_SIZE:
+        raise HTTPException(status_code=400, detail=f"Batch must contain 1-{MAX_BATCH_SIZE} events")
+    records = [e.model_dump() for e in events]
+    validate_records(records, validate_usage, "Event")
+    df = pd.DataFrame(records)
+    feature_store.ingest_usage(
+        df["customer_id"].tolist(), df["avg_call_minutes"].to_numpy(), df["avg_data_usage_gb"].to_numpy()
+    )
+    return {"ingested": len(events)}
+
+@app.get("/feature_store/stats")
+def feature_store_stats():
+    require_feature_store()
+    return feature_store.stats()
+
+@app.post("/feature_store/snapshot")
+def snapshot_feature_store():
+    """Persist the store; it is restored from this file on the next start."""
+    require_feature_store()
+    path = feature_store.save(FEATURE_STORE_PATH)
+    return {"path": path, **feature_store.stats()}
+
+@app.on_event("shutdown")
+def save_feature_store():
+    if feature_store is not None and feature_store.size:
+        feature_store.save(FEATURE_STORE_PATH)
+
+@app.on_event("shutdown")
+def stop_shadow_scoring():
+    if shadow is not None:
+        shadow.close()
+
+@app.on_event("shutdown")
+def flush_audit_log():
+    if audit is not None:
+        audit.close()
+
+@app.get("/audit/stats")
+def audit_stats():
+    """Audit buffer fill, backpressure (overflowed rows) and writer counters."""
+    if audit is None:
+        raise HTTPException(status_code=404, detail="Audit logging is disabled (AUDIT_ENABLED=0)")
+    return audit.stats()
+
+@app.get("/shadow/stats")
+def shadow_stats():
+    """Challenger queue/drop counters (404 when no challenger is configured)."""
+    if shadow is None:
+        raise HTTPException(status_code=404, detail="Shadow scoring is not enabled (set CHALLENGER_MODEL_PATH)")
+    return {"challenger_path": CHALLENGER_PATH, **shadow.stats()}
+
+@app.get("/predict_by_id/{customer_id}")
+def predict_by_id(customer_id: str):
+    """Score a known customer from the online feature store (no client-side features)."""
+    if model is None:
+        raise HTTPException(status_code=500, detail="Model not loaded. Please try again later.")
+
+    require_feature_store()
+    features = feature_store.get_features(customer_id)
+    if features is None:
+        raise HTTPException(status_code=404, detail=f"No profile for customer {customer_id} in the feature store")
+
+    df = pd.DataFrame([{name: features[name] for name in MODEL_FEATURES}])
+    try:
+        probs, top, top_values = explainer.predict_with_reasons(df, top_k=TOP_K)
+        reasons = explainer.format_reasons(top, top_values)
+        prob = float(probs[0])
+        if audit is not None:
+            audit.append("predict_by_id", df, probs, model_version, [customer_id])
+        if shadow is not None:
+            shadow.submit("predict_by_id", df, probs, [customer_id])
 
         return JSONResponse({
+            "customer_id": customer_id,
             "probability": round(prob * 100, 2),
-            "risk": risk,
-            "suggestion": suggestion
+            "risk": get_risk_level(prob),
+            "suggestion": get_action_suggestion(prob),
+            "reasons": reasons[0],
+            "features": features
         })
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Prediction failed: {str(e)}")
 
+@app.get("/score/{customer_id}")
+def score_by_id(customer_id: str):
+    """
+    Precomputed dashboard score (probability, risk segment, action) from the
+    memory-mapped score table; customers missing from the table are scored
+    live from the online feature store with the deployment model and get its
+    own risk level and suggestion (as /predict_by_id), not dashboard segments.
+    model_version names the model behind either answer.
+    """
+    if score_table is not None:
+        score_table.maybe_reload()
+        record = score_table.lookup(customer_id)
+        if record is not None:
+            record["churn_probability"] = round(record["churn_probability"] * 100, 2)
+            return {**record, "source": "score_table"}
+
+    if model is None:
+        raise HTTPException(status_code=500, detail="Model not loaded. Please try again later.")
+
+    require_feature_store()
+    features = feature_store.get_features(customer_id)
+    if features is None:
+        raise HTTPException(status_code=404, detail=f"Customer {customer_id} not in the score table or feature store")
+
+    df = pd.DataFrame([{name: features[name] for name in MODEL_FEATURES}])
+    try:
+        probs = model.predict_proba(df)[:, 1]
+        prob = float(probs[0])
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Prediction failed: {str(e)}")
+    if audit is not None:
+        audit.append("score", df, probs, model_version, [customer_id])
+
+    return {
+        "customer_id": customer_id,
+        "churn_probability": round(prob * 100, 2),
+        "risk": get_risk_level(prob),
+        "suggestion": get_action_suggestion(prob),
+        "model_version": model_version,
+        "source": "live"
+    }
+
+@app.get("/score_table/stats")
+def score_table_stats():
+    if score_table is None:
+        raise HTTPException(status_code=404, detail="No score table loaded")
+    score_table.maybe_reload()
+    return score_table.stats()
+
+# ---------------- RISK QUERIES ----------------
+def risk_filters(contract_type, payment_method, risk_segment, tenure_bucket):
+    if risk_index is None:
+        raise HTTPException(status_code=500, detail="Risk query index not loaded")
+    return {
+        "contract_type": contract_type,
+        "payment_method": payment_method,
+        "risk_segment": risk_segment,
+        "tenure_bucket": tenure_bucket
+    }
+
+@app.get("/risk/top")
+def risk_top(
+    k: int = Query(100, ge=1, le=MAX_BATCH_SIZE),
+    contract_type: Optional[List[str]] = Query(None),
+    payment_method: Optional[List[str]] = Query(None),
+    risk_segment: Optional[List[str]] = Query(None),
+    tenure_bucket: Optional[List[str]] = Query(None)
+):
+    """Highest-risk customers matching the filters (repeat a parameter to OR values)."""
+    filters = risk_filters(contract_type, payment_method, risk_segment, tenure_bucket)
+    top = risk_index.top_k(k, filters)
+    return {
+        "count": risk_index.count(filters),
+        "customers": top.astype(object).where(top.notna(), None).to_dict("records")
+    }
+
+@app.get("/risk/count")
+def risk_count(
+    contract_type: Optional[List[str]] = Query(None),
+    payment_method: Optional[List[str]] = Query(None),
+    risk_segment: Optional[List[str]] = Query(None),
+    tenure_bucket: Optional[List[str]] = Query(None)
+):
+    filters = risk_filters(contract_type, payment_method, risk_segment, tenure_bucket)
+    return {"count": risk_index.count(filters)}
+
+@app.post("/risk/customers")
+def upsert_risk_customers(customers: List[ScoredCustomer]):
+    """Re-scored customers; segment, flag and action are derived as in the dashboard."""
+    if risk_index is None:
+        raise HTTPException(status_code=500, detail="Risk query index not loaded")
+    if not customers or len(customers) > MAX_BATCH_SIZE:
+        raise HTTPException(status_code=400, detail=f"Batch must contain 1-{MAX_BATCH_SIZE} customers")
+
+    df = pd.DataFrame([c.model_dump() for c in customers])
+    if not df["churn_probability"].between(0, 1).all():
+        raise HTTPException(status_code=400, detail="churn_probability must be between 0 and 1")
+    df["churn_flag"], df["risk_segment"], df["action_category"] = zip(*df["churn_probability"].map(classify))
+    risk_index.upsert(df)
+    return {"upserted": len(customers), **risk_index.stats()}
+
+@app.get("/risk/stats")
+def risk_stats():
+    if risk_index is None:
+        raise HTTPException(status_code=500, detail="Risk query index not loaded")
+    return risk_index.stats()
+
+@app.get("/models")
+def list_models():
+    """Registered models with version, load state and per-model request stats."""
+    if registry is None:
+        raise HTTPException(status_code=500, detail="Model registry not available")
+    return {"models": registry.catalog(), **registry.stats()}
+
+@app.get("/models/stats")
+def model_registry_stats():
+    if registry is None:
+        raise HTTPException(status_code=500, detail="Model registry not available")
+    return {**registry.stats(), "per_model": {m["name"]: m for m in registry.catalog()}}
+
+def get_registered_model(model_ref):
+    if registry is None:
+        raise HTTPException(status_code=500, detail="Model registry not available")
+    try:
+        return registry.get(model_ref)
+    except KeyError as e:
+        raise HTTPException(status_code=404, detail=str(e.args[0]))
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Failed to load model {model_ref}: {str(e)}")
+
+@app.get("/models/{model_ref}/schema")
+def model_schema(model_ref: str):
+    """Input columns the selected model expects (numeric, or categorical with allowed values)."""
+    selected = get_registered_model(model_ref)
+    return {"model": selected.name, "version": selected.version, **selected.schema}
+
+@app.post("/models/{model_ref}/predict")
+def predict_with_model(model_ref: str, records: List[dict]):
+    """
+    Score records with the model selected by name, name@version or version.
+    Records are validated against that model's own input schema.
+    """
+    if not records or len(records) > MAX_BATCH_SIZE:
+        raise HTTPException(status_code=400, detail=f"Batch must contain 1-{MAX_BATCH_SIZE} records")
+    selected = get_registered_model(model_ref)
+    try:
+        df = records_frame(selected.schema, records)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    try:
+        _, probs = registry.predict_proba(selected.name, df)
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Prediction failed: {str(e)}")
+    if audit is not None:
+        audit.append("models_predict", df, probs, f"{selected.name}@{selected.version}")
+
+    return {
+        "model": selected.name,
+        "version": selected.version,
+        "predictions": [
+            {
+                "probability": round(float(prob) * 100, 2),
+                "risk": get_risk_level(prob),
+                **({"churn": bool(prob >= selected.threshold)} if selected.threshold is not None else {})
+            }
+            for prob in probs
+        ]
+    }
+
 # NEW: For local testing only
 if __name__ == "__main__":
     import uvicorn
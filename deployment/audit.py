@@ -0,0 +1,393 @@
+import json
+import os
+import threading
+import time
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.dataset as ds
+import pyarrow.parquet as pq
+
+from deployment.shadow import BAND_LABELS, band_codes
+
+# Every prediction is audited unless AUDIT_ENABLED=0
+AUDIT_ENABLED = os.getenv("AUDIT_ENABLED", "1") != "0"
+AUDIT_LOG_DIR = os.getenv(
+    "AUDIT_LOG_DIR",
+    os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "logs", "audit")
+)
+
+# Ring buffer capacity; rows that do not fit spill to an unbounded overflow
+# list instead of blocking the request or being dropped
+BUFFER_ROWS = int(os.getenv("AUDIT_BUFFER_ROWS", 100_000))
+# Buffered rows are written as one row group once either limit is reached
+FLUSH_ROWS = int(os.getenv("AUDIT_FLUSH_ROWS", 5_000))
+FLUSH_INTERVAL_S = float(os.getenv("AUDIT_FLUSH_INTERVAL_S", 5.0))
+# A log file is closed and a new one started after this many rows or seconds
+ROTATE_ROWS = int(os.getenv("AUDIT_ROTATE_ROWS", 1_000_000))
+ROTATE_INTERVAL_S = float(os.getenv("AUDIT_ROTATE_INTERVAL_S", 3600.0))
+
+# Model inputs logged as typed columns (the deployment model's view); any
+# other features a model takes go to extra_inputs as a JSON object
+INPUT_COLUMNS = {
+    "tenure_months": np.float64,
+    "contract_type": object,
+    "monthly_charges": np.float64,
+    "payment_method": object,
+    "support_ticket_count": np.float64,
+    "avg_call_minutes": np.float64,
+    "avg_data_usage_gb": np.float64
+}
+RING_COLUMNS = {
+    "ts": np.float64,
+    "request_id": np.int64,
+    "endpoint": object,
+    "model_version": object,
+    "customer_id": object,
+    **INPUT_COLUMNS,
+    "extra_inputs": object,
+    "probability": np.float32,
+    "risk": np.int8
+}
+
+LOG_SCHEMA = pa.schema([
+    ("ts", pa.float64()),
+    ("request_id", pa.int64()),
+    ("endpoint", pa.dictionary(pa.int32(), pa.string())),
+    ("model_version", pa.dictionary(pa.int32(), pa.string())),
+    ("customer_id", pa.string()),
+    ("tenure_months", pa.float64()),
+    ("contract_type", pa.dictionary(pa.int32(), pa.string())),
+    ("monthly_charges", pa.float64()),
+    ("payment_method", pa.dictionary(pa.int32(), pa.string())),
+    ("support_ticket_count", pa.float64()),
+    ("avg_call_minutes", pa.float64()),
+    ("avg_data_usage_gb", pa.float64()),
+    ("extra_inputs", pa.string()),
+    ("probability", pa.float32()),
+    ("risk", pa.dictionary(pa.int8(), pa.string()))
+])
+DICTIONARY_COLUMNS = ["endpoint", "model_version", "contract_type", "payment_method"]
+
+
+class AuditLog:
+    """
+    Prediction audit trail kept off the response path. Endpoints call
+    append() with the frame the model scored and its probabilities; the rows
+    are copied into preallocated column arrays used as a ring buffer, so the
+    request only pays for a few slice assignments under a short lock. A
+    daemon thread drains the ring in batches (flush_rows or flush_interval_s,
+    whichever comes first), copying rows out without holding the lock, and
+    appends each batch as a zstd row group to the current Parquet file,
+    which is rotated after rotate_rows rows or rotate_interval_s seconds.
+
+    append() never waits and never drops: when the ring cannot take a
+    request's rows they spill to an overflow list the writer drains next
+    (overflowed rows and the overflow peak are the backpressure metrics).
+    close() drains everything buffered and closes the open file, so a
+    graceful shutdown loses nothing. Files are written as *.parquet.tmp and
+    renamed to *.parquet when closed.
+    """
+
+    def __init__(self, log_dir=AUDIT_LOG_DIR, buffer_rows=BUFFER_ROWS, flush_rows=FLUSH_ROWS,
+                 flush_interval_s=FLUSH_INTERVAL_S, rotate_rows=ROTATE_ROWS,
+                 rotate_interval_s=ROTATE_INTERVAL_S):
+        self.log_dir = log_dir
+        self.capacity = buffer_rows
+        self.flush_rows = min(flush_rows, buffer_rows)
+        self.flush_interval_s = flush_interval_s
+        self.rotate_rows = rotate_rows
+        self.rotate_interval_s = rotate_interval_s
+
+        self._ring = {column: np.empty(buffer_rows, dtype=dtype) for column, dtype in RING_COLUMNS.items()}
+        self._head = 0   # rows ever written to the ring
+        self._tail = 0   # rows ever released by the writer
+        self._overflow = []
+        self._overflow_rows = 0
+        self._next_request_id = 0
+        self._cond = threading.Condition()
+        self._closed = False
+
+        self.counts = {
+            "appended": 0, "overflowed": 0, "overflow_peak_rows": 0, "high_watermark": 0,
+            "rejected_after_close": 0, "written": 0, "row_groups": 0, "files": 0,
+            "write_errors": 0, "last_flush_ms": 0.0
+        }
+        self._retry = []
+        self._writer = None
+        self._file_path = None
+        self._file_rows = 0
+        self._file_opened = 0.0
+        self._thread = threading.Thread(target=self._run, name="audit-writer", daemon=True)
+        self._thread.start()
+
+    # ------------------------------------------------------------------
+    # Request side
+    # ------------------------------------------------------------------
+    def append(self, endpoint, features, probabilities, model_version, customer_ids=None):
+        """
+        Buffer one audit row per scored record without blocking. Returns
+        False only when the log is already closed.
+        """
+        n = len(features)
+        columns = {
+            "ts": time.time(),
+            "endpoint": endpoint,
+            "model_version": model_version,
+            "customer_id": customer_ids if customer_ids is not None else None,
+            "probability": np.asarray(probabilities, dtype=np.float32),
+            "risk": band_codes(probabilities).astype(np.int8)
+        }
+        # One 2-D conversion is much cheaper than a Series per column on small frames
+        values = dict(zip(features.columns, features.to_numpy().T))
+        for column, dtype in INPUT_COLUMNS.items():
+            columns[column] = values.get(column, None if dtype is object else np.nan)
+        extra = [column for column in features.columns if column not in INPUT_COLUMNS]
+        columns["extra_inputs"] = features[extra].to_json(orient="records", lines=True).splitlines() if extra else None
+
+        with self._cond:
+            if self._closed:
+                self.counts["rejected_after_close"] += n
+                print(f"⚠️  Audit log is closed; {n} prediction records were not recorded")
+                return False
+            columns["request_id"] = self._next_request_id
+            self._next_request_id += 1
+            self.counts["appended"] += n
+
+            # Once anything has spilled, later rows follow it until the writer catches up
+            if self._overflow or self.capacity - (self._head - self._tail) < n:
+                self._overflow.append((columns, n))
+                self._overflow_rows += n
+                self.counts["overflowed"] += n
+                self.counts["overflow_peak_rows"] = max(self.counts["overflow_peak_rows"], self._overflow_rows)
+                self._cond.notify_all()
+                return True
+
+            start = self._head % self.capacity
+            first = min(n, self.capacity - start)
+            for column, ring in self._ring.items():
+                value = columns[column]
+                if isinstance(value, (np.ndarray, list)):
+                    ring[start:start + first] = value[:first]
+                    ring[:n - first] = value[first:]
+                else:
+                    ring[start:start + first] = value
+                    ring[:n - first] = value
+            self._head += n
+            self.counts["high_watermark"] = max(self.counts["high_watermark"], self._head - self._tail)
+            if self._head - self._tail >= self.flush_rows:
+                self._cond.notify_all()
+            return True
+
+    # ------------------------------------------------------------------
+    # Background side
+    # ------------------------------------------------------------------
+    def _copy_out(self, tail, head):
+        """
+        Copy ring rows [tail, head) without the lock: append() only writes
+        free slots, which never overlap rows the writer has not released.
+        """
+        n = head - tail
+        start = tail % self.capacity
+        first = min(n, self.capacity - start)
+        return {
+            column: np.concatenate([ring[start:start + first], ring[:n - first]])
+            for column, ring in self._ring.items()
+        }
+
+    def _pending(self):
+        return self._head > self._tail or bool(self._overflow)
+
+    def _run(self):
+        deadline = time.monotonic() + self.flush_interval_s
+        while True:
+            with self._cond:
+                self._cond.wait_for(
+                    lambda: self._closed or self._overflow or self._head - self._tail >= self.flush_rows,
+                    max(deadline - time.monotonic(), 0)
+                )
+                closed = self._closed
+                tail, head = self._tail, self._head
+                overflow, self._overflow = self._overflow, []
+                self._overflow_rows = 0
+
+            batches = [self._copy_out(tail, head)] if head > tail else []
+            if head > tail:
+                with self._cond:
+                    self._tail = head
+            batches += [expand(columns, n) for columns, n in overflow]
+
+            if batches or self._retry:
+                self._write(batches)
+            deadline = time.monotonic() + self.flush_interval_s
+            if self._writer is not None and (
+                self._file_rows >= self.rotate_rows
+                or time.monotonic() - self._file_opened >= self.rotate_interval_s
+            ):
+                self._rotate()
+            if closed:
+                with self._cond:
+                    if not self._pending():
+                        break
+        if self._retry:
+            self._write([])
+        self._rotate()
+
+    def _write(self, batches):
+        start = time.perf_counter()
+        tables = self._retry + [to_table(batch) for batch in batches]
+        self._retry = []
+        try:
+            if self._writer is None:
+                os.makedirs(self.log_dir, exist_ok=True)
+                self._file_path = os.path.join(
+                    self.log_dir,
+                    f"audit-{time.strftime('%Y%m%d-%H%M%S')}-{os.getpid()}-{self.counts['files']:05d}.parquet"
+                )
+                self._writer = pq.ParquetWriter(self._file_path + ".tmp", LOG_SCHEMA, compression="zstd")
+                self._file_opened = time.monotonic()
+                self._file_rows = 0
+            if len(tables) > 1:
+                tables = [pa.concat_tables(tables)]
+            while tables:
+                self._writer.write_table(tables[0])
+                self._file_rows += tables[0].num_rows
+                with self._cond:
+                    self.counts["written"] += tables[0].num_rows
+                    self.counts["row_groups"] += 1
+                tables.pop(0)
+        except Exception as e:
+            # Keep the unwritten rows for the next flush rather than losing them
+            self._retry = tables
+            with self._cond:
+                self.counts["write_errors"] += 1
+            print(f"⚠️  Audit log write failed: {e}")
+        with self._cond:
+            self.counts["last_flush_ms"] = round((time.perf_counter() - start) * 1000, 3)
+
+    def _rotate(self):
+        """Close the current file and publish it under its final name."""
+        if self._writer is None:
+            return None
+        self._writer.close()
+        os.replace(self._file_path + ".tmp", self._file_path)
+        path, self._writer = self._file_path, None
+        with self._cond:
+            self.counts["files"] += 1
+        return path
+
+    def close(self, timeout=30.0):
+        """
+        Stop accepting records, write everything buffered and close the open
+        file. Returns False (and says how much is unwritten) if the writer
+        has not finished within `timeout`.
+        """
+        with self._cond:
+            self._closed = True
+            self._cond.notify_all()
+        self._thread.join(timeout)
+        if self._thread.is_alive():
+            stats = self.stats()
+            print(f"❌ Audit writer still running after {timeout}s: {stats['buffered']} buffered, "
+                  f"{stats['overflow_rows']} overflow and {stats['pending_retry_rows']} retry rows not yet written")
+            return False
+        return True
+
+    def stats(self):
+        with self._cond:
+            counts = dict(self.counts)
+            buffered = self._head - self._tail
+            overflow_rows = self._overflow_rows
+        return {
+            **counts,
+            "buffered": buffered,
+            "buffer_capacity": self.capacity,
+            "buffer_fill": round(buffered / self.capacity, 4),
+            "overflow_rows": overflow_rows,
+            "pending_retry_rows": sum(table.num_rows for table in list(self._retry)),
+            "log_dir": self.log_dir
+        }
+
+
+def expand(columns, n):
+    """Overflow entry (arrays plus per-request scalars) -> full-length column arrays."""
+    batch = {}
+    for column, dtype in RING_COLUMNS.items():
+        value = columns[column]
+        if isinstance(value, (np.ndarray, list)):
+            batch[column] = np.asarray(value, dtype=dtype)
+        else:
+            batch[column] = np.full(n, value, dtype=dtype)
+    return batch
+
+
+def to_table(batch):
+    """Ring batch -> Arrow table in LOG_SCHEMA (labels dictionary-encoded)."""
+    arrays = {}
+    for field in LOG_SCHEMA:
+        values = batch[field.name]
+        if field.name == "risk":
+            arrays["risk"] = pa.DictionaryArray.from_arrays(pa.array(values, pa.int8()), pa.array(BAND_LABELS))
+        elif field.name in DICTIONARY_COLUMNS:
+            arrays[field.name] = pa.array(
+                [None if v is None else str(v) for v in values], pa.string()
+            ).dictionary_encode()
+        elif field.name in ("customer_id", "extra_inputs"):
+            arrays[field.name] = pa.array([None if v is None else str(v) for v in values], pa.string())
+        else:
+            arrays[field.name] = pa.array(values, field.type)
+    return pa.table(arrays).cast(LOG_SCHEMA)
+
+
+# ============================================================================
+# READING
+# ============================================================================
+def load_audit_log(log_dir=AUDIT_LOG_DIR, start=None, end=None):
+    """Closed audit files as a DataFrame, optionally limited to [start, end) (epoch seconds)."""
+    parts = sorted(os.path.join(log_dir, name) for name in os.listdir(log_dir) if name.endswith(".parquet"))
+    if not parts:
+        raise FileNotFoundError(f"No audit log files in {log_dir}")
+    dataset = ds.dataset(parts, format="parquet")
+    condition = None
+    if start is not None:
+        condition = ds.field("ts") >= start
+    if end is not None:
+        condition = ds.field("ts") < end if condition is None else condition & (ds.field("ts") < end)
+    return dataset.to_table(filter=condition).to_pandas()
+
+
+def audit_summary(log):
+    return {
+        "rows": int(len(log)),
+        "requests": int(log["request_id"].nunique()),
+        "first_ts": pd.to_datetime(log["ts"].min(), unit="s").strftime("%Y-%m-%d %H:%M:%S"),
+        "last_ts": pd.to_datetime(log["ts"].max(), unit="s").strftime("%Y-%m-%d %H:%M:%S"),
+        "rows_by_endpoint": {str(k): int(v) for k, v in log["endpoint"].astype(str).value_counts().items()},
+        "rows_by_model_version": {str(k): int(v) for k, v in log["model_version"].astype(str).value_counts().items()},
+        "rows_by_risk": {str(k): int(v) for k, v in log["risk"].astype(str).value_counts().items()},
+        "mean_probability": round(float(log["probability"].mean()), 4)
+    }
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Summarize or export the prediction audit log")
+    parser.add_argument("--log-dir", default=AUDIT_LOG_DIR)
+    parser.add_argument("--since", default=None, help="Start time, e.g. 2026-10-01 or '2026-10-01 12:00'")
+    parser.add_argument("--until", default=None, help="End time (exclusive)")
+    parser.add_argument("--export", default=None, help="Write the selected rows to this CSV")
+    args = parser.parse_args()
+
+    to_epoch = lambda value: pd.Timestamp(value).timestamp() if value else None
+    log = load_audit_log(args.log_dir, to_epoch(args.since), to_epoch(args.until))
+
+    print("\n" + "="*60)
+    print("PREDICTION AUDIT LOG")
+    print("="*60)
+    for key, value in audit_summary(log).items():
+        print(f"   {key}: {json.dumps(value) if isinstance(value, dict) else value}")
+    if args.export:
+        log.assign(ts=pd.to_datetime(log["ts"], unit="s")).to_csv(args.export, index=False)
+        print(f"\n✅ Exported {len(log):,} rows to: {args.export}")
@@ -0,0 +1,303 @@
+import os
+import threading
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+    import msvcrt
+
+import numpy as np
+import pandas as pd
+
+# Snapshot written by save() / the /feature_store/snapshot endpoint
+FEATURE_STORE_PATH = os.getenv(
+    "FEATURE_STORE_PATH",
+    os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "artifacts", "feature_store.npz")
+)
+
+INITIAL_CAPACITY = 1024
+
+# Deployment model inputs, in model order
+MODEL_FEATURES = [
+    "tenure_months",
+    "contract_type",
+    "monthly_charges",
+    "payment_method",
+    "support_ticket_count",
+    "avg_call_minutes",
+    "avg_data_usage_gb"
+]
+
+# Column name -> dtype of the array-backed table (one NumPy array per column)
+COLUMNS = {
+    # Profile (from the customers / billing tables)
+    "has_profile": np.bool_,
+    "tenure_months": np.int32,
+    "contract_code": np.int16,
+    "monthly_charges": np.float64,
+    "payment_code": np.int16,
+    # Running aggregates behind vw_support_agg
+    "ticket_count": np.int64,
+    "resolution_sum": np.float64,
+    "satisfaction_sum": np.int64,
+    "satisfaction_count": np.int64,
+    "last_ticket_day": np.int64,     # days since epoch, -1 = no tickets
+    # Running aggregates behind vw_usage_agg
+    "usage_count": np.int64,
+    "call_minutes_sum": np.float64,
+    "data_gb_sum": np.float64
+}
+
+
+def _to_days(dates):
+    return (pd.to_datetime(pd.Series(dates)).to_numpy().astype("datetime64[D]").astype(np.int64))
+
+
+class OnlineFeatureStore:
+    """
+    In-memory per-customer feature table for online scoring. Each column is a
+    NumPy array indexed by a dense row number, and customer_id -> row is a
+    dict, so a lookup is O(1). Support tickets and usage records update
+    running sums/counts; means are derived on read with the view semantics
+    (ISNULL(..., 0), integer AVG for satisfaction). Thread-safe.
+    """
+
+    def __init__(self, capacity=INITIAL_CAPACITY):
+        self._lock = threading.RLock()
+        self.index = {}
+        self.customer_ids = []
+        self.size = 0
+        self.vocab = {"contract_code": [], "payment_code": []}
+        self._codes = {"contract_code": {}, "payment_code": {}}
+        self.arrays = {col: self._empty(col, capacity) for col in COLUMNS}
+        self.events = {"tickets": 0, "usage": 0, "profiles": 0}
+
+    @staticmethod
+    def _empty(col, capacity):
+        fill = -1 if col == "last_ticket_day" else 0
+        return np.full(capacity, fill, dtype=COLUMNS[col])
+
+    # ------------------------------------------------------------------
+    # Rows and categories
+    # ------------------------------------------------------------------
+    def _grow(self, needed):
+        capacity = len(self.arrays["has_profile"])
+        if needed <= capacity:
+            return
+        new_capacity = max(needed, capacity * 2)
+        for col, array in self.arrays.items():
+            grown = self._empty(col, new_capacity)
+            grown[:capacity] = array
+            self.arrays[col] = grown
+
+    def _rows(self, customer_ids):
+        """Row numbers for the ids, appending rows for customers not seen before."""
+        rows = np.empty(len(customer_ids), dtype=np.int64)
+        for i, customer_id in enumerate(customer_ids):
+            row = self.index.get(customer_id)
+            if row is None:
+                row = self.size
+                self.index[customer_id] = row
+                self.customer_ids.append(customer_id)
+                self.size += 1
+            rows[i] = row
+        self._grow(self.size)
+        return rows
+
+    def _encode(self, col, values):
+        codes = self._codes[col]
+        out = np.empty(len(values), dtype=COLUMNS[col])
+        for i, value in enumerate(values):
+            code = codes.get(value)
+            if code is None:
+                code = codes[value] = len(self.vocab[col])
+                self.vocab[col].append(value)
+            out[i] = code
+        return out
+
+    # ------------------------------------------------------------------
+    # Ingest
+    # ------------------------------------------------------------------
+    def upsert_profiles(self, customer_ids, tenure_months, contract_type, monthly_charges, payment_method):
+        """Set the profile columns (last write wins)."""
+        with self._lock:
+            rows = self._rows(list(customer_ids))
+            a = self.arrays
+            a["tenure_months"][rows] = tenure_months
+            a["contract_code"][rows] = self._encode("contract_code", list(contract_type))
+            a["monthly_charges"][rows] = monthly_charges
+            a["payment_code"][rows] = self._encode("payment_code", list(payment_method))
+            a["has_profile"][rows] = True
+            self.events["profiles"] += len(rows)
+
+    def ingest_tickets(self, customer_ids, resolution_time_hr, satisfaction_score, ticket_date):
+        """Add support tickets (vectorized; repeated customers accumulate via np.add.at)."""
+        with self._lock:
+            rows = self._rows(list(customer_ids))
+            a = self.arrays
+            resolution = np.asarray(resolution_time_hr, dtype=np.float64)
+            satisfaction = pd.to_numeric(pd.Series(satisfaction_score), errors="coerce").to_numpy()
+            rated = ~np.isnan(satisfaction)
+
+            np.add.at(a["ticket_count"], rows, 1)
+            np.add.at(a["resolution_sum"], rows, np.nan_to_num(resolution))
+            np.add.at(a["satisfaction_sum"], rows[rated], satisfaction[rated].astype(np.int64))
+            np.add.at(a["satisfaction_count"], rows[rated], 1)
+            np.maximum.at(a["last_ticket_day"], rows, _to_days(ticket_date))
+            self.events["tickets"] += len(rows)
+
+    def ingest_usage(self, customer_ids, avg_call_minutes, avg_data_usage_gb):
+        """Add usage records (one per customer per usage month)."""
+        with self._lock:
+            rows = self._rows(list(customer_ids))
+            a = self.arrays
+            np.add.at(a["usage_count"], rows, 1)
+            np.add.at(a["call_minutes_sum"], rows, np.asarray(avg_call_minutes, dtype=np.float64))
+            np.add.at(a["data_gb_sum"], rows, np.asarray(avg_data_usage_gb, dtype=np.float64))
+            self.events["usage"] += len(rows)
+
+    def load_view(self, view):
+        """
+        Seed the store from the batch view (vw_churn_training_features or the
+        deployment view). The view only carries means, so sums are rebuilt as
+        mean x count and each customer counts as one usage record; events
+        ingested afterwards are exact.
+        """
+        with self._lock:
+            ids = view["customer_id"].astype(str).tolist()
+            self.upsert_profiles(
+                ids, view["tenure_months"].to_numpy(), view["contract_type"].astype(str).tolist(),
+                view["monthly_charges"].to_numpy(), view["payment_method"].astype(str).tolist()
+            )
+            rows = self._rows(ids)
+            a = self.arrays
+            count = view["support_ticket_count"].to_numpy(dtype=np.int64)
+            a["ticket_count"][rows] = count
+            if "avg_resolution_time" in view:
+                a["resolution_sum"][rows] = view["avg_resolution_time"].to_numpy() * count
+            if "avg_satisfaction_score" in view:
+                a["satisfaction_sum"][rows] = view["avg_satisfaction_score"].to_numpy(dtype=np.int64) * count
+                a["satisfaction_count"][rows] = count
+            a["usage_count"][rows] = 1
+            a["call_minutes_sum"][rows] = view["avg_call_minutes"].to_numpy()
+            a["data_gb_sum"][rows] = view["avg_data_usage_gb"].to_numpy()
+
+    # ------------------------------------------------------------------
+    # Read
+    # ------------------------------------------------------------------
+    def get_features(self, customer_id):
+        """The deployment model's feature dict for one customer, or None if unknown/no profile."""
+        with self._lock:
+            row = self.index.get(customer_id)
+            if row is None or not self.arrays["has_profile"][row]:
+                return None
+            a = self.arrays
+            usage_count = a["usage_count"][row]
+            satisfaction_count = a["satisfaction_count"][row]
+            ticket_count = int(a["ticket_count"][row])
+            return {
+                "tenure_months": int(a["tenure_months"][row]),
+                "contract_type": self.vocab["contract_code"][a["contract_code"][row]],
+                "monthly_charges": float(a["monthly_charges"][row]),
+                "payment_method": self.vocab["payment_code"][a["payment_code"][row]],
+                "support_ticket_count": ticket_count,
+                "avg_call_minutes": float(a["call_minutes_sum"][row] / usage_count) if usage_count else 0.0,
+                "avg_data_usage_gb": float(a["data_gb_sum"][row] / usage_count) if usage_count else 0.0,
+                "avg_resolution_time": float(a["resolution_sum"][row] / ticket_count) if ticket_count else 0.0,
+                "avg_satisfaction_score": (
+                    int(a["satisfaction_sum"][row] // satisfaction_count) if satisfaction_count else 0
+                )
+            }
+
+    def stats(self):
+        with self._lock:
+            return {
+                "customers": self.size,
+                "with_profile": int(self.arrays["has_profile"][:self.size].sum()),
+                "capacity": len(self.arrays["has_profile"]),
+                "memory_mb": round(sum(a.nbytes for a in self.arrays.values()) / 1024 / 1024, 3),
+                "events": dict(self.events)
+            }
+
+    # ------------------------------------------------------------------
+    # Snapshot persistence
+    # ------------------------------------------------------------------
+    def save(self, path=FEATURE_STORE_PATH):
+        """Write the used rows as one .npz (atomic replace)."""
+        with self._lock:
+            payload = {col: array[:self.size] for col, array in self.arrays.items()}
+            payload["customer_id"] = np.array(self.customer_ids, dtype=str)
+            payload["contract_vocab"] = np.array(self.vocab["contract_code"], dtype=str)
+            payload["payment_vocab"] = np.array(self.vocab["payment_code"], dtype=str)
+
+            os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+            tmp_path = path + ".tmp.npz"
+            np.savez(tmp_path, **payload)
+            os.replace(tmp_path, path)
+        return path
+
+    @classmethod
+    def load(cls, path=FEATURE_STORE_PATH):
+        with np.load(path) as data:
+            size = len(data["customer_id"])
+            store = cls(capacity=max(size, INITIAL_CAPACITY))
+            for col in COLUMNS:
+                store.arrays[col][:size] = data[col]
+            store.customer_ids = data["customer_id"].tolist()
+            store.index = {customer_id: row for row, customer_id in enumerate(store.customer_ids)}
+            store.size = size
+            for col, key in [("contract_code", "contract_vocab"), ("payment_code", "payment_vocab")]:
+                store.vocab[col] = data[key].tolist()
+                store._codes[col] = {value: code for code, value in enumerate(store.vocab[col])}
+        return store
+
+
+def acquire_owner_lock(path=FEATURE_STORE_PATH):
+    """
+    Non-blocking exclusive lock next to the snapshot. The store lives in one
+    process's memory, so under several server workers only the process holding
+    this lock serves (and saves) it. Returns the open lock file (keep it for
+    the process lifetime) or None when another live process owns the store.
+    """
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    lock_file = open(path + ".lock", "a+")
+    try:
+        if fcntl is not None:
+            fcntl.flock(lock_file, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        else:
+            msvcrt.locking(lock_file.fileno(), msvcrt.LK_NBLCK, 1)
+    except OSError:
+        lock_file.close()
+        return None
+    return lock_file
+
+
+def load_or_create(path=FEATURE_STORE_PATH):
+    """The persisted store if a snapshot exists, else an empty one."""
+    if os.path.exists(path):
+        return OnlineFeatureStore.load(path)
+    return OnlineFeatureStore()
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Seed the online feature store snapshot from the batch view")
+    parser.add_argument("--snapshot", default=None,
+                        help="Training-view Parquet (e.g. data/snapshot/churn_training_features.parquet); "
+                             "default: load vw_churn_deployment_features from the database")
+    parser.add_argument("--output", default=FEATURE_STORE_PATH)
+    args = parser.parse_args()
+
+    if args.snapshot:
+        view = pd.read_parquet(args.snapshot)
+    else:
+        from retraining.model_retraining import load_deployment_data
+        view = load_deployment_data()
+
+    store = OnlineFeatureStore()
+    store.load_view(view)
+    store.save(args.output)
+    print(f"✅ Feature store with {store.size} customers saved to: {args.output}")
+    print(f"   {store.stats()}")
@@ -0,0 +1,325 @@
+import hashlib
+import json
+import os
+import threading
+import time
+from collections import OrderedDict, deque
+
+import joblib
+import numpy as np
+import pandas as pd
+
+from src.feature_engineering import TENURE_LABELS
+
+ARTIFACTS_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "artifacts")
+# One file per model exported from the all_trained_models bundle, plus its manifest
+REGISTRY_DIR = os.getenv("MODEL_REGISTRY_DIR", os.path.join(ARTIFACTS_DIR, "models"))
+MANIFEST_NAME = "registry.json"
+BUNDLE_PATH = os.path.join(ARTIFACTS_DIR, "all_trained_models.joblib")
+
+# Single-model artifacts registered under a fixed name
+SINGLE_ARTIFACTS = {
+    "deployment": os.path.join(ARTIFACTS_DIR, "churn_deployment_model.joblib"),
+    "churn_model_v1": os.path.join(ARTIFACTS_DIR, "churn_model_v1.joblib")
+}
+DEFAULT_MODEL = "deployment"
+
+# Loaded models may use up to this much memory (estimated from artifact size)
+MEMORY_BUDGET_MB = float(os.getenv("MODEL_MEMORY_BUDGET_MB", 512))
+# Recent per-model latencies kept for percentiles
+LATENCY_WINDOW = 1000
+
+# Every value a categorical input can take, for columns whose fitted categories
+# may be a subset (churn_model_v1 only saw tenure_bucket 24-48 and 48+)
+CATEGORY_DOMAINS = {"tenure_bucket": TENURE_LABELS}
+
+
+def file_version(path):
+    """Content hash of an artifact; changes whenever the file is replaced."""
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            digest.update(block)
+    return digest.hexdigest()[:10]
+
+
+def input_schema(pipeline):
+    """
+    Raw input columns of a fitted (ColumnTransformer -> estimator) pipeline:
+    numeric columns, and categorical columns with the categories they accept.
+    An encoder with handle_unknown='error' accepts only its fitted categories;
+    otherwise the column's CATEGORY_DOMAINS entry (or, without one, the fitted
+    categories) applies. fitted_categories is informational.
+    """
+    preprocessor = pipeline.steps[0][1]
+    columns = {}
+    for name, transformer, transformer_columns in preprocessor.transformers_:
+        if name == "remainder" or transformer == "drop":
+            continue
+        if hasattr(transformer, "categories_"):
+            handle_unknown = getattr(transformer, "handle_unknown", "error")
+            for column, categories in zip(transformer_columns, transformer.categories_):
+                fitted = [str(c) for c in categories]
+                accepted = fitted if handle_unknown == "error" else list(CATEGORY_DOMAINS.get(column, fitted))
+                columns[column] = {"type": "categorical", "categories": accepted, "fitted_categories": fitted,
+                                   "handle_unknown": handle_unknown}
+        else:
+            for column in transformer_columns:
+                columns[column] = {"type": "numeric"}
+    order = list(getattr(preprocessor, "feature_names_in_", columns))
+    return {"features": order, "columns": {column: columns[column] for column in order if column in columns}}
+
+
+def records_frame(schema, records):
+    """
+    Validate request records against a model's input schema and build its
+    input frame. Raises ValueError naming the first missing column, non-numeric
+    value or category the column does not accept (see input_schema).
+    """
+    df = pd.DataFrame.from_records(records)
+    missing = [column for column in schema["features"] if column not in df.columns]
+    if missing:
+        raise ValueError(f"Missing features: {missing}")
+
+    df = df[schema["features"]]
+    for column, spec in schema["columns"].items():
+        if spec["type"] == "numeric":
+            values = pd.to_numeric(df[column], errors="coerce")
+            if values.isna().any():
+                raise ValueError(f"{column} must be numeric (record {int(values.isna().to_numpy().argmax())})")
+            df[column] = values
+        else:
+            unknown = ~df[column].astype(str).isin(spec["categories"])
+            if unknown.any():
+                raise ValueError(f"{column} must be one of {spec['categories']} "
+                                 f"(record {int(unknown.to_numpy().argmax())})")
+    return df
+
+
+class LoadedModel:
+    def __init__(self, name, version, artifact, size_mb):
+        self.name = name
+        self.version = version
+        self.pipeline = artifact["model"]
+        self.threshold = artifact.get("threshold")
+        self.model_name = artifact.get("model_name", name)
+        self.created_at = artifact.get("created_at")
+        self.size_mb = size_mb
+        self.schema = input_schema(self.pipeline)
+        self.loaded_at = time.time()
+
+
+class ModelRegistry:
+    """
+    Name/version router over the model artifacts. Models are unpickled on
+    first use and kept in an LRU cache whose total estimated size stays
+    within memory_budget_mb; the least recently used models are evicted
+    first (the pinned default model never is). Thread-safe; concurrent first
+    requests for one model load it once. Tracks loads, evictions, requests
+    and prediction latency per model.
+    """
+
+    def __init__(self, entries, memory_budget_mb=MEMORY_BUDGET_MB, pinned=(DEFAULT_MODEL,)):
+        self.entries = entries
+        self.memory_budget_mb = memory_budget_mb
+        self.pinned = set(pinned)
+        self._cache = OrderedDict()
+        self._lock = threading.RLock()
+        self._load_locks = {name: threading.Lock() for name in entries}
+        self.metrics = {
+            name: {"loads": 0, "evictions": 0, "requests": 0, "rows": 0, "errors": 0,
+                   "latencies_ms": deque(maxlen=LATENCY_WINDOW)}
+            for name in entries
+        }
+
+    # ------------------------------------------------------------------
+    # Resolution and loading
+    # ------------------------------------------------------------------
+    def resolve(self, ref):
+        """'name', 'name@version' or a bare version -> registered name (KeyError if unknown)."""
+        name, _, version = ref.partition("@")
+        if name in self.entries:
+            if version and self.entries[name]["version"] != version:
+                raise KeyError(f"Model {name} has version {self.entries[name]['version']}, not {version}")
+            return name
+        matches = [n for n, entry in self.entries.items() if entry["version"] == ref]
+        if len(matches) == 1:
+            return matches[0]
+        raise KeyError(f"Unknown model {ref!r}; available: {sorted(self.entries)}")
+
+    def get(self, ref):
+        """The loaded model for a reference, loading (and evicting) as needed."""
+        name = self.resolve(ref)
+        with self._lock:
+            if name in self._cache:
+                self._cache.move_to_end(name)
+                return self._cache[name]
+
+        with self._load_locks[name]:
+            with self._lock:
+                if name in self._cache:
+                    self._cache.move_to_end(name)
+                    return self._cache[name]
+
+            entry = self.entries[name]
+            artifact = joblib.load(entry["path"])
+            loaded = LoadedModel(name, entry["version"], artifact, entry["size_mb"])
+            print(f"📦 Loaded model {name}@{entry['version']} ({entry['size_mb']:.2f} MB)")
+
+            with self._lock:
+                self._evict_for(loaded.size_mb)
+                self._cache[name] = loaded
+                self.metrics[name]["loads"] += 1
+            return loaded
+
+    def _evict_for(self, size_mb):
+        """Evict least recently used, unpinned models until size_mb fits in the budget."""
+        for name in list(self._cache):
+            if self.memory_used_mb() + size_mb <= self.memory_budget_mb:
+                break
+            if name in self.pinned:
+                continue
+            del self._cache[name]
+            self.metrics[name]["evictions"] += 1
+            print(f"♻️  Evicted model {name} (LRU)")
+        if self.memory_used_mb() + size_mb > self.memory_budget_mb:
+            print(f"⚠️  Model registry over its {self.memory_budget_mb} MB budget (pinned or oversized models)")
+
+    def memory_used_mb(self):
+        with self._lock:
+            return sum(model.size_mb for model in self._cache.values())
+
+    # ------------------------------------------------------------------
+    # Prediction
+    # ------------------------------------------------------------------
+    def predict_proba(self, ref, df):
+        """P(churn) from the selected model, with per-model latency tracking."""
+        model = self.get(ref)
+        metrics = self.metrics[model.name]
+        start = time.perf_counter()
+        try:
+            probs = model.pipeline.predict_proba(df[model.schema["features"]])[:, 1]
+        except Exception:
+            with self._lock:
+                metrics["errors"] += 1
+            raise
+        elapsed_ms = (time.perf_counter() - start) * 1000
+        with self._lock:
+            metrics["requests"] += 1
+            metrics["rows"] += len(df)
+            metrics["latencies_ms"].append(elapsed_ms)
+        return model, probs
+
+    # ------------------------------------------------------------------
+    # Introspection
+    # ------------------------------------------------------------------
+    def model_stats(self, name):
+        with self._lock:
+            metrics = dict(self.metrics[name])
+            latencies = np.asarray(metrics.pop("latencies_ms"), dtype=float)
+        if len(latencies):
+            metrics["latency_p50_ms"] = round(float(np.percentile(latencies, 50)), 3)
+            metrics["latency_p95_ms"] = round(float(np.percentile(latencies, 95)), 3)
+        return metrics
+
+    def catalog(self):
+        with self._lock:
+            loaded = set(self._cache)
+        return [
+            {
+                "name": name,
+                "version": entry["version"],
+                "source": entry["source"],
+                "size_mb": round(entry["size_mb"], 3),
+                "loaded": name in loaded,
+                **self.model_stats(name)
+            }
+            for name, entry in self.entries.items()
+        ]
+
+    def stats(self):
+        with self._lock:
+            loaded = list(self._cache)
+        return {
+            "registered": len(self.entries),
+            "loaded": loaded,
+            "memory_used_mb": round(self.memory_used_mb(), 3),
+            "memory_budget_mb": self.memory_budget_mb
+        }
+
+
+# ============================================================================
+# DISCOVERY / EXPORT
+# ============================================================================
+def _entry(path, source, version=None):
+    return {
+        "path": path,
+        "source": source,
+        "version": version or file_version(path),
+        "size_mb": os.path.getsize(path) / 1024 / 1024
+    }
+
+
+def discover_models(registry_dir=REGISTRY_DIR, single_artifacts=SINGLE_ARTIFACTS):
+    """
+    Registry entries without unpickling anything: the single-model artifacts
+    plus every model exported from the bundle into registry_dir.
+    """
+    entries = {
+        name: _entry(path, os.path.basename(path))
+        for name, path in single_artifacts.items() if os.path.exists(path)
+    }
+
+    manifest_path = os.path.join(registry_dir, MANIFEST_NAME)
+    if os.path.exists(manifest_path):
+        with open(manifest_path) as f:
+            manifest = json.load(f)
+        for name, item in manifest["models"].items():
+            path = os.path.join(registry_dir, item["file"])
+            if os.path.exists(path) and name not in entries:
+                entries[name] = _entry(path, manifest.get("source", "bundle"), version=item["version"])
+    elif os.path.exists(BUNDLE_PATH):
+        print(f"⚠️  {BUNDLE_PATH} is not exported; run `python -m deployment.model_registry --export` "
+              f"to serve its models")
+    return entries
+
+
+def export_bundle(bundle_path=BUNDLE_PATH, registry_dir=REGISTRY_DIR):
+    """
+    Split the all_trained_models bundle (which also carries X_test/y_test)
+    into one artifact per model, so the registry can load each on its own.
+    """
+    bundle = joblib.load(bundle_path)
+    os.makedirs(registry_dir, exist_ok=True)
+
+    manifest = {"source": os.path.basename(bundle_path), "training_date": bundle.get("training_date"), "models": {}}
+    for name, pipeline in bundle["models"].items():
+        path = os.path.join(registry_dir, f"{name}.joblib")
+        joblib.dump({
+            "model": pipeline,
+            "model_name": name,
+            "created_at": bundle.get("training_date"),
+            "test_metrics": bundle.get("test_metrics", {}).get(name)
+        }, path)
+        manifest["models"][name] = {"file": os.path.basename(path), "version": file_version(path)}
+        print(f"   {name}: {path}")
+
+    with open(os.path.join(registry_dir, MANIFEST_NAME), "w") as f:
+        json.dump(manifest, f, indent=2, default=str)
+    print(f"✅ Exported {len(manifest['models'])} models to: {registry_dir}")
+    return manifest
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Model registry for multi-model serving")
+    parser.add_argument("--export", action="store_true", help=f"Split {BUNDLE_PATH} into per-model artifacts")
+    parser.add_argument("--bundle", default=BUNDLE_PATH)
+    parser.add_argument("--registry-dir", default=REGISTRY_DIR)
+    args = parser.parse_args()
+
+    if args.export:
+        export_bundle(args.bundle, args.registry_dir)
+    for name, entry in discover_models(args.registry_dir).items():
+        print(f"   {name}@{entry['version']}  {entry['size_mb']:.2f} MB  ({entry['source']})")
@@ -0,0 +1,79 @@
+import numpy as np
+
+# Number of reasons returned per prediction
+TOP_K = 3
+
+
+class ReasonCodeExplainer:
+    """
+    Exact per-feature contributions for a fitted (preprocessing -> LogisticRegression)
+    pipeline. The logit decomposes as intercept + sum(coef * encoded value), so a raw
+    feature's contribution is the sum over its encoded columns; one-hot columns are
+    grouped back to their raw feature (contract_type, payment_method).
+    """
+
+    def __init__(self, pipeline):
+        self.preprocessor = pipeline.named_steps["preprocessing"]
+        self.clf = pipeline.named_steps["model"]
+        self.coef = self.clf.coef_[0]
+
+        # Raw feature behind each encoded column, in encoded-column order
+        encoded_groups = []
+        for name, transformer, columns in self.preprocessor.transformers_:
+            if name == "remainder" or transformer == "drop":
+                continue
+            if hasattr(transformer, "categories_"):
+                for column, categories in zip(columns, transformer.categories_):
+                    encoded_groups.extend([column] * len(categories))
+            else:
+                encoded_groups.extend(columns)
+
+        self.features = list(dict.fromkeys(encoded_groups))
+
+        # (n_encoded x n_features) indicator matrix with the coefficients folded in,
+        # so a single matmul both weights and sums each group
+        group_index = np.array([self.features.index(g) for g in encoded_groups])
+        group_matrix = np.zeros((len(encoded_groups), len(self.features)))
+        group_matrix[np.arange(len(encoded_groups)), group_index] = 1.0
+        self.weighted_groups = self.coef[:, None] * group_matrix
+
+    def contributions(self, X_encoded):
+        """Per-raw-feature logit contributions, shape (n_rows, n_features)."""
+        if hasattr(X_encoded, "toarray"):
+            X_encoded = X_encoded.toarray()
+        return np.asarray(X_encoded) @ self.weighted_groups
+
+    def top_reasons(self, contributions, top_k=TOP_K):
+        """Indices of the top_k largest absolute contributions per row, largest first."""
+        order = np.argsort(-np.abs(contributions), axis=1, kind="stable")
+        return order[:, :top_k]
+
+    def predict_with_reasons(self, df, top_k=TOP_K):
+        """
+        Score a batch and explain it with a single preprocessing pass.
+        Returns (probabilities, top feature indices, top contributions) as arrays;
+        format_reasons turns them into response dicts.
+        """
+        X_encoded = self.preprocessor.transform(df)
+        probs = self.clf.predict_proba(X_encoded)[:, 1]
+
+        contributions = self.contributions(X_encoded)
+        top = self.top_reasons(contributions, top_k)
+        top_values = np.take_along_axis(contributions, top, axis=1)
+        return probs, top, top_values
+
+    def format_reasons(self, top, top_values):
+        """Per-row lists of {feature, contribution, direction} dicts."""
+        names = np.asarray(self.features, dtype=object)[top].tolist()
+        values = np.round(top_values, 4).tolist()
+        return [
+            [
+                {
+                    "feature": feature,
+                    "contribution": value,
+                    "direction": "increases_risk" if value > 0 else "decreases_risk"
+                }
+                for feature, value in zip(row_names, row_values)
+            ]
+            for row_names, row_values in zip(names, values)
+        ]
@@ -0,0 +1,233 @@
+import os
+import queue
+import threading
+import time
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+from deployment.what_if import BAND_THRESHOLDS
+
+# Challenger artifact to shadow-score with (unset = shadow scoring disabled)
+CHALLENGER_PATH = os.getenv("CHALLENGER_MODEL_PATH")
+SHADOW_LOG_DIR = os.getenv(
+    "SHADOW_LOG_DIR",
+    os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "logs", "shadow")
+)
+
+# Requests waiting for the challenger; new work is dropped when full
+QUEUE_SIZE = 1000
+# Queued requests scored together in one challenger call; the worker waits up
+# to BATCH_WAIT_S after the first one so light traffic is still batched
+MAX_BATCH_REQUESTS = 256
+BATCH_WAIT_S = 0.2
+# Buffered rows are written once either limit is reached
+FLUSH_ROWS = 10_000
+FLUSH_INTERVAL_S = 30.0
+
+# Risk bands as in get_action_suggestion: LOW < 0.40 <= MEDIUM < 0.70 <= HIGH
+BAND_EDGES = sorted(BAND_THRESHOLDS.values())
+BAND_LABELS = ["LOW", "MEDIUM", "HIGH"]
+
+LOG_SCHEMA = pa.schema([
+    ("ts", pa.float64()),
+    ("endpoint", pa.dictionary(pa.int8(), pa.string())),
+    ("customer_id", pa.string()),
+    ("champion_probability", pa.float32()),
+    ("challenger_probability", pa.float32())
+])
+
+
+def band_codes(probabilities):
+    """Index into BAND_LABELS per probability (same edges as the API's risk levels)."""
+    return np.searchsorted(BAND_EDGES, probabilities, side="right")
+
+
+class ShadowScorer:
+    """
+    Scores live requests with a challenger model off the response path.
+    Endpoints hand over their already-built model frame and champion scores
+    with submit(), which never blocks: when the bounded queue is full the
+    work is dropped and counted. A daemon thread drains the queue, scores
+    queued requests together in one predict_proba call and appends both
+    scores to zstd Parquet files under log_dir.
+    """
+
+    def __init__(self, challenger, log_dir=SHADOW_LOG_DIR, queue_size=QUEUE_SIZE,
+                 flush_rows=FLUSH_ROWS, flush_interval_s=FLUSH_INTERVAL_S):
+        self.challenger = challenger
+        self.log_dir = log_dir
+        self.flush_rows = flush_rows
+        self.flush_interval_s = flush_interval_s
+        self.queue = queue.Queue(maxsize=queue_size)
+        self.counts = {"submitted": 0, "dropped": 0, "scored": 0, "errors": 0, "written": 0, "files": 0}
+        self._counts_lock = threading.Lock()
+        self._buffer = []
+        self._last_flush = time.monotonic()
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="shadow-scorer", daemon=True)
+        self._thread.start()
+
+    # ------------------------------------------------------------------
+    # Request side
+    # ------------------------------------------------------------------
+    def submit(self, endpoint, features, champion_probabilities, customer_ids=None):
+        """Queue one request for challenger scoring; returns False if it was dropped."""
+        try:
+            self.queue.put_nowait((time.time(), endpoint, features, champion_probabilities, customer_ids))
+            accepted = True
+        except queue.Full:
+            accepted = False
+        with self._counts_lock:
+            self.counts["submitted"] += 1
+            self.counts["dropped"] += not accepted
+        return accepted
+
+    # ------------------------------------------------------------------
+    # Background side
+    # ------------------------------------------------------------------
+    def _run(self):
+        while not self._stop.is_set() or not self.queue.empty():
+            try:
+                items = [self.queue.get(timeout=0.5)]
+            except queue.Empty:
+                self._maybe_flush()
+                continue
+            deadline = time.monotonic() + BATCH_WAIT_S
+            while len(items) < MAX_BATCH_REQUESTS and not self._stop.is_set():
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    items.append(self.queue.get(timeout=remaining))
+                except queue.Empty:
+                    break
+            self._score(items)
+            self._maybe_flush()
+        self.flush()
+
+    def _score(self, items):
+        try:
+            features = pd.concat([item[2] for item in items], ignore_index=True)
+            challenger = self.challenger.predict_proba(features)[:, 1]
+        except Exception as e:
+            with self._counts_lock:
+                self.counts["errors"] += len(items)
+            print(f"⚠️  Shadow scoring failed: {e}")
+            return
+
+        offset = 0
+        for ts, endpoint, frame, champion, customer_ids in items:
+            n = len(frame)
+            self._buffer.append(pd.DataFrame({
+                "ts": np.full(n, ts),
+                "endpoint": endpoint,
+                "customer_id": customer_ids if customer_ids is not None else [None] * n,
+                "champion_probability": np.asarray(champion, dtype=np.float32),
+                "challenger_probability": challenger[offset:offset + n].astype(np.float32)
+            }))
+            offset += n
+        with self._counts_lock:
+            self.counts["scored"] += offset
+
+    def _maybe_flush(self):
+        buffered = sum(len(part) for part in self._buffer)
+        if buffered >= self.flush_rows or (
+            buffered and time.monotonic() - self._last_flush >= self.flush_interval_s
+        ):
+            self.flush()
+
+    def flush(self):
+        """Write buffered rows to a new Parquet part (called from the worker thread)."""
+        self._last_flush = time.monotonic()
+        if not self._buffer:
+            return None
+        rows = pd.concat(self._buffer, ignore_index=True)
+        self._buffer = []
+
+        os.makedirs(self.log_dir, exist_ok=True)
+        path = os.path.join(self.log_dir, f"shadow-{time.strftime('%Y%m%d-%H%M%S')}-{os.getpid()}-"
+                                          f"{self.counts['files']:05d}.parquet")
+        table = pa.Table.from_pandas(rows, schema=LOG_SCHEMA, preserve_index=False)
+        pq.write_table(table, path + ".tmp", compression="zstd")
+        os.replace(path + ".tmp", path)
+        with self._counts_lock:
+            self.counts["written"] += len(rows)
+            self.counts["files"] += 1
+        return path
+
+    def close(self, timeout=10.0):
+        """Stop accepting work, score what is queued and flush it to disk."""
+        self._stop.set()
+        self._thread.join(timeout)
+
+    def stats(self):
+        with self._counts_lock:
+            counts = dict(self.counts)
+        return {**counts, "pending": self.queue.qsize(), "log_dir": self.log_dir}
+
+
+# ============================================================================
+# REPORT
+# ============================================================================
+def load_shadow_log(log_dir=SHADOW_LOG_DIR):
+    parts = sorted(name for name in os.listdir(log_dir) if name.endswith(".parquet"))
+    if not parts:
+        raise FileNotFoundError(f"No shadow log files in {log_dir}")
+    return pd.concat([pd.read_parquet(os.path.join(log_dir, name)) for name in parts], ignore_index=True)
+
+
+def shadow_report(log, threshold=min(BAND_EDGES)):
+    """
+    Champion vs challenger on logged traffic: flag agreement at `threshold`,
+    score deltas (challenger - champion) and risk band changes.
+    """
+    champion = log["champion_probability"].to_numpy(dtype=np.float64)
+    challenger = log["challenger_probability"].to_numpy(dtype=np.float64)
+    delta = challenger - champion
+    champion_band = band_codes(champion)
+    challenger_band = band_codes(challenger)
+
+    transitions = pd.crosstab(
+        pd.Categorical.from_codes(champion_band, BAND_LABELS),
+        pd.Categorical.from_codes(challenger_band, BAND_LABELS),
+        rownames=["champion"], colnames=["challenger"], dropna=False
+    )
+    return {
+        "rows": int(len(log)),
+        "first_ts": pd.to_datetime(log["ts"].min(), unit="s").strftime("%Y-%m-%d %H:%M:%S"),
+        "last_ts": pd.to_datetime(log["ts"].max(), unit="s").strftime("%Y-%m-%d %H:%M:%S"),
+        "rows_by_endpoint": {str(k): int(v) for k, v in log["endpoint"].astype(str).value_counts().items()},
+        "flag_agreement": round(float(np.mean((champion >= threshold) == (challenger >= threshold))), 4),
+        "band_agreement": round(float(np.mean(champion_band == challenger_band)), 4),
+        "score_correlation": round(float(np.corrcoef(champion, challenger)[0, 1]), 4) if len(log) > 1 else None,
+        "mean_delta": round(float(delta.mean()), 4),
+        "mean_abs_delta": round(float(np.abs(delta).mean()), 4),
+        "p95_abs_delta": round(float(np.percentile(np.abs(delta), 95)), 4),
+        "moved_up_band": int(np.sum(challenger_band > champion_band)),
+        "moved_down_band": int(np.sum(challenger_band < champion_band)),
+        "band_transitions": transitions
+    }
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Champion vs challenger report from the shadow scoring log")
+    parser.add_argument("--log-dir", default=SHADOW_LOG_DIR)
+    parser.add_argument("--threshold", type=float, default=min(BAND_EDGES),
+                        help="Probability at which a customer is flagged, for flag agreement")
+    args = parser.parse_args()
+
+    report = shadow_report(load_shadow_log(args.log_dir), args.threshold)
+    transitions = report.pop("band_transitions")
+
+    print("\n" + "="*60)
+    print("SHADOW SCORING REPORT (challenger vs champion)")
+    print("="*60)
+    for key, value in report.items():
+        print(f"   {key}: {value}")
+    print("\n📊 Risk band transitions (rows: champion, columns: challenger)")
+    print(transitions.to_string())
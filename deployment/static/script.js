@@ -357,6 +357,11 @@ document.getElementById("churnForm").onsubmit = async function(event) {
         
         document.getElementById("suggestionText").textContent = data.suggestion;
         
+        // Top contributing features (↑ raises churn risk, ↓ lowers it)
+        document.getElementById("reasonsText").textContent = (data.reasons || [])
+            .map(r => `${r.feature.replace(/_/g, " ")} ${r.direction === "increases_risk" ? "↑" : "↓"}`)
+            .join(", ");
+        
         // Hide spinner, show results
         loading.style.display = "none";
         resultBox.style.display = "block";
@@ -0,0 +1,119 @@
+import numpy as np
+import pandas as pd
+
+# Candidate monthly discounts: 0, 0.25, ..., 50 dollars
+DISCOUNT_STEP = 0.25
+MAX_DISCOUNT = 50.0
+# Lowest monthly_charges validate_input accepts; discounted bills stay at or above it
+MIN_MONTHLY_CHARGES = 19.0
+# Largest grid a single request may expand to
+MAX_VARIANTS = 20000
+
+# Cost model for ranking changes: a discount is revenue given up over the
+# horizon; moving contract or payment method carries a one-off incentive
+HORIZON_MONTHS = 12
+CONTRACT_CHANGE_COST = 25.0
+PAYMENT_CHANGE_COST = 5.0
+
+# Upper edges of the get_action_suggestion bands (HIGH >= 0.70 > MEDIUM >= 0.40 > LOW)
+BAND_THRESHOLDS = {"below_high": 0.70, "below_medium": 0.40}
+
+
+def discount_count(monthly_charges, max_discount=MAX_DISCOUNT, step=DISCOUNT_STEP):
+    """Size of discount_grid, computed without allocating it."""
+    if step <= 0 or max_discount < 0:
+        raise ValueError("discount_step must be positive and max_discount non-negative")
+    cap = max(0.0, min(max_discount, monthly_charges - MIN_MONTHLY_CHARGES))
+    return int(cap / step + 1e-9) + 1
+
+
+def discount_grid(monthly_charges, max_discount=MAX_DISCOUNT, step=DISCOUNT_STEP):
+    """Candidate discounts from 0 up to max_discount, never below the MIN_MONTHLY_CHARGES bill."""
+    return np.arange(discount_count(monthly_charges, max_discount, step)) * step
+
+
+def build_grid(customer, contracts, payments, discounts):
+    """
+    Every (contract, payment, discount) combination for one customer as one
+    model-ready frame (cartesian product via repeat/tile), plus the index
+    arrays of each row's choice.
+    """
+    n_contracts, n_payments, n_discounts = len(contracts), len(payments), len(discounts)
+    n = n_contracts * n_payments * n_discounts
+
+    contract_idx = np.repeat(np.arange(n_contracts), n_payments * n_discounts)
+    payment_idx = np.tile(np.repeat(np.arange(n_payments), n_discounts), n_contracts)
+    discount_idx = np.tile(np.arange(n_discounts), n_contracts * n_payments)
+
+    grid = pd.DataFrame({
+        "tenure_months": np.full(n, customer["tenure_months"]),
+        "contract_type": np.asarray(contracts, dtype=object)[contract_idx],
+        "monthly_charges": customer["monthly_charges"] - np.asarray(discounts)[discount_idx],
+        "payment_method": np.asarray(payments, dtype=object)[payment_idx],
+        "support_ticket_count": np.full(n, customer["support_ticket_count"]),
+        "avg_call_minutes": np.full(n, customer["avg_call_minutes"]),
+        "avg_data_usage_gb": np.full(n, customer["avg_data_usage_gb"])
+    })
+    return grid, contract_idx, payment_idx, discount_idx
+
+
+def evaluate_what_if(model, customer, contracts, payments, max_discount=MAX_DISCOUNT, step=DISCOUNT_STEP):
+    """
+    Score the whole change grid for one customer with a single predict_proba
+    call and find, for each band threshold, the cheapest change that brings
+    the churn probability below it (ties: fewer changes, then lower risk).
+    `customer` and the candidate lists use the model's category labels.
+    """
+    contracts = list(dict.fromkeys(contracts))
+    payments = list(dict.fromkeys(payments))
+    # Checked before anything is allocated: max_discount and step come from the request
+    n_variants = len(contracts) * len(payments) * discount_count(customer["monthly_charges"], max_discount, step)
+    if n_variants > MAX_VARIANTS:
+        raise ValueError(f"Grid of {n_variants} variants exceeds the limit of {MAX_VARIANTS}")
+    discounts = discount_grid(customer["monthly_charges"], max_discount, step)
+
+    grid, contract_idx, payment_idx, discount_idx = build_grid(customer, contracts, payments, discounts)
+    probs = model.predict_proba(grid)[:, 1]
+
+    contract_changed = np.asarray(contracts, dtype=object)[contract_idx] != customer["contract_type"]
+    payment_changed = np.asarray(payments, dtype=object)[payment_idx] != customer["payment_method"]
+    discount = discounts[discount_idx]
+    cost = (
+        discount * HORIZON_MONTHS
+        + contract_changed * CONTRACT_CHANGE_COST
+        + payment_changed * PAYMENT_CHANGE_COST
+    )
+    n_changes = contract_changed.astype(int) + payment_changed + (discount > 0)
+
+    # Baseline (unchanged) probability, scored in the same call when it is in the grid
+    unchanged = np.flatnonzero(~contract_changed & ~payment_changed & (discount == 0))
+    baseline = float(probs[unchanged[0]]) if len(unchanged) else float(
+        model.predict_proba(pd.DataFrame([customer]))[0, 1]
+    )
+
+    # Cheapest first, then fewest changes, then lowest probability
+    order = np.lexsort((probs, n_changes, cost))
+    options = {}
+    for band, threshold in BAND_THRESHOLDS.items():
+        hits = order[probs[order] < threshold]
+        if not len(hits):
+            options[band] = None
+            continue
+        best = hits[0]
+        options[band] = {
+            "contract_type": contracts[contract_idx[best]],
+            "payment_method": payments[payment_idx[best]],
+            "discount": float(discount[best]),
+            "monthly_charges": float(grid["monthly_charges"].iat[best]),
+            "probability": float(probs[best]),
+            "cost": round(float(cost[best]), 2),
+            "changes": [
+                name for name, changed in [
+                    ("contract_type", contract_changed[best]),
+                    ("payment_method", payment_changed[best]),
+                    ("discount", discount[best] > 0)
+                ] if changed
+            ]
+        }
+
+    return {"baseline_probability": baseline, "variants_scored": int(n_variants), "options": options}
@@ -10,9 +10,12 @@ import os
 from datetime import datetime
 warnings.filterwarnings('ignore')
 
-from src.data_ingestion import get_connection  # Import connection function
+from src.data_ingestion import fetch_frame, build_query, DEPLOYMENT_VIEW  # Pooled / Arrow fetch
+from src.instrumentation import stage
 
 MODEL_PATH = "artifacts/churn_deployment_model.joblib"
+# Where --challenger saves a retrained model for shadow scoring (CHALLENGER_MODEL_PATH)
+CHALLENGER_PATH = "artifacts/churn_challenger_model.joblib"
 
 # Only the 7 selected important features
 selected_features = [
@@ -25,18 +28,19 @@ selected_features = [
     "avg_data_usage_gb"
 ]
 
-def load_deployment_data():
+def load_deployment_data(columns=None, filters=None):
     """
     Load data directly from the deployment view in SQL.
     This ensures we're using the exact same features as production.
+    `columns` / `filters` are pushed down into the query (see build_query).
     """
     print("\n📥 Loading data from SQL deployment view...")
     
-    query = "SELECT * FROM vw_churn_deployment_features"
-    
     try:
-        with get_connection() as conn:
-            df = pd.read_sql(query, conn)
+        query, params = build_query(DEPLOYMENT_VIEW, columns, filters)
+        with stage("ingestion", source=DEPLOYMENT_VIEW) as info:
+            df = fetch_frame(query, params)
+            info["rows"] = len(df)
         
         print(f"✅ Loaded {df.shape[0]} rows, {df.shape[1]} columns")
         print(f"   Features: {list(df.columns)}")
@@ -56,8 +60,8 @@ def prepare_retrained_dataset():
     Prepare dataset for retraining using SQL view.
     No data cleaning needed as view already has clean data.
     """
-    # Load data directly from SQL view
-    df = load_deployment_data()
+    # Load data directly from SQL view (only the 7 features and the target)
+    df = load_deployment_data(columns=selected_features + ["churn"])
     
     if df is None:
         raise Exception("Failed to load data from SQL view")
@@ -100,7 +104,8 @@ def cross_validate_model(pipeline, X, y):
     print("="*50)
     
     cv = StratifiedKFold(n_splits=5, shuffle=True, random_state=42)
-    scores = cross_val_score(pipeline, X, y, cv=cv, scoring="roc_auc", n_jobs=-1)
+    with stage("cross_validation", model="LogisticRegression", rows=len(X)):
+        scores = cross_val_score(pipeline, X, y, cv=cv, scoring="roc_auc", n_jobs=-1)
     
     print(f"\n📊 ROC-AUC Scores: {[round(s, 4) for s in scores]}")
     print(f"📈 Mean ROC-AUC: {scores.mean():.4f} (+/- {scores.std()*2:.4f})")
@@ -132,7 +137,8 @@ def tune_logistic_regression(base_pipeline, X, y):
     )
     
     print("\n🔄 Searching over parameter grid...")
-    grid.fit(X, y)
+    with stage("grid_search", model="LogisticRegression", rows=len(X)):
+        grid.fit(X, y)
     
     print(f"\n✅ Best Parameters: {grid.best_params_}")
     print(f"🏆 Best CV ROC-AUC: {grid.best_score_:.4f}")
@@ -140,9 +146,10 @@ def tune_logistic_regression(base_pipeline, X, y):
     return grid.best_estimator_
 
 
-def retrain_model():
+def retrain_model(output_path=MODEL_PATH):
     """
     Retrain model using data from SQL deployment view.
+    Saves to output_path (the live model by default, or a challenger path).
     """
     print("\n" + "="*60)
     print("RETRAINING DEPLOYMENT MODEL (7 FEATURES)")
@@ -180,7 +187,8 @@ def retrain_model():
     print(f"\n📊 Train set: {X_train.shape[0]} samples")
     print(f"📊 Test set: {X_test.shape[0]} samples")
     
-    best_model.fit(X_train, y_train)
+    with stage("fit", model="LogisticRegression", rows=len(X_train)):
+        best_model.fit(X_train, y_train)
     
     # Quick evaluation on test set
     y_pred_prob = best_model.predict_proba(X_test)[:, 1]
@@ -201,12 +209,13 @@ def retrain_model():
         "data_source": "vw_churn_deployment_features"
     }
     
-    joblib.dump(artifact, MODEL_PATH)
+    with stage("save_model", path=output_path):
+        joblib.dump(artifact, output_path)
     
     print("\n" + "="*60)
     print("✅ RETRAINED MODEL SAVED SUCCESSFULLY")
     print("="*60)
-    print(f"   Location: {MODEL_PATH}")
+    print(f"   Location: {output_path}")
     print(f"   Features: {len(selected_features)}")
     print(f"   Threshold: 0.42")
     print(f"   CV ROC-AUC: {cv_score:.4f}")
@@ -231,4 +240,11 @@ def load_retrained_model():
     return artifact
 
 if __name__ == "__main__":
-    retrain_model()
\ No newline at end of file
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Retrain the deployment model")
+    parser.add_argument("--challenger", action="store_true",
+                        help=f"Save to {CHALLENGER_PATH} for shadow scoring instead of replacing the live model")
+    args = parser.parse_args()
+
+    retrain_model(CHALLENGER_PATH if args.challenger else MODEL_PATH)
\ No newline at end of file
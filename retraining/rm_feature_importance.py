@@ -47,30 +47,17 @@ def get_feature_importance():
         print(f"   The 7 original features have been expanded to {len(coefficients)} encoded features.")
         print(f"   Showing coefficients for encoded features:\n")
         
-        # Create feature names for encoded features
-        # Based on your 7 features, the encoding likely expands contract_type and payment_method
+        # Read encoded feature names from the fitted preprocessor so the
+        # category labels and their order always match the coefficients
         encoded_feature_names = []
-        
-        # Numerical features (keep original names)
-        numerical_features = [
-            "tenure_months",
-            "monthly_charges", 
-            "support_ticket_count",
-            "avg_call_minutes",
-            "avg_data_usage_gb"
-        ]
-        encoded_feature_names.extend(numerical_features)
-        
-        # Categorical features (one-hot encoded)
-        # contract_type: 3 categories → 3 encoded features
-        contract_categories = ["month-to-month", "one year", "two year"]
-        for cat in contract_categories:
-            encoded_feature_names.append(f"contract_type_{cat}")
-        
-        # payment_method: 4 categories → 4 encoded features
-        payment_categories = ["electronic check", "credit card", "bank transfer", "mailed check"]
-        for cat in payment_categories:
-            encoded_feature_names.append(f"payment_method_{cat}")
+        if hasattr(model, 'named_steps'):
+            preprocessor = model.named_steps['preprocessing']
+            numerical_features = list(preprocessor.transformers_[0][2])
+            cat_encoder = preprocessor.transformers_[1][1]
+            categorical_features = preprocessor.transformers_[1][2]
+
+            encoded_feature_names.extend(numerical_features)
+            encoded_feature_names.extend(cat_encoder.get_feature_names_out(categorical_features))
         
         # Verify length matches
         if len(encoded_feature_names) == len(coefficients):
@@ -0,0 +1,294 @@
+import pandas as pd
+import pyarrow.dataset as ds
+import pyarrow.parquet as pq
+import joblib
+import json
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from datetime import datetime
+
+from src.data_ingestion import build_query, borrow_connection, fetch_frame, iter_churn_data
+from src.data_cleaning import clean_data
+from src.feature_engineering import engineer_features
+from src.create_dashboard_dataset import score_dashboard_frame, MODEL_PATH
+from src.dashboard_builder import estimate_cap_bounds, load_build_state
+
+OUTPUT_DIR = "artifacts/batch_scores"
+MANIFEST_NAME = "manifest.json"
+SHARD_SIZE = 250_000
+
+VIEW_NAME = "vw_churn_training_features"
+
+# Worker-side state, filled once per process by _init_worker
+_worker_state = {}
+
+
+# ============================================================================
+# SHARDING
+# ============================================================================
+def plan_sql_shards(shard_size):
+    """
+    Split the customer base into customer_id ranges of ~shard_size rows.
+    Boundaries come from the customers primary key, so each shard query is a
+    cheap range predicate instead of an OFFSET scan over the view.
+    """
+    query = (
+        "SELECT customer_id FROM ("
+        " SELECT customer_id, ROW_NUMBER() OVER (ORDER BY customer_id) AS rn FROM customers"
+        ") numbered WHERE (rn - 1) % ? = 0 ORDER BY customer_id"
+    )
+    with borrow_connection() as conn:
+        cursor = conn.cursor()
+        cursor.execute(query, (shard_size,))
+        boundaries = [row[0] for row in cursor.fetchall()]
+
+    return [
+        {"kind": "sql", "lower": lower, "upper": upper}
+        for lower, upper in zip(boundaries, boundaries[1:] + [None])
+    ]
+
+
+def plan_parquet_shards(path, shard_size):
+    """Group consecutive Parquet row groups of a snapshot into ~shard_size-row shards."""
+    shards = []
+    current = None
+
+    for fragment in ds.dataset(path, format="parquet").get_fragments():
+        metadata = pq.ParquetFile(fragment.path).metadata
+        for row_group in range(metadata.num_row_groups):
+            n_rows = metadata.row_group(row_group).num_rows
+            if current is None or current["path"] != fragment.path or current["rows"] >= shard_size:
+                current = {"kind": "parquet", "path": fragment.path, "row_groups": [], "rows": 0}
+                shards.append(current)
+            current["row_groups"].append(row_group)
+            current["rows"] += n_rows
+
+    return shards
+
+
+def read_shard(spec):
+    """Load one shard's rows as a view-shaped DataFrame."""
+    if spec["kind"] == "parquet":
+        return pq.ParquetFile(spec["path"]).read_row_groups(spec["row_groups"]).to_pandas()
+
+    filters = [("customer_id", ">=", spec["lower"])]
+    if spec["upper"] is not None:
+        filters.append(("customer_id", "<", spec["upper"]))
+    query, params = build_query(VIEW_NAME, filters=filters)
+
+    return fetch_frame(query, params)
+
+
+def iter_source_chunks(source, chunksize=100_000):
+    """Stream the whole source (for capping-bound estimation)."""
+    if source == "sql":
+        yield from iter_churn_data(chunksize=chunksize)
+    else:
+        for batch in ds.dataset(source, format="parquet").to_batches(batch_size=chunksize):
+            yield batch.to_pandas()
+
+
+def resolve_cap_bounds(source):
+    """
+    Reuse the dashboard builder's frozen capping bounds when available so batch
+    scores match the dashboard; otherwise estimate them from the source.
+    """
+    state, _ = load_build_state()
+    if "cap_bounds" in state:
+        print("📏 Using capping bounds from the dashboard build state")
+        return state["cap_bounds"]
+
+    print("📏 Estimating capping bounds from the source...")
+    return estimate_cap_bounds(chunks=iter_source_chunks(source))
+
+
+# ============================================================================
+# MANIFEST
+# ============================================================================
+def write_manifest(manifest, output_dir):
+    """Atomically rewrite the checkpoint manifest."""
+    path = os.path.join(output_dir, MANIFEST_NAME)
+    tmp_path = path + ".tmp"
+    with open(tmp_path, "w") as f:
+        json.dump(manifest, f, indent=2, default=str)
+    os.replace(tmp_path, path)
+
+
+def load_or_create_manifest(source, model_path, shard_size, output_dir, restart=False, cap_bounds=None):
+    """
+    Resume from an existing manifest for the same run configuration, or plan
+    a new run. Shards whose output file is missing are re-queued on resume.
+    """
+    path = os.path.join(output_dir, MANIFEST_NAME)
+    run_config = {"source": source, "model_path": model_path, "shard_size": shard_size}
+
+    if not restart and os.path.exists(path):
+        with open(path) as f:
+            manifest = json.load(f)
+        if manifest["config"] == run_config:
+            for shard in manifest["shards"]:
+                output = os.path.join(output_dir, shard["output"])
+                if shard["status"] == "done" and not os.path.exists(output):
+                    shard["status"] = "pending"
+            done = sum(s["status"] == "done" for s in manifest["shards"])
+            print(f"\n♻️  Resuming run: {done}/{len(manifest['shards'])} shards already done")
+            return manifest
+        print("\n⚠️  Existing manifest is for a different run configuration - starting over")
+
+    print("\n🧩 Planning shards...")
+    if source == "sql":
+        specs = plan_sql_shards(shard_size)
+    else:
+        specs = plan_parquet_shards(source, shard_size)
+
+    manifest = {
+        "config": run_config,
+        "created_at": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+        "cap_bounds": cap_bounds or resolve_cap_bounds(source),
+        "shards": [
+            {"id": i, "spec": spec, "status": "pending", "output": f"shard-{i:05d}.parquet"}
+            for i, spec in enumerate(specs)
+        ]
+    }
+    os.makedirs(output_dir, exist_ok=True)
+    write_manifest(manifest, output_dir)
+    return manifest
+
+
+# ============================================================================
+# WORKERS
+# ============================================================================
+def _init_worker(model_path, cap_bounds):
+    """Load the model once per worker process."""
+    _worker_state["model"] = joblib.load(model_path)["model"]
+    _worker_state["cap_bounds"] = {col: tuple(b) for col, b in cap_bounds.items()}
+
+
+def score_shard(shard, output_dir):
+    """Score one shard and write its output atomically. Returns timing stats."""
+    start_time = time.time()
+    df = read_shard(shard["spec"])
+
+    scored = score_dashboard_frame(
+        engineer_features(clean_data(df, cap_bounds=_worker_state["cap_bounds"])),
+        _worker_state["model"]
+    ).copy()
+    scored["risk_segment"] = scored["risk_segment"].astype(str)
+
+    path = os.path.join(output_dir, shard["output"])
+    tmp_path = path + ".tmp"
+    scored.to_parquet(tmp_path, index=False)
+    os.replace(tmp_path, path)
+
+    return {
+        "id": shard["id"],
+        "rows": int(len(scored)),
+        "seconds": round(time.time() - start_time, 3),
+        "worker": os.getpid()
+    }
+
+
+# ============================================================================
+# DRIVER
+# ============================================================================
+def run_batch_scoring(source="sql", model_path=MODEL_PATH, output_dir=OUTPUT_DIR,
+                      shard_size=SHARD_SIZE, workers=None, restart=False, cap_bounds=None):
+    """
+    Score the full customer base shard by shard in a process pool.
+    Progress is checkpointed after every shard, so a crashed run resumes
+    with only the unfinished shards. `cap_bounds` overrides the capping bounds
+    of a new run (by default taken from the dashboard build state).
+    """
+    print("\n" + "="*60)
+    print("BATCH SCORING - FULL CUSTOMER BASE")
+    print("="*60)
+
+    workers = workers or os.cpu_count()
+    manifest = load_or_create_manifest(source, model_path, shard_size, output_dir, restart, cap_bounds)
+    pending = [s for s in manifest["shards"] if s["status"] != "done"]
+
+    print(f"\n📊 Source: {source}")
+    print(f"🧩 Shards: {len(manifest['shards'])} ({len(pending)} to score)")
+    print(f"⚙️  Workers: {workers}")
+
+    start_time = time.time()
+    shards_by_id = {s["id"]: s for s in manifest["shards"]}
+
+    with ProcessPoolExecutor(
+        max_workers=workers,
+        initializer=_init_worker,
+        initargs=(model_path, manifest["cap_bounds"])
+    ) as executor:
+        futures = {executor.submit(score_shard, shard, output_dir): shard["id"] for shard in pending}
+        failed = []
+        for future in as_completed(futures):
+            try:
+                stats = future.result()
+            except Exception as e:
+                # Keep checkpointing the shards that do finish, re-raise after the loop
+                shard = shards_by_id[futures[future]]
+                shard.update(status="failed", error=f"{type(e).__name__}: {e}")
+                write_manifest(manifest, output_dir)
+                failed.append((shard["id"], e))
+                print(f"   ❌ Shard {shard['id']} failed: {shard['error']}")
+                continue
+            shard = shards_by_id[stats["id"]]
+            shard.pop("error", None)
+            shard.update(status="done", rows=stats["rows"], seconds=stats["seconds"],
+                         worker=stats["worker"],
+                         finished_at=datetime.now().strftime("%Y-%m-%d %H:%M:%S"))
+            write_manifest(manifest, output_dir)
+            print(f"   ✅ Shard {stats['id']}: {stats['rows']} rows in {stats['seconds']:.2f}s "
+                  f"(worker {stats['worker']})")
+
+    if failed:
+        print(f"\n❌ {len(failed)} shard(s) failed; rerun to resume them: {[shard_id for shard_id, _ in failed]}")
+        raise failed[0][1]
+
+    elapsed = time.time() - start_time
+
+    # Throughput per worker for the shards scored in this run
+    scored_now = [shards_by_id[s["id"]] for s in pending]
+    report = pd.DataFrame([
+        {"worker": s["worker"], "rows": s["rows"], "seconds": s["seconds"]} for s in scored_now
+    ])
+    if not report.empty:
+        report = report.groupby("worker").agg(shards=("rows", "size"), rows=("rows", "sum"),
+                                              busy_seconds=("seconds", "sum")).reset_index()
+        report["rows_per_second"] = (report["rows"] / report["busy_seconds"]).round(1)
+        print("\n📈 Throughput per worker:")
+        print(report.to_string(index=False))
+
+        total_rows = int(report["rows"].sum())
+        print(f"\n⏱️  Scored {total_rows} rows in {elapsed:.2f}s "
+              f"({total_rows / max(elapsed, 1e-9):.1f} rows/s overall)")
+
+    manifest["completed_at"] = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+    write_manifest(manifest, output_dir)
+    print(f"\n✅ Outputs and manifest in: {output_dir}")
+
+    return report
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Resumable multiprocess batch scoring")
+    parser.add_argument("--source", default="sql",
+                        help="'sql' for the training view, or a Parquet snapshot file/directory")
+    parser.add_argument("--model", default=MODEL_PATH)
+    parser.add_argument("--output-dir", default=OUTPUT_DIR)
+    parser.add_argument("--shard-size", type=int, default=SHARD_SIZE)
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--restart", action="store_true", help="Ignore the existing manifest")
+    args = parser.parse_args()
+
+    run_batch_scoring(
+        source=args.source,
+        model_path=args.model,
+        output_dir=args.output_dir,
+        shard_size=args.shard_size,
+        workers=args.workers,
+        restart=args.restart
+    )
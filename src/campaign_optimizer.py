@@ -0,0 +1,187 @@
+import heapq
+import json
+import os
+import time
+
+import numpy as np
+import pandas as pd
+
+from src.risk_query import CHUNK_SIZE, iter_scored_base
+
+OUTPUT_PATH = "dashboard/retention_campaign.csv"
+
+# Campaign economics (overridable per run)
+HORIZON_MONTHS = 12        # revenue window an averted churn protects
+OFFER_UPLIFT = 0.25        # share of would-be churners the offer retains
+OFFER_COST = 20.0          # cost of one offer
+SEGMENT_COLUMN = "risk_segment"
+
+# Scored columns carried into the campaign list
+ROW_COLUMNS = [
+    "customer_id",
+    "churn_probability",
+    "monthly_charges",
+    "risk_segment",
+    "contract_type",
+    "payment_method"
+]
+CAMPAIGN_COLUMNS = ROW_COLUMNS + ["expected_saved_revenue", "offer_cost", "net_value"]
+
+
+def expected_saved_revenue(churn_probability, monthly_charges, horizon_months=HORIZON_MONTHS, uplift=OFFER_UPLIFT):
+    """Expected revenue an offer saves: P(churn) x monthly charges x horizon x uplift."""
+    return churn_probability * monthly_charges * horizon_months * uplift
+
+
+class BoundedHeap:
+    """Min-heap keeping the `capacity` largest (net_value, customer_id, row) items seen so far."""
+
+    def __init__(self, capacity):
+        self.capacity = capacity
+        self.items = []
+
+    def floor(self):
+        """Value a candidate must beat to enter (-inf until the heap is full)."""
+        return self.items[0][0] if len(self.items) >= self.capacity else -np.inf
+
+    def push_many(self, items):
+        for item in items:
+            if len(self.items) < self.capacity:
+                heapq.heappush(self.items, item)
+            elif item > self.items[0]:
+                heapq.heapreplace(self.items, item)
+
+
+def optimize_campaign(chunks, budget, offer_cost=OFFER_COST, horizon_months=HORIZON_MONTHS,
+                      uplift=OFFER_UPLIFT, segment_caps=None, segment_column=SEGMENT_COLUMN):
+    """
+    Choose the offers with the highest expected net value (saved revenue -
+    offer cost) under a total budget and optional per-segment caps
+    ({segment: max offers}), streaming the scored base chunk by chunk.
+
+    Each segment keeps a bounded heap of its best min(cap, budget / offer_cost)
+    profitable customers, and each chunk only pushes rows that beat the heap
+    floor, so memory is bounded by the campaign size rather than the base and
+    nothing is sorted in full. With one offer cost for everyone, the top
+    budget / offer_cost of the per-segment survivors is the optimal set.
+    Returns (campaign DataFrame, totals dict).
+    """
+    if offer_cost <= 0:
+        raise ValueError("offer_cost must be positive")
+    max_offers = int(budget // offer_cost)
+    segment_caps = segment_caps or {}
+    columns = ROW_COLUMNS + ([segment_column] if segment_column not in ROW_COLUMNS else [])
+
+    heaps = {}
+    scanned = 0
+    for chunk in chunks:
+        scanned += len(chunk)
+        net = expected_saved_revenue(
+            chunk["churn_probability"].to_numpy(dtype=np.float64),
+            chunk["monthly_charges"].to_numpy(dtype=np.float64),
+            horizon_months, uplift
+        ) - offer_cost
+        codes, segments = pd.factorize(chunk[segment_column].astype(str))
+        customer_ids = chunk["customer_id"].astype(str).to_numpy()
+
+        for code, segment in enumerate(segments):
+            if segment not in heaps:
+                heaps[segment] = BoundedHeap(min(segment_caps.get(segment, max_offers), max_offers))
+            heap = heaps[segment]
+            if heap.capacity <= 0:
+                continue
+
+            candidates = np.flatnonzero((codes == code) & (net > 0) & (net > heap.floor()))
+            if len(candidates) > heap.capacity:
+                candidates = candidates[np.argpartition(-net[candidates], heap.capacity - 1)[:heap.capacity]]
+            rows = chunk.iloc[candidates][columns].itertuples(index=False, name=None)
+            heap.push_many(zip(net[candidates].tolist(), customer_ids[candidates].tolist(), rows))
+
+    selected = heapq.nlargest(max_offers, (item for heap in heaps.values() for item in heap.items))
+
+    campaign = pd.DataFrame([row for _, _, row in selected], columns=columns)
+    campaign["expected_saved_revenue"] = expected_saved_revenue(
+        campaign["churn_probability"].astype(np.float64), campaign["monthly_charges"].astype(np.float64),
+        horizon_months, uplift
+    )
+    campaign["offer_cost"] = float(offer_cost)
+    campaign["net_value"] = campaign["expected_saved_revenue"] - campaign["offer_cost"]
+    campaign = campaign[CAMPAIGN_COLUMNS + [c for c in columns if c not in CAMPAIGN_COLUMNS]]
+
+    total_cost = float(campaign["offer_cost"].sum())
+    net_value = float(campaign["net_value"].sum())
+    totals = {
+        "customers_scanned": int(scanned),
+        "offers": int(len(campaign)),
+        "budget": float(budget),
+        "total_cost": round(total_cost, 2),
+        "expected_saved_revenue": round(float(campaign["expected_saved_revenue"].sum()), 2),
+        "expected_net_value": round(net_value, 2),
+        "roi": round(net_value / total_cost, 3) if total_cost else 0.0,
+        "offers_by_segment": {str(k): int(v) for k, v in campaign[segment_column].value_counts().items()},
+        "assumptions": {
+            "offer_cost": offer_cost,
+            "horizon_months": horizon_months,
+            "uplift": uplift,
+            "segment_column": segment_column,
+            "segment_caps": segment_caps
+        }
+    }
+    return campaign, totals
+
+
+def run_campaign(source=None, budget=100_000.0, output_path=OUTPUT_PATH, chunksize=CHUNK_SIZE, **kwargs):
+    """Optimize over the scored base and write the campaign list plus a totals JSON next to it."""
+    print("\n" + "="*60)
+    print("RETENTION CAMPAIGN OPTIMIZER")
+    print("="*60)
+    start_time = time.time()
+
+    campaign, totals = optimize_campaign(iter_scored_base(source, chunksize), budget, **kwargs)
+
+    os.makedirs(os.path.dirname(output_path) or ".", exist_ok=True)
+    campaign.to_csv(output_path, index=False)
+    totals_path = os.path.splitext(output_path)[0] + "_totals.json"
+    with open(totals_path, "w") as f:
+        json.dump(totals, f, indent=2)
+
+    print(f"\n📊 Customers scanned: {totals['customers_scanned']:,}")
+    print(f"🎯 Offers: {totals['offers']:,} | cost ${totals['total_cost']:,.2f} of ${totals['budget']:,.2f}")
+    print(f"💰 Expected saved revenue: ${totals['expected_saved_revenue']:,.2f} "
+          f"| net ${totals['expected_net_value']:,.2f} | ROI {totals['roi']:.2f}")
+    print(f"🧩 Offers by segment: {totals['offers_by_segment']}")
+    print(f"⏱️  Time: {time.time() - start_time:.2f}s")
+    print(f"\n✅ Campaign list saved to: {output_path}")
+    return campaign, totals
+
+
+def parse_caps(values):
+    """["High=5000", "Low=0"] -> {"High": 5000, "Low": 0}."""
+    caps = {}
+    for value in values or []:
+        segment, _, cap = value.partition("=")
+        if not cap:
+            raise ValueError(f"Segment cap must look like SEGMENT=N, got {value!r}")
+        caps[segment] = int(cap)
+    return caps
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Budget-constrained retention campaign selection")
+    parser.add_argument("--source", default=None, help="Scored base (default: dashboard dataset)")
+    parser.add_argument("--budget", type=float, required=True)
+    parser.add_argument("--offer-cost", type=float, default=OFFER_COST)
+    parser.add_argument("--horizon", type=int, default=HORIZON_MONTHS, help="Months of revenue an offer protects")
+    parser.add_argument("--uplift", type=float, default=OFFER_UPLIFT)
+    parser.add_argument("--segment-column", default=SEGMENT_COLUMN)
+    parser.add_argument("--cap", nargs="*", default=None, help="Per-segment offer caps, e.g. High=5000 Low=0")
+    parser.add_argument("--output", default=OUTPUT_PATH)
+    args = parser.parse_args()
+
+    run_campaign(
+        args.source, args.budget, args.output,
+        offer_cost=args.offer_cost, horizon_months=args.horizon, uplift=args.uplift,
+        segment_caps=parse_caps(args.cap), segment_column=args.segment_column
+    )
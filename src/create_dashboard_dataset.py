@@ -9,44 +9,58 @@ from src.feature_engineering import engineer_features
 MODEL_PATH = "artifacts/churn_model_v1.joblib"
 THRESHOLD = 0.40
 
+# Risk segments: pd.cut bins (right-inclusive) and the action per segment
+RISK_BINS = [0, 0.25, 0.40, 1.0]
+RISK_LABELS = ["Low", "Medium", "High"]
+ACTION_CATEGORIES = {
+    "High": "Apply retention strategy",
+    "Medium": "Monitor customer",
+    "Low": "No action required"
+}
 
-def create_dashboard_dataset():
-    df = engineer_features(clean_data(load_churn_data()))
 
-    artifact = joblib.load(MODEL_PATH)
-    model = artifact["model"]
+DASHBOARD_COLUMNS = [
+    "customer_id",
+    "churn_probability",
+    "churn_flag",
+    "risk_segment",
+    "monthly_charges",
+    "tenure_months",
+    "contract_type",
+    "cx_risk_score",
+    "payment_method",
+    "stickiness_score",
+    "action_category"
+]
 
+
+def score_dashboard_frame(df, model):
+    """
+    Score an engineered frame and add churn_flag, risk_segment and action_category.
+    Returns only the dashboard columns.
+    """
     df["churn_probability"] = model.predict_proba(df)[:, 1]
     df["churn_flag"] = (df["churn_probability"] >= THRESHOLD).astype(int)
 
     df["risk_segment"] = pd.cut(
         df["churn_probability"],
-        bins=[0, 0.25, 0.40, 1.0],
-        labels=["Low", "Medium", "High"]
+        bins=RISK_BINS,
+        labels=RISK_LABELS
     )
 
     # Action category (high-level)
-    df["action_category"] = df["risk_segment"].map({
-        "High": "Apply retention strategy",
-        "Medium": "Monitor customer",
-        "Low": "No action required"
-    })
-
-    dashboard_df = df[
-        [
-            "customer_id",
-            "churn_probability",
-            "churn_flag",
-            "risk_segment",
-            "monthly_charges",
-            "tenure_months",
-            "contract_type",
-            "cx_risk_score",
-            "payment_method",
-            "stickiness_score",
-            "action_category"
-        ]
-    ]
+    df["action_category"] = df["risk_segment"].map(ACTION_CATEGORIES)
+
+    return df[DASHBOARD_COLUMNS]
+
+
+def create_dashboard_dataset():
+    df = engineer_features(clean_data(load_churn_data()))
+
+    artifact = joblib.load(MODEL_PATH)
+    model = artifact["model"]
+
+    dashboard_df = score_dashboard_frame(df, model)
 
     dashboard_df.to_csv(
         "dashboard/churn_dashboard_dataset.csv",
@@ -0,0 +1,310 @@
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+import joblib
+import json
+import os
+import shutil
+import time
+from datetime import datetime
+
+from src.data_ingestion import iter_churn_data
+from src.data_cleaning import clean_data, compute_cap_bounds, CAP_COLUMNS
+from src.feature_engineering import engineer_features
+from src.create_dashboard_dataset import score_dashboard_frame, MODEL_PATH
+
+# Partitioned Parquet output read by Power BI (one file per partition)
+OUTPUT_DIR = "dashboard/churn_dashboard_dataset"
+PARTITION_COLUMNS = ["contract_type", "risk_segment"]
+
+# Builder state: per-customer feature hashes and the frozen capping bounds
+HASHES_PATH = "dashboard/dashboard_feature_hashes.parquet"
+STATE_PATH = "dashboard/dashboard_build_state.json"
+
+CHUNK_SIZE = 100_000
+BOUNDS_SAMPLE_SIZE = 200_000
+RANDOM_STATE = 42
+
+# Columns that are not model inputs and must not trigger re-scoring
+UNHASHED_COLUMNS = ["customer_id", "churn"]
+
+
+# ============================================================================
+# STATE
+# ============================================================================
+def load_build_state():
+    """Return (state dict, previous hashes Series indexed by customer_id)."""
+    state = {}
+    if os.path.exists(STATE_PATH):
+        with open(STATE_PATH) as f:
+            state = json.load(f)
+
+    hashes = pd.Series(dtype="uint64")
+    if os.path.exists(HASHES_PATH):
+        table = pd.read_parquet(HASHES_PATH)
+        hashes = pd.Series(table["feature_hash"].to_numpy(), index=table["customer_id"])
+
+    return state, hashes
+
+
+def save_build_state(state, hashes):
+    """Persist the state file and the feature-hash table."""
+    os.makedirs(os.path.dirname(HASHES_PATH), exist_ok=True)
+    pd.DataFrame({
+        "customer_id": hashes.index.to_numpy(),
+        "feature_hash": hashes.to_numpy()
+    }).to_parquet(HASHES_PATH, index=False)
+
+    with open(STATE_PATH, "w") as f:
+        json.dump(state, f, indent=2)
+
+
+def feature_hashes(chunk):
+    """64-bit hash of every model input column, one per row."""
+    cols = sorted(c for c in chunk.columns if c not in UNHASHED_COLUMNS)
+    return pd.util.hash_pandas_object(chunk[cols], index=False).to_numpy()
+
+
+# ============================================================================
+# CAPPING BOUNDS
+# ============================================================================
+def estimate_cap_bounds(chunks=None, chunksize=CHUNK_SIZE, sample_size=BOUNDS_SAMPLE_SIZE):
+    """
+    Estimate global capping bounds from a uniform bottom-k sample of the base.
+    Memory stays bounded by sample_size rows of the capped columns.
+    `chunks` is any iterable of view-shaped frames (defaults to the SQL view).
+    """
+    rng = np.random.default_rng(RANDOM_STATE)
+    sample = None
+
+    if chunks is None:
+        chunks = iter_churn_data(chunksize=chunksize)
+
+    for chunk in chunks:
+        part = chunk[CAP_COLUMNS + ["tenure_months"]].copy()
+        part["_key"] = rng.random(len(part))
+        sample = part if sample is None else pd.concat([sample, part], ignore_index=True)
+        if len(sample) > sample_size:
+            sample = sample.nsmallest(sample_size, "_key")
+
+    # Apply the same missing-value rules clean_data uses before capping
+    sample = sample.fillna({col: 0 for col in CAP_COLUMNS if col != "total_charges"})
+    sample["total_charges"] = sample["total_charges"].fillna(
+        sample["monthly_charges"] * sample["tenure_months"]
+    )
+    return compute_cap_bounds(sample)
+
+
+# ============================================================================
+# PARTITIONED OUTPUT
+# ============================================================================
+def partition_path(root, key):
+    """Hive-style directory for a (contract_type, risk_segment) key."""
+    parts = [f"{col}={value}" for col, value in zip(PARTITION_COLUMNS, key)]
+    return os.path.join(root, *parts)
+
+
+def list_partitions(root):
+    """All existing partition keys under root."""
+    keys = []
+    if not os.path.isdir(root):
+        return keys
+    for contract_dir in sorted(os.listdir(root)):
+        contract_path = os.path.join(root, contract_dir)
+        if not os.path.isdir(contract_path) or "=" not in contract_dir:
+            continue
+        for segment_dir in sorted(os.listdir(contract_path)):
+            if "=" in segment_dir:
+                keys.append((contract_dir.split("=", 1)[1], segment_dir.split("=", 1)[1]))
+    return keys
+
+
+def write_partition(root, key, df):
+    """Atomically replace one partition file (or remove it when df is empty)."""
+    directory = partition_path(root, key)
+    path = os.path.join(directory, "data.parquet")
+
+    if df.empty:
+        if os.path.exists(path):
+            os.remove(path)
+        return
+
+    os.makedirs(directory, exist_ok=True)
+    tmp_path = path + ".tmp"
+    table = pa.Table.from_pandas(df.drop(columns=PARTITION_COLUMNS), preserve_index=False)
+    pq.write_table(table, tmp_path, compression="zstd")
+    os.replace(tmp_path, path)
+
+
+def read_partition(root, key):
+    """Read one partition back with its partition columns restored."""
+    path = os.path.join(partition_path(root, key), "data.parquet")
+    if not os.path.exists(path):
+        return None
+    df = pd.read_parquet(path)
+    for col, value in zip(PARTITION_COLUMNS, key):
+        df[col] = value
+    return df
+
+
+def merge_into_output(staging_dir, replaced_ids, output_dir=OUTPUT_DIR):
+    """
+    Merge staged rows into the partitioned output. Only partitions that lose a
+    replaced/removed customer or receive staged rows are rewritten.
+    """
+    touched = 0
+    staged_keys = set(list_partitions(staging_dir))
+
+    for key in sorted(set(list_partitions(output_dir)) | staged_keys):
+        existing_path = os.path.join(partition_path(output_dir, key), "data.parquet")
+        has_stale_rows = False
+        if os.path.exists(existing_path):
+            existing_ids = pq.read_table(existing_path, columns=["customer_id"]).column(0).to_pandas()
+            has_stale_rows = existing_ids.isin(replaced_ids).any()
+
+        if not has_stale_rows and key not in staged_keys:
+            continue
+
+        frames = []
+        existing = read_partition(output_dir, key)
+        if existing is not None:
+            frames.append(existing[~existing["customer_id"].isin(replaced_ids)])
+
+        staged_dir = partition_path(staging_dir, key)
+        if key in staged_keys:
+            for name in sorted(os.listdir(staged_dir)):
+                staged = pd.read_parquet(os.path.join(staged_dir, name))
+                for col, value in zip(PARTITION_COLUMNS, key):
+                    staged[col] = value
+                frames.append(staged)
+
+        write_partition(output_dir, key, pd.concat(frames, ignore_index=True))
+        touched += 1
+
+    return touched
+
+
+def swap_output(rebuild_dir):
+    """Replace OUTPUT_DIR with a freshly built dataset directory."""
+    os.makedirs(rebuild_dir, exist_ok=True)
+    old_dir = OUTPUT_DIR + ".old"
+    if os.path.isdir(old_dir):
+        shutil.rmtree(old_dir)
+    if os.path.isdir(OUTPUT_DIR):
+        os.rename(OUTPUT_DIR, old_dir)
+    os.rename(rebuild_dir, OUTPUT_DIR)
+    if os.path.isdir(old_dir):
+        shutil.rmtree(old_dir)
+
+
+# ============================================================================
+# BUILDER
+# ============================================================================
+def build_dashboard_dataset(full_rebuild=False, chunksize=CHUNK_SIZE):
+    """
+    Incrementally (re)build the partitioned Parquet dashboard dataset.
+    Streams the view in chunks, re-scores only customers whose input features
+    changed since the last run, and merges them into the existing partitions.
+    """
+    print("\n" + "="*60)
+    print("INCREMENTAL DASHBOARD DATASET BUILD")
+    print("="*60)
+    start_time = time.time()
+
+    state, previous_hashes = load_build_state()
+    model = joblib.load(MODEL_PATH)["model"]
+    model_hash = joblib.hash(model)
+
+    # A new model changes every score, so it forces a full rebuild
+    full_rebuild = full_rebuild or "cap_bounds" not in state or state.get("model_hash") != model_hash
+    if full_rebuild:
+        print("\n📏 Estimating global capping bounds (full rebuild)...")
+        state["cap_bounds"] = estimate_cap_bounds(chunksize=chunksize)
+        state["model_hash"] = model_hash
+        previous_hashes = pd.Series(dtype="uint64")
+    cap_bounds = {col: tuple(bounds) for col, bounds in state["cap_bounds"].items()}
+
+    # A full rebuild is written to its own directory and swapped in at the end,
+    # so the current dataset stays readable (and intact if the build fails)
+    staging_dir = OUTPUT_DIR + ".staging"
+    target_dir = OUTPUT_DIR + ".rebuild" if full_rebuild else OUTPUT_DIR
+    for directory in {staging_dir, target_dir} - {OUTPUT_DIR}:
+        if os.path.isdir(directory):
+            shutil.rmtree(directory)
+
+    hash_parts = []
+    rescored_ids = []
+    total_rows = 0
+
+    for chunk_index, chunk in enumerate(iter_churn_data(chunksize=chunksize)):
+        total_rows += len(chunk)
+        # Only rows clean_data keeps are hashed: a customer whose label becomes
+        # valid later is then new (scored), one whose label turns invalid is removed
+        chunk = chunk[chunk["churn"].isin([0, 1])]
+        hashes = feature_hashes(chunk)
+        hash_parts.append(pd.Series(hashes, index=chunk["customer_id"].to_numpy()))
+
+        # Positional lookup keeps the hashes uint64 (reindex would upcast to float)
+        position = previous_hashes.index.get_indexer(chunk["customer_id"])
+        previous = previous_hashes.to_numpy()[np.maximum(position, 0)] if len(previous_hashes) else hashes
+        changed = (position == -1) | (previous != hashes)
+        if not changed.any():
+            continue
+
+        changed_chunk = chunk[changed]
+        scored = score_dashboard_frame(
+            engineer_features(clean_data(changed_chunk, cap_bounds=cap_bounds)),
+            model
+        ).copy()
+        scored["risk_segment"] = scored["risk_segment"].astype(str)
+        rescored_ids.append(scored["customer_id"])
+
+        # Stage the re-scored rows; merged per partition after the stream ends
+        for key, part in scored.groupby(PARTITION_COLUMNS, observed=True):
+            directory = partition_path(staging_dir, key)
+            os.makedirs(directory, exist_ok=True)
+            part.drop(columns=PARTITION_COLUMNS).to_parquet(
+                os.path.join(directory, f"part-{chunk_index:05d}.parquet"), index=False
+            )
+
+        print(f"   Chunk {chunk_index}: {len(chunk)} rows, {int(changed.sum())} re-scored")
+
+    current_hashes = pd.concat(hash_parts) if hash_parts else pd.Series(dtype="uint64")
+    rescored = pd.concat(rescored_ids) if rescored_ids else pd.Series(dtype=object)
+    removed = previous_hashes.index.difference(current_hashes.index)
+    replaced_ids = pd.Index(rescored).union(removed)
+
+    touched = merge_into_output(staging_dir, replaced_ids, target_dir)
+    if os.path.isdir(staging_dir):
+        shutil.rmtree(staging_dir)
+    if full_rebuild:
+        swap_output(target_dir)
+
+    state["last_run"] = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+    state["rows"] = int(total_rows)
+    save_build_state(state, current_hashes)
+
+    print(f"\n📊 Customers scanned: {total_rows}")
+    print(f"🔄 Re-scored: {len(rescored)} | Removed: {len(removed)}")
+    print(f"🗂️  Partitions rewritten: {touched}")
+    print(f"⏱️  Build time: {time.time() - start_time:.2f} seconds")
+    print(f"\n✅ Dashboard dataset written to: {OUTPUT_DIR}")
+
+    return {
+        "rows": int(total_rows),
+        "rescored": int(len(rescored)),
+        "removed": int(len(removed)),
+        "partitions_rewritten": touched
+    }
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Incremental Parquet dashboard dataset builder")
+    parser.add_argument("--full", action="store_true", help="Ignore saved state and rebuild everything")
+    parser.add_argument("--chunksize", type=int, default=CHUNK_SIZE)
+    args = parser.parse_args()
+
+    build_dashboard_dataset(full_rebuild=args.full, chunksize=args.chunksize)
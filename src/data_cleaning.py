@@ -1,15 +1,76 @@
 import pandas as pd
 import numpy as np
 from src.data_ingestion import load_churn_data
+from src.instrumentation import instrumented
+
+# Numeric columns capped at the 1st/99th percentile
+CAP_COLUMNS = [
+    "monthly_charges",
+    "total_charges",
+    "avg_call_minutes",
+    "avg_data_usage_gb",
+    "support_ticket_count",
+    "late_payments"
+]
+
+
+def compute_cap_bounds(df: pd.DataFrame, lower_q=0.01, upper_q=0.99) -> dict:
+    """
+    Outlier-capping bounds per column, as {column: (lower, upper)}.
+    Passing these to clean_data lets chunked or incremental runs cap every
+    chunk with the same global bounds instead of per-chunk quantiles.
+    """
+    return {
+        col: (float(df[col].quantile(lower_q)), float(df[col].quantile(upper_q)))
+        for col in CAP_COLUMNS
+        if col in df.columns
+    }
+
+
+def normalize_categories(series: pd.Series) -> pd.Series:
+    """
+    strip().lower() applied once per distinct value instead of once per row.
+    Categorical input stays categorical (categories that collide after
+    normalization are merged); other input gives the same values as the
+    per-row string chain.
+    """
+    if isinstance(series.dtype, pd.CategoricalDtype):
+        normalized = pd.Index(series.cat.categories.astype(str).str.strip().str.lower())
+        if normalized.is_unique:
+            return series.cat.rename_categories(normalized)
+
+        merged = normalized.unique()
+        mapping = merged.get_indexer(normalized)
+        codes = series.cat.codes.to_numpy()
+        new_codes = np.where(codes >= 0, mapping[codes], -1)
+        return pd.Series(
+            pd.Categorical.from_codes(new_codes, categories=merged),
+            index=series.index,
+            name=series.name
+        )
+
+    codes, uniques = pd.factorize(series, use_na_sentinel=False)
+    normalized = pd.Series(uniques).astype(str).str.strip().str.lower()
+    return pd.Series(normalized.to_numpy()[codes], index=series.index, name=series.name,
+                     dtype=normalized.dtype)
 
 
-def clean_data(df: pd.DataFrame) -> pd.DataFrame:
-    df = df.copy()
+@instrumented("cleaning")
+def clean_data(df: pd.DataFrame, cap_bounds: dict = None, inplace: bool = False) -> pd.DataFrame:
+    """
+    Clean the training view. With inplace=True the input frame is modified
+    instead of copied (always use the returned frame); rows are only copied
+    when some have an invalid target.
+    """
+    if not inplace:
+        df = df.copy()
 
     # -----------------------------
     # 1. TARGET CHECK
     # -----------------------------
-    df = df[df["churn"].isin([0, 1])]
+    valid_target = df["churn"].isin([0, 1])
+    if not inplace or not valid_target.all():
+        df = df[valid_target]
 
     # -----------------------------
     # 2. HANDLE MISSING VALUES
@@ -44,32 +105,23 @@ def clean_data(df: pd.DataFrame) -> pd.DataFrame:
     ]
 
     for col in cat_cols:
-        df[col] = (
-            df[col]
-            .astype(str)
-            .str.strip()
-            .str.lower()
-        )
+        df[col] = normalize_categories(df[col])
 
     # -----------------------------
     # 4. OUTLIER CAPPING (SAFE)
     # -----------------------------
-    def cap_outliers(series, lower_q=0.01, upper_q=0.99):
-        lower = series.quantile(lower_q)
-        upper = series.quantile(upper_q)
-        return series.clip(lower, upper)
-
-    num_cols = [
-        "monthly_charges",
-        "total_charges",
-        "avg_call_minutes",
-        "avg_data_usage_gb",
-        "support_ticket_count",
-        "late_payments"
-    ]
-
-    for col in num_cols:
-        df[col] = cap_outliers(df[col])
+    # Computed after filling missing values, so the quantiles match the filled data
+    if cap_bounds is None:
+        cap_bounds = compute_cap_bounds(df)
+
+    for col in CAP_COLUMNS:
+        lower, upper = cap_bounds[col]
+        capped = df[col].clip(lower, upper)
+
+        # Keep dtype-plan columns (int8/int16/float32) at 32 bits after float bounds
+        if df[col].dtype.itemsize < 8 and capped.dtype == np.float64:
+            capped = capped.astype(np.float32)
+        df[col] = capped
 
     return df
 
@@ -1,28 +1,739 @@
-import pyodbc
+import json
+import os
+import sqlite3
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from datetime import datetime
+
 import pandas as pd
 from config.db_config import DB_CONFIG
+from src.instrumentation import instrumented, stage
+
+# Declared dtypes for vw_churn_training_features (opt-in via optimize_dtypes=True).
+# Integer columns that arrive with NULLs fall back to float32 to keep NaN.
+CHURN_SCHEMA = {
+    "tenure_months": "int16",
+    "contract_type": "category",
+    "monthly_charges": "float32",
+    "total_charges": "float32",
+    "late_payments": "int8",
+    "payment_method": "category",
+    "avg_call_minutes": "float32",
+    "avg_data_usage_gb": "float32",
+    "support_ticket_count": "int16",
+    "avg_resolution_time": "float32",
+    "avg_satisfaction_score": "int8",
+    "has_online_security": "int8",
+    "has_tech_support": "int8",
+    "streaming_services_count": "int8",
+    "churn": "int8"
+}
+
+LOAD_CHUNK_SIZE = 100_000
+
+# Incremental ingestion: local snapshot of the training view keyed by customer_id
+SNAPSHOT_DIR = "data/snapshot"
+SNAPSHOT_PATH = os.path.join(SNAPSHOT_DIR, "churn_training_features.parquet")
+CHANGED_IDS_PATH = os.path.join(SNAPSHOT_DIR, "changed_customer_ids.parquet")
+INGESTION_STATE_PATH = os.path.join(SNAPSHOT_DIR, "ingestion_state.json")
+
+# Source table -> timestamp column that moves when the table gains or changes rows
+WATERMARK_SOURCES = {
+    "customers": "signup_date",
+    "billing": "billing_date",
+    "usage_data": "usage_month",
+    "support_tickets": "ticket_date",
+    "churn_labels": "churn_date"
+}
+# Loaded as one batch per billing period, all rows dated to the period: a new
+# batch always has a new date, and re-reading the current one would rescan
+# every customer, so these compare strictly past the watermark
+PERIOD_SOURCES = {"billing", "usage_data"}
+
+# customer_id IN (...) lists are split to stay under SQL Server's 2100-parameter limit
+ID_BATCH_SIZE = 1000
+
+TRAINING_VIEW = "vw_churn_training_features"
+DEPLOYMENT_VIEW = "vw_churn_deployment_features"
+
+# Column whitelist per view (TCCP.sql). Only these names are ever placed in SQL text;
+# filter values always travel as query parameters.
+VIEW_COLUMNS = {
+    TRAINING_VIEW: ["customer_id"] + list(CHURN_SCHEMA),
+    DEPLOYMENT_VIEW: [
+        "customer_id",
+        "tenure_months",
+        "contract_type",
+        "monthly_charges",
+        "payment_method",
+        "support_ticket_count",
+        "avg_call_minutes",
+        "avg_data_usage_gb",
+        "churn"
+    ]
+}
+
+# Filter operators accepted in (column, op, value) tuples -> SQL operator
+FILTER_OPERATORS = {
+    "==": "=",
+    "!=": "<>",
+    "<": "<",
+    "<=": "<=",
+    ">": ">",
+    ">=": ">=",
+    "in": "IN",
+    "not in": "NOT IN",
+    "between": "BETWEEN"
+}
+
 
 def get_connection():
-    """Create database connection using Windows authentication"""
-    conn_str = (
+    """
+    Create a new database connection. DB_CONFIG["backend"] selects SQL Server
+    (Windows authentication, default) or the SQLite stand-in built by
+    src/sqlite_standin.py. Readers should use borrow_connection() instead.
+    """
+    if DB_CONFIG.get("backend", "sqlserver") == "sqlite":
+        # Pooled connections may be handed to a different thread than the one that opened them
+        return sqlite3.connect(DB_CONFIG["sqlite_path"], check_same_thread=False)
+
+    import pyodbc
+    return pyodbc.connect(odbc_connection_string())
+
+
+def odbc_connection_string():
+    """ODBC connection string for SQL Server (Windows authentication)."""
+    return (
         f"DRIVER={DB_CONFIG['driver']};"
         f"SERVER={DB_CONFIG['server']};"
         f"DATABASE={DB_CONFIG['database']};"
         f"Trusted_Connection={DB_CONFIG['trusted_connection']};"
     )
-    return pyodbc.connect(conn_str)
 
-def load_churn_data():
-    """Load churn training features from SQL Server view"""
+
+# ============================================================================
+# CONNECTION POOL
+# ============================================================================
+class ConnectionPool:
+    """
+    Thread-safe pool of reusable connections.
+    - at most `max_size` connections exist at once; borrowers wait up to
+      `borrow_timeout` seconds for one to be returned
+    - idle connections older than `idle_timeout` seconds are closed
+    - every reused connection is health-checked (SELECT 1, or `ping`) before
+      it is handed out
+    - a connection whose borrower raised is closed instead of returned
+    """
+
+    def __init__(self, factory=get_connection, max_size=4, idle_timeout=300.0,
+                 borrow_timeout=30.0, health_check=True, ping=None):
+        self.factory = factory
+        self.ping = ping
+        self.max_size = max_size
+        self.idle_timeout = idle_timeout
+        self.borrow_timeout = borrow_timeout
+        self.health_check = health_check
+
+        self._idle = deque()        # (connection, returned_at), most recently returned last
+        self._size = 0              # open connections, idle + in use (+ being opened)
+        self._in_use = 0
+        self._closed = False
+        self._condition = threading.Condition()
+        self._stats = {
+            "borrows": 0,
+            "created": 0,
+            "reused": 0,
+            "closed_idle": 0,
+            "failed_health_checks": 0,
+            "discarded_after_error": 0,
+            "waits": 0,
+            "wait_seconds": 0.0,
+            "peak_in_use": 0
+        }
+
+    def _close(self, conn):
+        try:
+            conn.close()
+        except Exception:
+            pass
+
+    def _is_healthy(self, conn):
+        try:
+            if self.ping is not None:
+                self.ping(conn)
+                return True
+            cursor = conn.cursor()
+            cursor.execute("SELECT 1")
+            cursor.fetchall()
+            cursor.close()
+            return True
+        except Exception:
+            return False
+
+    def _evict_idle(self, now):
+        """Close idle connections past idle_timeout (caller holds the lock)."""
+        expired = []
+        while self._idle and now - self._idle[0][1] > self.idle_timeout:
+            expired.append(self._idle.popleft()[0])
+        self._size -= len(expired)
+        self._stats["closed_idle"] += len(expired)
+        return expired
+
+    def acquire(self):
+        """Borrow a connection; prefer borrow_connection()/connection() which also return it."""
+        deadline = time.monotonic() + self.borrow_timeout
+        waited = False
+
+        while True:
+            with self._condition:
+                if self._closed:
+                    raise RuntimeError("Connection pool is closed")
+                expired = self._evict_idle(time.monotonic())
+                conn = None
+                create = False
+
+                if self._idle:
+                    conn = self._idle.pop()[0]
+                elif self._size < self.max_size:
+                    self._size += 1
+                    create = True
+                else:
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        raise TimeoutError(
+                            f"No database connection available within {self.borrow_timeout}s "
+                            f"(max_size={self.max_size})"
+                        )
+                    if not waited:
+                        self._stats["waits"] += 1
+                        waited = True
+                    wait_start = time.monotonic()
+                    self._condition.wait(remaining)
+                    self._stats["wait_seconds"] += time.monotonic() - wait_start
+
+            for old in expired:
+                self._close(old)
+
+            if create:
+                try:
+                    conn = self.factory()
+                except BaseException:
+                    with self._condition:
+                        self._size -= 1
+                        self._condition.notify()
+                    raise
+                self._mark_borrowed(created=True)
+                return conn
+
+            if conn is not None:
+                # Health check outside the lock; a dead connection frees its slot and we retry
+                if self.health_check and not self._is_healthy(conn):
+                    self._close(conn)
+                    with self._condition:
+                        self._size -= 1
+                        self._stats["failed_health_checks"] += 1
+                    continue
+                self._mark_borrowed(created=False)
+                return conn
+
+    def _mark_borrowed(self, created):
+        with self._condition:
+            self._in_use += 1
+            self._stats["borrows"] += 1
+            self._stats["created" if created else "reused"] += 1
+            self._stats["peak_in_use"] = max(self._stats["peak_in_use"], self._in_use)
+
+    def release(self, conn, discard=False):
+        """Return a borrowed connection (or close it when discard=True)."""
+        with self._condition:
+            self._in_use -= 1
+            if discard or self._closed:
+                self._size -= 1
+                if discard:
+                    self._stats["discarded_after_error"] += 1
+            else:
+                self._idle.append((conn, time.monotonic()))
+                conn = None
+            self._condition.notify()
+        if conn is not None:
+            self._close(conn)
+
+    @contextmanager
+    def connection(self):
+        conn = self.acquire()
+        try:
+            yield conn
+        except BaseException:
+            self.release(conn, discard=True)
+            raise
+        self.release(conn)
+
+    def stats(self):
+        with self._condition:
+            return {
+                **self._stats,
+                "wait_seconds": round(self._stats["wait_seconds"], 4),
+                "open": self._size,
+                "idle": len(self._idle),
+                "in_use": self._in_use,
+                "max_size": self.max_size
+            }
+
+    def close(self):
+        """Close every idle connection; borrowed ones are closed when returned."""
+        with self._condition:
+            self._closed = True
+            idle = [conn for conn, _ in self._idle]
+            self._idle.clear()
+            self._size -= len(idle)
+            self._condition.notify_all()
+        for conn in idle:
+            self._close(conn)
+
+
+_pool_lock = threading.Lock()
+_pool_state = {}    # kind -> (key, pool)
+
+
+def _pool_key():
+    """Pool identity: the process (forked workers must not share sockets) and the target database."""
+    target = DB_CONFIG["sqlite_path"] if DB_CONFIG.get("backend") == "sqlite" else DB_CONFIG["server"]
+    return (os.getpid(), DB_CONFIG.get("backend", "sqlserver"), target, DB_CONFIG.get("database"))
+
+
+def get_pool(kind="dbapi"):
+    """
+    The process-wide pool of `kind` connections, configured from DB_CONFIG
+    and rebuilt if the target changes: "dbapi" (pyodbc / sqlite3, for
+    pd.read_sql) or "arrow" (arrow-odbc / ADBC, for columnar fetches).
+    """
+    key = _pool_key()
+    with _pool_lock:
+        current_key, pool = _pool_state.get(kind, (None, None))
+        if current_key != key:
+            if pool is not None and current_key[0] == key[0]:
+                pool.close()
+            factory, ping = (get_connection, None) if kind == "dbapi" else _arrow_connection_factory()
+            pool = ConnectionPool(
+                factory=factory,
+                ping=ping,
+                max_size=DB_CONFIG.get("pool_max_size", 4),
+                idle_timeout=DB_CONFIG.get("pool_idle_timeout_s", 300),
+                borrow_timeout=DB_CONFIG.get("pool_borrow_timeout_s", 30),
+                health_check=DB_CONFIG.get("pool_health_check", True)
+            )
+            _pool_state[kind] = (key, pool)
+        return pool
+
+
+def borrow_connection(kind="dbapi"):
+    """Context manager that borrows a pooled connection and returns it afterwards."""
+    return get_pool(kind).connection()
+
+
+def pool_stats(kind="dbapi"):
+    """Counters of the process-wide pool (borrows, created, reused, waits, ...)."""
+    return get_pool(kind).stats()
+
+
+def build_query(view, columns=None, filters=None):
+    """
+    Compile a column list and filters into a parameterized SELECT.
+    Filters are (column, op, value) tuples combined with AND, e.g.
+    [("contract_type", "==", "Month-to-month"), ("tenure_months", ">=", 12)].
+    Returns (sql, params); unknown views, columns or operators raise ValueError.
+    """
+    if view not in VIEW_COLUMNS:
+        raise ValueError(f"Unknown view: {view}")
+    allowed = VIEW_COLUMNS[view]
+
+    def check_column(col):
+        if col not in allowed:
+            raise ValueError(f"Column '{col}' is not in {view}")
+        return col
+
+    if columns is not None and not columns:
+        raise ValueError("columns must not be empty")
+    select = "*" if columns is None else ", ".join(check_column(col) for col in columns)
+
+    clauses, params = [], []
+    for col, op, value in filters or []:
+        check_column(col)
+        if op not in FILTER_OPERATORS:
+            raise ValueError(f"Unsupported filter operator: {op}")
+
+        if op in ("in", "not in"):
+            values = list(value)
+            if not values:
+                raise ValueError(f"Empty value list for '{col} {op}'")
+            clauses.append(f"{col} {FILTER_OPERATORS[op]} ({', '.join('?' * len(values))})")
+            params.extend(values)
+        elif op == "between":
+            low, high = value
+            clauses.append(f"{col} BETWEEN ? AND ?")
+            params.extend([low, high])
+        elif value is None:
+            if op not in ("==", "!="):
+                raise ValueError(f"NULL can only be compared with == or != ('{col}')")
+            clauses.append(f"{col} IS {'NOT ' if op == '!=' else ''}NULL")
+        else:
+            clauses.append(f"{col} {FILTER_OPERATORS[op]} ?")
+            params.append(value)
+
+    query = f"SELECT {select} FROM {view}"
+    if clauses:
+        query += " WHERE " + " AND ".join(clauses)
+    return query, params
+
+def frame_memory_mb(df):
+    """Deep in-memory size of a DataFrame in MB."""
+    return df.memory_usage(deep=True).sum() / 1024 / 1024
+
+
+def apply_dtype_plan(df, schema=CHURN_SCHEMA):
+    """Cast columns to the declared schema; columns not in the schema are left as-is."""
+    converted = {}
+    for col, dtype in schema.items():
+        if col not in df.columns:
+            continue
+        if dtype.startswith("int") and df[col].isna().any():
+            dtype = "float32"
+        converted[col] = df[col].astype(dtype)
+    return df.assign(**converted)
+
+
+def concat_chunks(chunks):
+    """
+    Concatenate typed chunks. Categorical columns are aligned to the union of
+    their categories first, otherwise pandas would fall back to object dtype.
+    """
+    if len(chunks) == 1:
+        return chunks[0]
+
+    for col in chunks[0].columns:
+        if isinstance(chunks[0][col].dtype, pd.CategoricalDtype):
+            categories = pd.api.types.union_categoricals(
+                [chunk[col] for chunk in chunks], ignore_order=True
+            ).categories
+            for chunk in chunks:
+                chunk[col] = chunk[col].cat.set_categories(categories)
+
+    return pd.concat(chunks, ignore_index=True)
+
+
+# ============================================================================
+# FETCH BACKENDS
+# ============================================================================
+_fetch_state = {"warned": False}
+
+
+def _arrow_driver():
+    """
+    Columnar driver for the configured database, or None if not installed:
+    arrow-odbc for SQL Server, ADBC (adbc-driver-sqlite) for the SQLite stand-in.
+    """
+    try:
+        if DB_CONFIG.get("backend", "sqlserver") == "sqlite":
+            from adbc_driver_sqlite import dbapi
+            return dbapi
+        import arrow_odbc
+        return arrow_odbc
+    except ImportError:
+        return None
+
+
+def _arrow_connection_factory():
+    """
+    (factory, ping) for pooled columnar connections: an ADBC connection to the
+    SQLite stand-in (DB-API, so the default SELECT 1 check works) or an
+    arrow-odbc Connection, which has no cursor and is pinged with execute().
+    """
+    driver = _arrow_driver()
+    if DB_CONFIG.get("backend", "sqlserver") == "sqlite":
+        return (lambda: driver.connect(DB_CONFIG["sqlite_path"])), None
+    return (lambda: driver.connect(odbc_connection_string())), (lambda conn: conn.execute("SELECT 1"))
+
+
+def active_fetch_backend():
+    """'arrow' when DB_CONFIG["fetch_backend"] asks for it and a driver is installed, else 'pandas'."""
+    if DB_CONFIG.get("fetch_backend", "pandas") != "arrow":
+        return "pandas"
+    if _arrow_driver() is None:
+        if not _fetch_state["warned"]:
+            print("ℹ️  Arrow fetch driver not installed (arrow-odbc / adbc-driver-sqlite), using pd.read_sql")
+            _fetch_state["warned"] = True
+        return "pandas"
+    return "arrow"
+
+
+def _arrow_batches(query, params, batch_size):
+    """
+    Run the query on a pooled columnar connection and yield pyarrow
+    RecordBatches of ~batch_size rows. The driver fills column buffers
+    directly, so no per-row Python objects exist.
+    """
+    with borrow_connection("arrow") as conn:
+        if DB_CONFIG.get("backend", "sqlserver") == "sqlite":
+            with conn.cursor() as cursor:
+                cursor.adbc_statement.set_options(**{"adbc.sqlite.query.batch_rows": str(batch_size)})
+                cursor.execute(query, params)
+                yield from _non_empty(cursor.fetch_record_batch())
+        else:
+            # arrow-odbc binds parameters as text; SQL Server converts them to the column type
+            reader = conn.read_arrow_batches(
+                query=query,
+                batch_size=batch_size,
+                parameters=[None if p is None else str(p) for p in params]
+            )
+            yield from _non_empty(reader)
+
+
+def _non_empty(reader):
+    """Yield the reader's batches, or one empty batch so callers still get the columns."""
+    import pyarrow as pa
+
+    empty = True
+    for batch in reader:
+        empty = False
+        yield batch
+    if empty:
+        yield pa.RecordBatch.from_pylist([], schema=reader.schema)
+
+
+def arrow_to_frame(batch):
+    """
+    Arrow batch/table -> DataFrame with the dtypes pd.read_sql produces:
+    DECIMAL columns become float64 (read_sql's coerce_float), strings become
+    str, and an empty result has untyped (object) columns.
+    """
+    import pyarrow as pa
+
+    table = pa.Table.from_batches([batch]) if isinstance(batch, pa.RecordBatch) else batch
+    if table.num_rows == 0:
+        # Drivers guess types for an empty result (ADBC SQLite says int64); read_sql leaves them untyped
+        return pd.DataFrame({name: pd.Series([], dtype=object) for name in table.column_names})
+    for i, field in enumerate(table.schema):
+        if pa.types.is_decimal(field.type):
+            table = table.set_column(i, field.name, table.column(i).cast(pa.float64()))
+    return table.to_pandas()
+
+
+def fetch_frame(query, params=None):
+    """Run a SELECT and return the whole result as a DataFrame, via Arrow when available."""
+    params = params or []
+    if active_fetch_backend() == "arrow":
+        import pyarrow as pa
+
+        return arrow_to_frame(pa.Table.from_batches(list(_arrow_batches(query, params, LOAD_CHUNK_SIZE))))
+
+    with borrow_connection() as conn:
+        return pd.read_sql(query, conn, params=params)
+
+
+def fetch_chunks(query, params=None, chunksize=LOAD_CHUNK_SIZE):
+    """Run a SELECT and yield DataFrames of about `chunksize` rows, via Arrow when available."""
+    params = params or []
+    if active_fetch_backend() == "arrow":
+        for batch in _arrow_batches(query, params, chunksize):
+            yield arrow_to_frame(batch)
+        return
+
+    with borrow_connection() as conn:
+        for chunk in pd.read_sql(query, conn, params=params, chunksize=chunksize):
+            yield chunk
+
+
+@instrumented("ingestion")
+def load_churn_data(optimize_dtypes=False, chunksize=LOAD_CHUNK_SIZE, columns=None, filters=None):
+    """
+    Load churn training features from SQL Server view.
+    `columns` and `filters` (see build_query) are pushed down into the SQL, so
+    only the requested columns and rows are transferred.
+    With optimize_dtypes=True the view is read in chunks and each chunk is cast
+    to CHURN_SCHEMA on arrival, so the full object/int64 frame never exists.
+    """
     try:
-        query = "SELECT * FROM vw_churn_training_features"
-        with get_connection() as conn:
-            df = pd.read_sql(query, conn)
+        query, params = build_query(TRAINING_VIEW, columns, filters)
+        if not optimize_dtypes:
+            return fetch_frame(query, params)
+
+        raw_mb = 0.0
+        chunks = []
+        for chunk in fetch_chunks(query, params, chunksize):
+            raw_mb += frame_memory_mb(chunk)
+            chunks.append(apply_dtype_plan(chunk))
+
+        df = concat_chunks(chunks) if chunks else pd.DataFrame()
+        lean_mb = frame_memory_mb(df)
+        print(f"💾 Memory: {raw_mb:.1f} MB inferred -> {lean_mb:.1f} MB with dtype plan "
+              f"({raw_mb / max(lean_mb, 1e-9):.1f}x smaller)")
         return df
     except Exception as e:
         print(f"❌ Failed to load data: {e}")
         return pd.DataFrame()
 
+def iter_churn_data(chunksize=100_000, columns=None, filters=None):
+    """
+    Stream the training features view in chunks of `chunksize` rows.
+    Keeps memory bounded for full-base jobs such as the dashboard builder.
+    """
+    query, params = build_query(TRAINING_VIEW, columns, filters)
+    yield from fetch_chunks(query, params, chunksize)
+
+# ============================================================================
+# INCREMENTAL INGESTION
+# ============================================================================
+def _as_date(value):
+    return None if value is None or pd.isna(value) else pd.Timestamp(value).strftime("%Y-%m-%d")
+
+
+def load_ingestion_state(path=INGESTION_STATE_PATH):
+    """Watermarks of the last incremental run ({} before the first run)."""
+    if os.path.exists(path):
+        with open(path) as f:
+            return json.load(f)
+    return {}
+
+
+def save_ingestion_state(state, path=INGESTION_STATE_PATH):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp_path = path + ".tmp"
+    with open(tmp_path, "w") as f:
+        json.dump(state, f, indent=2)
+    os.replace(tmp_path, path)
+
+
+def current_watermarks():
+    """MAX(timestamp) of every watermark source, in one round trip."""
+    query = "SELECT " + ", ".join(
+        f"(SELECT MAX({col}) FROM {table}) AS {table}" for table, col in WATERMARK_SOURCES.items()
+    )
+    row = fetch_frame(query).iloc[0]
+    return {table: _as_date(row[table]) for table in WATERMARK_SOURCES}
+
+
+def changed_customer_ids(watermarks, lookback_days=0):
+    """
+    customer_ids with source rows on or after their table's watermark day.
+    Watermarks are dates, so '>=' re-reads the watermark day itself and picks
+    up rows that landed later that same day (re-processing is idempotent);
+    PERIOD_SOURCES use '>'. Rows back-dated to earlier days are only seen
+    with lookback_days > 0.
+    A source without a watermark yet counts all its non-NULL rows as new.
+    """
+    selects, params = [], []
+    for table, col in WATERMARK_SOURCES.items():
+        mark = watermarks.get(table)
+        if mark is None:
+            selects.append(f"SELECT customer_id FROM {table} WHERE {col} IS NOT NULL")
+        else:
+            op = ">" if table in PERIOD_SOURCES else ">="
+            selects.append(f"SELECT customer_id FROM {table} WHERE {col} {op} ?")
+            params.append(_as_date(pd.Timestamp(mark) - pd.Timedelta(days=lookback_days)))
+
+    ids = fetch_frame(" UNION ".join(selects), params)["customer_id"]
+    return sorted(ids.astype(str).tolist())
+
+
+def fetch_customers(customer_ids, columns=None):
+    """Training view rows for the given customers (batched customer_id IN lists)."""
+    frames = []
+    for start in range(0, len(customer_ids), ID_BATCH_SIZE):
+        batch = list(customer_ids[start:start + ID_BATCH_SIZE])
+        query, params = build_query(TRAINING_VIEW, columns, [("customer_id", "in", batch)])
+        frames.append(fetch_frame(query, params))
+    if not frames:
+        query, params = build_query(TRAINING_VIEW, columns, [("customer_id", "==", None)])
+        return fetch_frame(query, params)
+    return pd.concat(frames, ignore_index=True)
+
+
+def _write_parquet(df, path):
+    """Atomic Parquet write (readers never see a half-written snapshot)."""
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp_path = path + ".tmp"
+    df.to_parquet(tmp_path, index=False)
+    os.replace(tmp_path, path)
+
+
+def load_snapshot(path=SNAPSHOT_PATH):
+    """The local training-view snapshot, sorted by customer_id."""
+    return pd.read_parquet(path)
+
+
+def load_changed_ids(path=CHANGED_IDS_PATH):
+    """customer_ids inserted, updated or removed by the last incremental run."""
+    if not os.path.exists(path):
+        return []
+    return pd.read_parquet(path)["customer_id"].tolist()
+
+
+def incremental_load(snapshot_path=SNAPSHOT_PATH, state_path=INGESTION_STATE_PATH,
+                     changed_ids_path=CHANGED_IDS_PATH, lookback_days=0, full_refresh=False):
+    """
+    Refresh the local snapshot of vw_churn_training_features.
+    The first run (or full_refresh=True) copies the whole view. Later runs
+    only fetch customers whose source rows moved past the per-table
+    watermarks and upsert them by customer_id. Customers that left the view
+    (e.g. deleted from customers, billing or churn_labels, which moves no
+    watermark) are dropped by an anti-join against the view's customer_ids
+    and reported as changed. Returns (snapshot, changed_ids); changed_ids is also written
+    to `changed_ids_path` for downstream scoring and dashboard jobs.
+    tenure_months is computed from GETDATE(), so every row changes when the
+    month rolls over; a new month therefore forces a full refresh.
+    """
+    view_month = datetime.now().strftime("%Y-%m")
+    state = {} if full_refresh or not os.path.exists(snapshot_path) else load_ingestion_state(state_path)
+    if state and state.get("view_month") != view_month:
+        print(f"📅 New month since the last run ({state.get('view_month')} -> {view_month}): full refresh")
+        state = {}
+
+    with stage("incremental_ingestion", mode="incremental" if state else "full") as info:
+        # New watermarks are read before the change scan, so rows landing
+        # during this run are picked up (again) by the next one
+        new_watermarks = current_watermarks()
+
+        if not state:
+            query, params = build_query(TRAINING_VIEW)
+            snapshot = fetch_frame(query, params)
+            changed_ids = snapshot["customer_id"].astype(str).tolist()
+        else:
+            changed_ids = changed_customer_ids(state["watermarks"], lookback_days)
+            fresh = fetch_customers(changed_ids)
+            snapshot = load_snapshot(snapshot_path)
+
+            # Deletions leave no newer source row behind, so check membership directly
+            query, params = build_query(TRAINING_VIEW, columns=["customer_id"])
+            live_ids = fetch_frame(query, params)["customer_id"].astype(str)
+            removed = snapshot.loc[~snapshot["customer_id"].astype(str).isin(live_ids), "customer_id"]
+            changed_ids = sorted(set(changed_ids) | set(removed.astype(str)))
+            info["removed"] = len(removed)
+
+            kept = snapshot[~snapshot["customer_id"].isin(changed_ids)]
+            snapshot = pd.concat([kept, fresh], ignore_index=True) if len(fresh) else kept
+
+        snapshot = snapshot.sort_values("customer_id", ignore_index=True)
+        info["rows"] = len(snapshot)
+        info["changed"] = len(changed_ids)
+
+        _write_parquet(snapshot, snapshot_path)
+        _write_parquet(pd.DataFrame({"customer_id": pd.Series(changed_ids, dtype=str)}), changed_ids_path)
+        save_ingestion_state({
+            "watermarks": new_watermarks,
+            "view_month": view_month,
+            "last_run": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+            "mode": "incremental" if state else "full",
+            "changed_customers": len(changed_ids),
+            "snapshot_rows": len(snapshot)
+        }, state_path)
+
+    print(f"🔁 {'Incremental' if state else 'Full'} ingestion: {len(changed_ids)} changed customers, "
+          f"snapshot has {len(snapshot)} rows")
+    return snapshot, changed_ids
+
+
 if __name__ == "__main__":
     df = load_churn_data()
     if not df.empty:
@@ -1,28 +1,56 @@
 from src.feature_engineering import engineer_features
 from src.data_cleaning import clean_data
 from src.data_ingestion import load_churn_data
+from src.profiling import profile_frame, write_report
 
-import pandas as pd
+PROFILE_PATH = "logs/deep_eda_profile.json"
 
-df = engineer_features(clean_data(load_churn_data()))
-
-# -----------------------------
-# TARGET SEPARATION CHECK
-# -----------------------------
-print(df.groupby("churn")[[
+ENGINEERED_SCORES = [
     "engagement_score",
     "cx_risk_score",
     "stickiness_score",
     "charges_per_month"
-]].mean())
-
-# -----------------------------
-# FEATURE VARIANCE CHECK
-# -----------------------------
-low_variance = df.nunique()
-print(low_variance.sort_values())
-
-# -----------------------------
-# TENURE BUCKET VS CHURN
-# -----------------------------
-print(df.groupby("tenure_bucket")["churn"].mean())
\ No newline at end of file
+]
+
+
+def run_deep_eda(output_path=PROFILE_PATH):
+    """
+    Profile the engineered feature set: target separation of the engineered
+    scores, low-cardinality (low-variance) columns and churn by tenure bucket.
+    """
+    print("\n" + "="*60)
+    print("DEEP EDA - ENGINEERED FEATURES")
+    print("="*60)
+
+    df = engineer_features(clean_data(load_churn_data()))
+    report = profile_frame(df)
+
+    # -----------------------------
+    # TARGET SEPARATION CHECK
+    # -----------------------------
+    print("\n🎯 Engineered score means by churn class:")
+    for col in ENGINEERED_SCORES:
+        print(f"   {col:<20} {report['mean_by_churn'].get(col)}")
+
+    # -----------------------------
+    # FEATURE VARIANCE CHECK
+    # -----------------------------
+    print("\n🔢 Lowest-cardinality columns:")
+    cardinality = sorted(report["cardinality"].items(), key=lambda kv: kv[1]["distinct"])
+    for col, stats in cardinality[:10]:
+        print(f"   {col:<28} {stats['distinct']} ({stats['method']})")
+
+    # -----------------------------
+    # TENURE BUCKET VS CHURN
+    # -----------------------------
+    print("\n📋 Churn rate by tenure bucket:")
+    for value, stats in report["churn_rate_by_category"].get("tenure_bucket", {}).items():
+        print(f"   {value:<10} {stats['churn_rate']:.2%} ({stats['rows']} rows)")
+
+    write_report(report, output_path)
+    print(f"\n✅ Deep EDA profile saved to: {output_path}")
+    return report
+
+
+if __name__ == "__main__":
+    run_deep_eda()
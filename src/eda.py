@@ -1,67 +1,44 @@
-import pandas as pd
-import numpy as np
-from src.data_ingestion import load_churn_data
+from src.data_ingestion import iter_churn_data, TRAINING_VIEW, VIEW_COLUMNS
+from src.profiling import profile_chunks, write_report, ID_COLUMNS
 
-df = load_churn_data()
+PROFILE_PATH = "logs/eda_profile.json"
+CHUNK_SIZE = 100_000
 
-def data_health_check(df):
-    return {
-        "rows": df.shape[0],
-        "columns": df.shape[1],
-        "missing_values": df.isnull().sum().sort_values(ascending=False)
-    }
+# Everything but the key: customer_id is the widest column and carries no signal
+EDA_COLUMNS = [col for col in VIEW_COLUMNS[TRAINING_VIEW] if col not in ID_COLUMNS]
 
-health = data_health_check(df)
-print(health)
 
-churn_dist = df["churn"].value_counts(normalize=True)
-print(churn_dist)
+def run_eda(chunksize=CHUNK_SIZE, output_path=PROFILE_PATH):
+    """
+    Profile the training view in a single streamed pass: churn distribution,
+    missing values, cardinality, per-churn means and per-category churn rates.
+    """
+    print("\n" + "="*60)
+    print("EXPLORATORY DATA ANALYSIS")
+    print("="*60)
 
-tenure_churn = df.groupby("churn")["tenure_months"].mean()
-print(tenure_churn)
+    report = profile_chunks(iter_churn_data(chunksize=chunksize, columns=EDA_COLUMNS))
 
-contract_churn = (
-    df.groupby("contract_type")["churn"]
-      .mean()
-      .sort_values(ascending=False)
-)
-print(contract_churn)
+    print(f"\n📊 Rows: {report['rows']} | Columns: {report['columns']}")
+    print(f"\n🎯 Churn distribution: {report['churn_distribution']}")
 
-billing_churn = df.groupby("churn")[[
-    "monthly_charges",
-    "late_payments"
-]].mean()
-print(billing_churn)
+    missing = {col: n for col, n in report["missing_values"].items() if n > 0}
+    print(f"\n🕳️  Columns with missing values: {missing if missing else 'none'}")
 
-payment_churn = (
-    df.groupby("payment_method")["churn"]
-      .mean()
-      .sort_values(ascending=False)
-)
-print(payment_churn)
+    print("\n📈 Mean by churn class:")
+    for col, means in report["mean_by_churn"].items():
+        print(f"   {col:<28} {means}")
 
-usage_churn = df.groupby("churn")[[
-    "avg_call_minutes",
-    "avg_data_usage_gb"
-]].mean()
-print(usage_churn)
+    for col in ["contract_type", "payment_method"]:
+        if col in report["churn_rate_by_category"]:
+            print(f"\n📋 Churn rate by {col}:")
+            for value, stats in report["churn_rate_by_category"][col].items():
+                print(f"   {value:<28} {stats['churn_rate']:.2%} ({stats['rows']} rows)")
 
-cx_churn = df.groupby("churn")[[
-    "support_ticket_count",
-    "avg_resolution_time",
-    "avg_satisfaction_score"
-]].mean()
-print(cx_churn)
+    write_report(report, output_path)
+    print(f"\n✅ EDA profile saved to: {output_path}")
+    return report
 
-addons_churn = df.groupby("churn")[[
-    "has_online_security",
-    "has_tech_support",
-    "streaming_services_count"
-]].mean()
-print(addons_churn)
 
-with open("logs/eda_summary.txt", "w") as f:
-    f.write("CHURN DISTRIBUTION\n")
-    f.write(str(churn_dist))
-    f.write("\n\nTENURE VS CHURN\n")
-    f.write(str(tenure_churn))
\ No newline at end of file
+if __name__ == "__main__":
+    run_eda()
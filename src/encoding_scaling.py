@@ -7,15 +7,19 @@ from src.feature_engineering import engineer_features
 from src.data_cleaning import clean_data
 from src.data_ingestion import load_churn_data
 
-def encode_and_scale():
-    
+def encode_and_scale(df=None):
+    """
+    Select model features and build the preprocessor.
+    `df` is an already engineered frame; by default it is loaded from the database.
+    """
     print("\n" + "="*60)
     print("ENCODING & SCALING - PREPARING FEATURES")
     print("="*60)
 
     # Load → Clean → Engineer
-    print("\n📥 Loading and engineering features...")
-    df = engineer_features(clean_data(load_churn_data()))
+    if df is None:
+        print("\n📥 Loading and engineering features...")
+        df = engineer_features(clean_data(load_churn_data()))
     print(f"✅ Total features available: {df.shape[1]} columns")
 
     # -----------------------------
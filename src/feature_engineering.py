@@ -2,9 +2,105 @@ import pandas as pd
 import numpy as np
 from src.data_cleaning import clean_data
 from src.data_ingestion import load_churn_data
+from src.instrumentation import instrumented
 
 
-def engineer_features(df: pd.DataFrame) -> pd.DataFrame:
+# Engineered numeric columns in output order; flags are stored as int like .astype(int)
+NUMERIC_FEATURES = [
+    "charges_per_month",
+    "high_price_flag",
+    "engagement_score",
+    "cx_risk_score",
+    "payment_risk",
+    "stickiness_score"
+]
+FLAG_FEATURES = ["high_price_flag", "payment_risk"]
+
+# Lifecycle buckets for tenure_months (pd.cut, right-inclusive)
+TENURE_BINS = [0, 6, 12, 24, 48, 1000]
+TENURE_LABELS = ["0-6", "6-12", "12-24", "24-48", "48+"]
+
+
+def _numeric_features(df, median_charges, out=None):
+    """
+    NumPy form of engineered features 2-6. With `out` (name -> array) every
+    result is written straight into the given destination arrays.
+    """
+    def dest(name):
+        return None if out is None else out[name]
+
+    col = {c: df[c].to_numpy() for c in [
+        "tenure_months", "total_charges", "monthly_charges", "avg_call_minutes",
+        "avg_data_usage_gb", "support_ticket_count", "avg_satisfaction_score",
+        "late_payments", "has_online_security", "has_tech_support", "streaming_services_count"
+    ]}
+
+    engagement = np.multiply(col["avg_call_minutes"], 0.4, out=dest("engagement_score"))
+    np.add(engagement, np.multiply(col["avg_data_usage_gb"], 0.6), out=engagement)
+
+    stickiness = np.add(col["has_online_security"], col["has_tech_support"], out=dest("stickiness_score"))
+    np.add(stickiness, col["streaming_services_count"], out=stickiness)
+
+    return {
+        "charges_per_month": np.divide(
+            col["total_charges"], col["tenure_months"] + 1, out=dest("charges_per_month")
+        ),
+        "high_price_flag": np.greater(col["monthly_charges"], median_charges, out=dest("high_price_flag")),
+        "engagement_score": engagement,
+        "cx_risk_score": np.multiply(
+            col["support_ticket_count"], 5 - col["avg_satisfaction_score"], out=dest("cx_risk_score")
+        ),
+        "payment_risk": np.greater(col["late_payments"], 0, out=dest("payment_risk")),
+        "stickiness_score": stickiness
+    }
+
+
+def _engineer_features_inplace(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Copy-free engineer_features: the input columns are reused as-is and the
+    numeric features are computed into one preallocated block per dtype,
+    which is attached without copying (pandas Copy-on-Write concat).
+    """
+    median_charges = df["monthly_charges"].median()
+
+    # Output dtypes from a one-row probe with the same NumPy expressions
+    probe = _numeric_features(df.iloc[:1], median_charges)
+    dtypes = {
+        name: np.dtype(np.int64) if name in FLAG_FEATURES else probe[name].dtype
+        for name in NUMERIC_FEATURES
+    }
+
+    # Fortran order keeps each feature column contiguous inside its block
+    out = {}
+    for dtype in dict.fromkeys(dtypes.values()):
+        names = [name for name in NUMERIC_FEATURES if dtypes[name] == dtype]
+        block = np.empty((len(df), len(names)), dtype=dtype, order="F")
+        for j, name in enumerate(names):
+            out[name] = block[:, j]
+
+    _numeric_features(df, median_charges, out=out)
+
+    tenure_bucket = pd.cut(
+        df["tenure_months"],
+        bins=TENURE_BINS,
+        labels=TENURE_LABELS
+    )
+    engineered = [tenure_bucket.rename("tenure_bucket").to_frame()] + [
+        pd.DataFrame(out[name][:, None], columns=[name], index=df.index, copy=False)
+        for name in NUMERIC_FEATURES
+    ]
+    return pd.concat([df] + engineered, axis=1)
+
+
+@instrumented("feature_engineering")
+def engineer_features(df: pd.DataFrame, inplace: bool = False) -> pd.DataFrame:
+    """
+    Add the engineered features. With inplace=True the input frame's memory
+    is reused instead of copied; the input should not be used afterwards.
+    """
+    if inplace:
+        return _engineer_features_inplace(df)
+
     df = df.copy()
 
     # -----------------------------
@@ -12,8 +108,8 @@ def engineer_features(df: pd.DataFrame) -> pd.DataFrame:
     # -----------------------------
     df["tenure_bucket"] = pd.cut(
         df["tenure_months"],
-        bins=[0, 6, 12, 24, 48, 1000],
-        labels=["0-6", "6-12", "12-24", "24-48", "48+"]
+        bins=TENURE_BINS,
+        labels=TENURE_LABELS
     )
 
     # -----------------------------
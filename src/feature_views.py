@@ -0,0 +1,298 @@
+import glob
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+from src.instrumentation import stage
+
+EXTRACTS_DIR = "data/extracts"
+OUTPUT_DIR = "data/feature_views"
+
+# Raw tables read by the TCCP.sql views (stg_telco_raw supplies the add-on flags)
+SOURCE_TABLES = ["customers", "billing", "usage_data", "support_tickets", "churn_labels", "stg_telco_raw"]
+CUSTOMER_KEY = {table: "customer_id" for table in SOURCE_TABLES}
+CUSTOMER_KEY["stg_telco_raw"] = "customerID"
+
+# Customer hash partitions per build (default: one per worker)
+DEFAULT_PARTITIONS = None
+
+DEPLOYMENT_COLUMNS = [
+    "customer_id",
+    "tenure_months",
+    "contract_type",
+    "monthly_charges",
+    "payment_method",
+    "support_ticket_count",
+    "avg_call_minutes",
+    "avg_data_usage_gb",
+    "churn"
+]
+
+
+# ============================================================================
+# EXTRACTS
+# ============================================================================
+def load_extracts(source_dir=EXTRACTS_DIR, tables=SOURCE_TABLES):
+    """
+    Raw table extracts laid out as <source_dir>/<table>/*.parquet (the layout
+    written by extract_tables and by synthetic_data --tables).
+    """
+    extracts = {}
+    for table in tables:
+        files = sorted(glob.glob(os.path.join(source_dir, table, "*.parquet")))
+        if not files:
+            raise FileNotFoundError(f"No Parquet extract for {table} in {source_dir}")
+        extracts[table] = pd.concat([pd.read_parquet(f) for f in files], ignore_index=True)
+    return extracts
+
+
+def extract_tables(output_dir=EXTRACTS_DIR, tables=SOURCE_TABLES, chunksize=100_000):
+    """Copy the raw source tables from the database into Parquet extracts (one pass per table)."""
+    from src.data_ingestion import fetch_chunks
+
+    for table in tables:
+        table_dir = os.path.join(output_dir, table)
+        os.makedirs(table_dir, exist_ok=True)
+        for i, chunk in enumerate(fetch_chunks(f"SELECT * FROM {table}", chunksize=chunksize)):
+            chunk.to_parquet(os.path.join(table_dir, f"part-{i:05d}.parquet"), index=False)
+        print(f"📦 Extracted {table} to: {table_dir}")
+
+
+# ============================================================================
+# VIEW SEMANTICS
+# ============================================================================
+def _month_diff(start, end):
+    """DATEDIFF(month, start, end): calendar-month boundaries crossed; NaN where start is NULL."""
+    start = pd.to_datetime(start)
+    return (end.year - start.dt.year) * 12 + (end.month - start.dt.month)
+
+
+def _sql_avg_int(total, count):
+    """AVG over an INT column in SQL Server: integer result, truncated toward zero (NULL if no values)."""
+    total = total.to_numpy(dtype=np.int64)
+    count = count.to_numpy(dtype=np.int64)
+    avg = np.sign(total) * (np.abs(total) // np.maximum(count, 1))
+    return np.where(count > 0, avg, np.nan) if (count == 0).any() else avg
+
+
+def support_agg(support_tickets, as_of):
+    """vw_support_agg."""
+    tickets = support_tickets.assign(ticket_date=pd.to_datetime(support_tickets["ticket_date"]))
+    grouped = tickets.groupby("customer_id", sort=False)
+    out = grouped.agg(
+        support_ticket_count=("customer_id", "size"),
+        avg_resolution_time=("resolution_time_hr", "mean"),
+        satisfaction_sum=("satisfaction_score", "sum"),
+        satisfaction_count=("satisfaction_score", "count"),
+        last_ticket_date=("ticket_date", "max")
+    ).reset_index()
+
+    # AVG over DECIMAL(10,2) returns DECIMAL(38,6)
+    out["avg_resolution_time"] = out["avg_resolution_time"].round(6)
+    out["avg_satisfaction_score"] = _sql_avg_int(out.pop("satisfaction_sum"), out.pop("satisfaction_count"))
+    out["days_since_last_ticket"] = (pd.Timestamp(as_of).normalize() - out["last_ticket_date"]).dt.days
+    return out[[
+        "customer_id", "support_ticket_count", "avg_resolution_time",
+        "avg_satisfaction_score", "last_ticket_date", "days_since_last_ticket"
+    ]]
+
+
+def _group_max_str(groups, n_groups, values):
+    """
+    MAX() of a string column per group, ignoring NULLs. Values are ranked once
+    (sorted uniques) so the per-group max is an integer reduction; a plain
+    groupby max on strings falls back to a Python loop.
+    """
+    codes, uniques = pd.factorize(values, sort=True)
+    best = np.full(n_groups, -1, dtype=np.int64)
+    np.maximum.at(best, groups, codes)
+    result = np.asarray(uniques, dtype=object).take(np.maximum(best, 0))
+    result[best < 0] = None
+    return result
+
+
+def usage_agg(usage_data):
+    """vw_usage_agg."""
+    groups, customer_ids = pd.factorize(usage_data["customer_id"])
+    # sort=False keeps groups in first-appearance order, the same order factorize assigns
+    out = usage_data.groupby("customer_id", sort=False).agg(
+        avg_call_minutes=("avg_call_minutes", "mean"),
+        avg_data_usage_gb=("avg_data_usage_gb", "mean")
+    ).reset_index()
+    out["avg_call_minutes"] = out["avg_call_minutes"].round(6)
+    out["avg_data_usage_gb"] = out["avg_data_usage_gb"].round(6)
+    for col in ["internet_service", "phone_service", "multiple_lines"]:
+        out[col] = _group_max_str(groups, len(customer_ids), usage_data[col])
+    return out
+
+
+def _yes_flag(series):
+    """CASE WHEN x = 'Yes' THEN 1 ELSE 0 END (NULL -> 0)."""
+    return (series == "Yes").fillna(False).to_numpy().astype(np.int64)
+
+
+def training_features(tables, support, usage, as_of):
+    """vw_churn_training_features from the raw tables and the two aggregation views."""
+    as_of = pd.Timestamp(as_of).normalize()
+    customers = tables["customers"]
+    billing = tables["billing"]
+    stg = tables["stg_telco_raw"][["customerID", "OnlineSecurity", "TechSupport", "StreamingTV", "StreamingMovies"]]
+
+    # Inner joins to billing, churn_labels and stg_telco_raw; LEFT JOIN to the aggregates
+    df = customers[["customer_id", "signup_date", "contract_type"]].merge(
+        billing[["customer_id", "monthly_charges", "total_charges", "late_payments", "payment_method"]],
+        on="customer_id", how="inner"
+    )
+    df = df.merge(usage[["customer_id", "avg_call_minutes", "avg_data_usage_gb"]], on="customer_id", how="left")
+    df = df.merge(
+        support[["customer_id", "support_ticket_count", "avg_resolution_time", "avg_satisfaction_score"]],
+        on="customer_id", how="left"
+    )
+    df = df.merge(tables["churn_labels"][["customer_id", "churn"]], on="customer_id", how="inner")
+    df = df.merge(stg, left_on="customer_id", right_on="customerID", how="inner")
+
+    tenure = _month_diff(df["signup_date"], as_of)
+    support_count = df["support_ticket_count"].fillna(0)
+    satisfaction = df["avg_satisfaction_score"].fillna(0)
+
+    return pd.DataFrame({
+        "customer_id": df["customer_id"],
+        "tenure_months": tenure.astype(np.int64) if tenure.notna().all() else tenure,
+        "contract_type": df["contract_type"],
+        "monthly_charges": df["monthly_charges"],
+        "total_charges": df["total_charges"],
+        "late_payments": df["late_payments"],
+        "payment_method": df["payment_method"],
+        # ISNULL(..., 0): customers without usage rows / tickets
+        "avg_call_minutes": df["avg_call_minutes"].fillna(0.0),
+        "avg_data_usage_gb": df["avg_data_usage_gb"].fillna(0.0),
+        "support_ticket_count": support_count.astype(np.int64),
+        "avg_resolution_time": df["avg_resolution_time"].fillna(0.0),
+        "avg_satisfaction_score": satisfaction.astype(np.int64),
+        "has_online_security": _yes_flag(df["OnlineSecurity"]),
+        "has_tech_support": _yes_flag(df["TechSupport"]),
+        "streaming_services_count": _yes_flag(df["StreamingTV"]) + _yes_flag(df["StreamingMovies"]),
+        "churn": df["churn"]
+    })
+
+
+def build_partition(tables, as_of):
+    """All four views for one customer partition."""
+    support = support_agg(tables["support_tickets"], as_of)
+    usage = usage_agg(tables["usage_data"])
+    training = training_features(tables, support, usage, as_of)
+    return {
+        "vw_support_agg": support,
+        "vw_usage_agg": usage,
+        "vw_churn_training_features": training,
+        "vw_churn_deployment_features": training[DEPLOYMENT_COLUMNS]
+    }
+
+
+# ============================================================================
+# PARTITIONED BUILD
+# ============================================================================
+def customer_partition(customer_ids, n_partitions):
+    """Stable hash partition of customer_ids; a customer lands in the same partition in every table."""
+    hashes = pd.util.hash_array(np.asarray(customer_ids, dtype=object))
+    return (hashes % np.uint64(n_partitions)).astype(np.int64)
+
+
+def split_by_customer(tables, n_partitions):
+    """
+    Split every table by customer hash. All rows of a customer end up in the
+    same partition, so joins and GROUP BYs never cross partitions.
+    """
+    parts = [{} for _ in range(n_partitions)]
+    for table, df in tables.items():
+        partition = customer_partition(df[CUSTOMER_KEY[table]], n_partitions)
+        order = np.argsort(partition, kind="stable")
+        bounds = np.searchsorted(partition[order], np.arange(n_partitions + 1))
+        for p in range(n_partitions):
+            parts[p][table] = df.iloc[order[bounds[p]:bounds[p + 1]]].reset_index(drop=True)
+    return parts
+
+
+def _restore_customer_order(view, customers):
+    """Order rows like a serial build (customers table order) regardless of partitioning."""
+    position = pd.Series(np.arange(len(customers)), index=customers["customer_id"].to_numpy())
+    key = position.reindex(view["customer_id"].to_numpy()).to_numpy()
+    return view.iloc[np.argsort(key, kind="stable")].reset_index(drop=True)
+
+
+def build_feature_views(tables, as_of=None, n_partitions=DEFAULT_PARTITIONS, workers=None):
+    """
+    Build vw_support_agg, vw_usage_agg, vw_churn_training_features and
+    vw_churn_deployment_features from raw tables in-process. Customers are
+    hash-partitioned and partitions are built in parallel worker processes.
+    `as_of` stands in for GETDATE() (default: today).
+    """
+    as_of = pd.Timestamp(as_of if as_of is not None else pd.Timestamp.now()).normalize()
+    workers = workers or os.cpu_count() or 1
+    n_partitions = n_partitions or workers
+
+    with stage("feature_views", partitions=n_partitions, workers=workers) as info:
+        parts = split_by_customer(tables, n_partitions) if n_partitions > 1 else [tables]
+
+        if workers > 1 and len(parts) > 1:
+            with ProcessPoolExecutor(max_workers=workers) as executor:
+                results = list(executor.map(build_partition, parts, [as_of] * len(parts)))
+        else:
+            results = [build_partition(part, as_of) for part in parts]
+
+        views = {}
+        for name in results[0]:
+            frames = [result[name] for result in results]
+            combined = pd.concat(frames, ignore_index=True) if len(frames) > 1 else frames[0]
+            views[name] = _restore_customer_order(combined, tables["customers"])
+        info["rows"] = len(views["vw_churn_training_features"])
+
+    return views
+
+
+def write_feature_views(views, output_dir=OUTPUT_DIR):
+    """One Parquet file per view: <output_dir>/<view>.parquet."""
+    os.makedirs(output_dir, exist_ok=True)
+    for name, df in views.items():
+        df.to_parquet(os.path.join(output_dir, f"{name}.parquet"), index=False)
+    print(f"✅ Feature views saved to: {output_dir}")
+
+
+def run_feature_views(source_dir=EXTRACTS_DIR, output_dir=OUTPUT_DIR, as_of=None,
+                      n_partitions=DEFAULT_PARTITIONS, workers=None):
+    print("\n" + "="*60)
+    print("FEATURE VIEWS (IN-PROCESS)")
+    print("="*60)
+
+    start_time = time.time()
+    tables = load_extracts(source_dir)
+    print(f"\n📥 Loaded extracts from: {source_dir}")
+    for table, df in tables.items():
+        print(f"   {table:<18} {len(df)} rows")
+
+    views = build_feature_views(tables, as_of, n_partitions, workers)
+    print(f"\n📊 vw_churn_training_features: {views['vw_churn_training_features'].shape}")
+    print(f"⏱️  Built in {time.time() - start_time:.2f}s")
+
+    write_feature_views(views, output_dir)
+    return views
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Build the TCCP.sql feature views from raw table extracts")
+    parser.add_argument("--source-dir", default=EXTRACTS_DIR)
+    parser.add_argument("--output-dir", default=OUTPUT_DIR)
+    parser.add_argument("--as-of", default=None, help="Date used for GETDATE() (default: today)")
+    parser.add_argument("--partitions", type=int, default=DEFAULT_PARTITIONS)
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--extract", action="store_true", help="Extract the raw tables from the database first")
+    args = parser.parse_args()
+
+    if args.extract:
+        extract_tables(args.source_dir)
+    run_feature_views(args.source_dir, args.output_dir, args.as_of, args.partitions, args.workers)
@@ -0,0 +1,185 @@
+import cProfile
+import functools
+import io
+import json
+import os
+import pstats
+import threading
+import time
+import tracemalloc
+import uuid
+from contextlib import contextmanager
+from datetime import datetime
+
+# One JSON object per finished stage
+STAGE_METRICS_PATH = "logs/stage_metrics.jsonl"
+
+# Set CHURN_PROFILE_STAGE=<stage name> to dump cProfile stats for that stage
+PROFILE_ENV = "CHURN_PROFILE_STAGE"
+PROFILE_DIR = "logs/profiles"
+PROFILE_TOP_N = 30
+
+# Set CHURN_TRACE_MEMORY=1 to record tracemalloc peaks (off by default: it
+# slows allocation-heavy stages by ~25%)
+TRACE_MEMORY_ENV = "CHURN_TRACE_MEMORY"
+
+# Groups the stages of one process run in the metrics log
+RUN_ID = uuid.uuid4().hex[:12]
+
+_local = threading.local()
+_write_lock = threading.Lock()
+_tracing_lock = threading.Lock()
+_tracing = {"owners": 0, "threads": {}}
+
+
+def _stack():
+    if not hasattr(_local, "stack"):
+        _local.stack = []
+    return _local.stack
+
+
+def _trace_memory():
+    return os.getenv(TRACE_MEMORY_ENV, "0") == "1"
+
+
+def _start_tracing():
+    """
+    Start (or join) tracing. Returns True when no other thread has a traced
+    stage open; the tracemalloc peak is process-wide, so only then may the
+    stage reset and report it.
+    """
+    thread = threading.get_ident()
+    with _tracing_lock:
+        if _tracing["owners"] == 0 and not tracemalloc.is_tracing():
+            tracemalloc.start()
+            _tracing["started_here"] = True
+        _tracing["owners"] += 1
+        alone = all(owner == thread for owner in _tracing["threads"])
+        _tracing["threads"][thread] = _tracing["threads"].get(thread, 0) + 1
+        return alone
+
+
+def _stop_tracing():
+    thread = threading.get_ident()
+    with _tracing_lock:
+        _tracing["owners"] -= 1
+        _tracing["threads"][thread] -= 1
+        if not _tracing["threads"][thread]:
+            del _tracing["threads"][thread]
+        if _tracing["owners"] == 0 and _tracing.pop("started_here", False):
+            tracemalloc.stop()
+
+
+def write_record(record, path=STAGE_METRICS_PATH):
+    """Append one JSON line to the stage metrics log."""
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    line = json.dumps(record, default=str)
+    with _write_lock:
+        with open(path, "a") as f:
+            f.write(line + "\n")
+
+
+def _dump_profile(name, profiler):
+    """Write the raw .prof file plus a readable top-N cumulative summary."""
+    os.makedirs(PROFILE_DIR, exist_ok=True)
+    base = os.path.join(PROFILE_DIR, f"{name}-{datetime.now().strftime('%Y%m%d-%H%M%S')}")
+    profiler.dump_stats(base + ".prof")
+
+    buffer = io.StringIO()
+    pstats.Stats(profiler, stream=buffer).sort_stats("cumulative").print_stats(PROFILE_TOP_N)
+    with open(base + ".txt", "w") as f:
+        f.write(buffer.getvalue())
+    print(f"🔬 cProfile for stage '{name}' saved to: {base}.prof")
+
+
+# ============================================================================
+# STAGE CONTEXT MANAGER + DECORATOR
+# ============================================================================
+@contextmanager
+def stage(name, **metadata):
+    """
+    Time a pipeline stage and log wall time, CPU time and tracemalloc peak.
+    Stages nest: a child's peak is measured from its own start, and the
+    parent's peak still includes the child's. A stage that starts while
+    another thread has a traced stage open (e.g. evaluate_model in a thread
+    pool) logs no peak, since it cannot tell whose allocations it saw.
+    Yields a dict that the stage body can add metadata to (e.g. row counts).
+    """
+    stack = _stack()
+    trace = _trace_memory()
+    entry = {"name": name, "metadata": dict(metadata)}
+
+    entry["peak"] = None
+    if trace and _start_tracing():
+        current, peak = tracemalloc.get_traced_memory()
+        if stack and stack[-1].get("peak") is not None:
+            stack[-1]["peak"] = max(stack[-1]["peak"], peak)
+        tracemalloc.reset_peak()
+        entry["start_memory"] = current
+        entry["peak"] = current
+
+    profiler = None
+    if os.getenv(PROFILE_ENV) == name:
+        profiler = cProfile.Profile()
+        profiler.enable()
+
+    stack.append(entry)
+    started_at = datetime.now()
+    wall_start = time.perf_counter()
+    cpu_start = time.process_time()
+    status = "ok"
+
+    try:
+        yield entry["metadata"]
+    except BaseException:
+        status = "error"
+        raise
+    finally:
+        wall = time.perf_counter() - wall_start
+        cpu = time.process_time() - cpu_start
+        if profiler is not None:
+            profiler.disable()
+            _dump_profile(name, profiler)
+
+        stack.pop()
+        peak_mb = None
+        if trace and entry["peak"] is not None:
+            absolute_peak = max(entry["peak"], tracemalloc.get_traced_memory()[1])
+            peak_mb = round((absolute_peak - entry["start_memory"]) / 1024 / 1024, 3)
+            if stack and stack[-1].get("peak") is not None:
+                stack[-1]["peak"] = max(stack[-1]["peak"], absolute_peak)
+        if trace:
+            _stop_tracing()
+
+        write_record({
+            "run_id": RUN_ID,
+            "stage": name,
+            "parent": stack[-1]["name"] if stack else None,
+            "depth": len(stack),
+            "started_at": started_at.strftime("%Y-%m-%d %H:%M:%S.%f"),
+            "wall_seconds": round(wall, 4),
+            "cpu_seconds": round(cpu, 4),
+            "peak_memory_mb": peak_mb,
+            "status": status,
+            "pid": os.getpid(),
+            **entry["metadata"]
+        })
+
+
+def instrumented(name=None, **metadata):
+    """
+    Decorator form of `stage`. Row counts are added automatically when the
+    function returns something with a shape (DataFrame / array).
+    """
+    def decorator(func):
+        stage_name = name or func.__name__
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            with stage(stage_name, **metadata) as info:
+                result = func(*args, **kwargs)
+                if hasattr(result, "shape") and len(getattr(result, "shape", ())) > 0:
+                    info["rows"] = int(result.shape[0])
+                return result
+        return wrapper
+    return decorator
@@ -6,11 +6,52 @@ from sklearn.metrics import (
     classification_report,
     accuracy_score
 )
+import numpy as np
 import pandas as pd
 import os
+from concurrent.futures import ThreadPoolExecutor
 
 from src.model_training import load_all_models, MODELS_ARTIFACT_PATH
+from src.prediction_store import get_test_proba
+from src.instrumentation import stage, instrumented
 
+
+def evaluate_single_model(name, model, X_test, y_test):
+    """
+    Score one model with a single predict_proba pass and build its metrics.
+    Probabilities come from (and are written to) the prediction store.
+    """
+    with stage("evaluate_model", model=name, rows=len(X_test)):
+        proba = get_test_proba(name, model, X_test)
+        y_prob = proba[:, 1]
+        # Same labels as predict(), ties included (argmax picks the first class)
+        y_pred = model.classes_.take(np.argmax(proba, axis=1))
+
+        metrics = {
+            "Model": name,
+            "ROC_AUC": round(roc_auc_score(y_test, y_prob),4),
+            "Accuracy": round(accuracy_score(y_test, y_pred),4),
+            "Precision": round(precision_score(y_test, y_pred),4),
+            "Recall": round(recall_score(y_test, y_pred),4),
+            "F1_Score": round(f1_score(y_test, y_pred),4)
+        }
+
+        # ------------------------
+        # CLASSIFICATION REPORT TEXT
+        # ------------------------
+        report = classification_report(y_test, y_pred)
+
+    report_text = (
+        f"\n{'='*60}\n"
+        f"MODEL: {name}\n"
+        f"{'='*60}\n"
+        f"{report}\n"
+    )
+
+    return metrics, report_text
+
+
+@instrumented("evaluation")
 def evaluate_models():
     """
     Evaluate all saved models on test set and return metrics.
@@ -43,36 +84,19 @@ def evaluate_models():
     print(f"   Test set size: {X_test.shape[0]} samples")
     print(f"   Number of models: {len(models)}")
     
-    results_list = []
-    classification_reports_text = []
-
-    for name, model in models.items():
-
-        y_pred = model.predict(X_test)
-        y_prob = model.predict_proba(X_test)[:, 1]
+    print(f"\n🔄 Scoring {len(models)} models in parallel (single predict_proba pass each)...")
 
-        metrics = {
-            "Model": name,
-            "ROC_AUC": round(roc_auc_score(y_test, y_prob),4),
-            "Accuracy": round(accuracy_score(y_test, y_pred),4),
-            "Precision": round(precision_score(y_test, y_pred),4),
-            "Recall": round(recall_score(y_test, y_pred),4),
-            "F1_Score": round(f1_score(y_test, y_pred),4)
+    # Each model is scored once; labels are derived from the cached probabilities
+    with ThreadPoolExecutor(max_workers=len(models)) as executor:
+        futures = {
+            name: executor.submit(evaluate_single_model, name, model, X_test, y_test)
+            for name, model in models.items()
         }
+        outcomes = [futures[name].result() for name in models]
 
-        results_list.append(metrics)
-
-        # ------------------------
-        # CLASSIFICATION REPORT TEXT
-        # ------------------------
-        report = classification_report(y_test, y_pred)
+    results_list = [metrics for metrics, _ in outcomes]
+    classification_reports_text = [report_text for _, report_text in outcomes]
 
-        classification_reports_text.append(
-            f"\n{'='*60}\n"
-            f"MODEL: {name}\n"
-            f"{'='*60}\n"
-            f"{report}\n"
-        )
     # ==========================
     # SAVE METRICS CSV
     # ==========================
@@ -13,6 +13,7 @@ from datetime import datetime
 warnings.filterwarnings('ignore')
 
 from src.encoding_scaling import encode_and_scale
+from src.instrumentation import stage, instrumented
 
 # Path to save all models
 MODELS_ARTIFACT_PATH = "artifacts/all_trained_models.joblib"
@@ -28,14 +29,15 @@ def evaluate_with_cross_validation(name, pipeline, X, y):
     
     cv = StratifiedKFold(n_splits=5, shuffle=True, random_state=42)
     
-    scores = cross_val_score(
-        pipeline,
-        X,
-        y,
-        cv=cv,
-        scoring="roc_auc",
-        n_jobs=-1
-    )
+    with stage("cross_validation", model=name, rows=len(X)):
+        scores = cross_val_score(
+            pipeline,
+            X,
+            y,
+            cv=cv,
+            scoring="roc_auc",
+            n_jobs=-1
+        )
     
     print(f"\n📊 ROC-AUC Scores: {[round(s, 4) for s in scores]}")
     print(f"📈 Mean ROC-AUC: {scores.mean():.4f} (+/- {scores.std()*2:.4f})")
@@ -43,32 +45,11 @@ def evaluate_with_cross_validation(name, pipeline, X, y):
     return scores.mean()
 
 
-def train_and_save_all_models():
+def build_models(preprocessor, scale_pos_weight):
     """
-    Train multiple models and save ALL trained models to a single file.
-    No tuning, no selection - just training and saving.
+    All candidate pipelines with default parameters (no tuning).
     """
-    print("\n" + "="*60)
-    print("MODEL TRAINING PIPELINE - TRAINING ALL MODELS")
-    print("="*60)
-    
-    # Load and prepare data
-    print("\n📥 Loading and preparing features...")
-    X, y, preprocessor, feature_names = encode_and_scale()
-    
-    print(f"\n📊 Dataset shape: {X.shape}")
-    print(f"🎯 Target distribution:\n{y.value_counts(normalize=True).mul(100).round(2)}")
-    
-    # Calculate class weight for XGBoost
-    scale_pos_weight = y.value_counts()[0] / y.value_counts()[1]
-    print(f"\n⚖️  Scale pos weight for XGBoost: {scale_pos_weight:.2f}")
-    
-    # ============================================================================
-    # DEFINE ALL MODELS WITH DEFAULT PARAMETERS (NO TUNING)
-    # ============================================================================
-    print("\n🔧 Defining models with default parameters...")
-    
-    models = {
+    return {
         "LogisticRegression": Pipeline(steps=[
             ("preprocessor", preprocessor),
             ("model", LogisticRegression(
@@ -142,6 +123,35 @@ def train_and_save_all_models():
             ))
         ])
     }
+
+
+@instrumented("model_training")
+def train_and_save_all_models():
+    """
+    Train multiple models and save ALL trained models to a single file.
+    No tuning, no selection - just training and saving.
+    """
+    print("\n" + "="*60)
+    print("MODEL TRAINING PIPELINE - TRAINING ALL MODELS")
+    print("="*60)
+    
+    # Load and prepare data
+    print("\n📥 Loading and preparing features...")
+    X, y, preprocessor, feature_names = encode_and_scale()
+    
+    print(f"\n📊 Dataset shape: {X.shape}")
+    print(f"🎯 Target distribution:\n{y.value_counts(normalize=True).mul(100).round(2)}")
+    
+    # Calculate class weight for XGBoost
+    scale_pos_weight = y.value_counts()[0] / y.value_counts()[1]
+    print(f"\n⚖️  Scale pos weight for XGBoost: {scale_pos_weight:.2f}")
+    
+    # ============================================================================
+    # DEFINE ALL MODELS WITH DEFAULT PARAMETERS (NO TUNING)
+    # ============================================================================
+    print("\n🔧 Defining models with default parameters...")
+    
+    models = build_models(preprocessor, scale_pos_weight)
     
     # ============================================================================
     # CROSS VALIDATION (Optional - can be commented out if you just want training)
@@ -199,7 +209,8 @@ def train_and_save_all_models():
         print(f"\n🔄 Training {name}...")
         start_time = time.time()
         
-        pipeline.fit(X_train, y_train)
+        with stage("fit", model=name, rows=len(X_train)):
+            pipeline.fit(X_train, y_train)
         
         elapsed_time = time.time() - start_time
         training_times[name] = elapsed_time
@@ -245,7 +256,8 @@ def train_and_save_all_models():
     }
     
     # Save to file
-    joblib.dump(artifact, MODELS_ARTIFACT_PATH)
+    with stage("save_models", path=MODELS_ARTIFACT_PATH):
+        joblib.dump(artifact, MODELS_ARTIFACT_PATH)
     print(f"\n✅ All models saved successfully to: {MODELS_ARTIFACT_PATH}")
     print(f"   File size: {os.path.getsize(MODELS_ARTIFACT_PATH) / 1024 / 1024:.2f} MB")
     
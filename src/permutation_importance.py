@@ -0,0 +1,224 @@
+import numpy as np
+import pandas as pd
+import joblib
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+from sklearn.metrics import roc_auc_score
+
+from src.model_training import load_all_models, MODELS_ARTIFACT_PATH
+from src.prediction_store import get_test_probabilities
+
+N_REPEATS = 5
+RANDOM_STATE = 42
+OUTPUT_DIR = "logs"
+
+# Worker-side state, filled once per process by _init_worker
+_worker_state = {}
+
+
+# ============================================================================
+# SHARED-MEMORY X_TEST
+# ============================================================================
+def share_frame(X):
+    """
+    Copy X into shared memory once: numerical columns as a float64 block and
+    categorical columns as int32 codes. Returns (spec, segments).
+    The spec is small and picklable; workers rebuild X from it without copying
+    the test set through the pool's pipes.
+    """
+    num_cols = [c for c in X.columns if pd.api.types.is_numeric_dtype(X[c])]
+    cat_cols = [c for c in X.columns if c not in num_cols]
+
+    spec = {
+        "columns": list(X.columns),
+        "n_rows": len(X),
+        "num_cols": num_cols,
+        "cat_cols": cat_cols,
+        "categories": {},
+    }
+    segments = []
+
+    blocks = {"num": (X[num_cols].to_numpy(dtype=np.float64), np.float64)}
+    if cat_cols:
+        codes = np.empty((len(X), len(cat_cols)), dtype=np.int32)
+        for j, col in enumerate(cat_cols):
+            cat = pd.Categorical(X[col].astype(object))
+            codes[:, j] = cat.codes
+            spec["categories"][col] = list(cat.categories)
+        blocks["cat"] = (codes, np.int32)
+
+    for block_name, (values, dtype) in blocks.items():
+        shm = shared_memory.SharedMemory(create=True, size=max(values.nbytes, 1))
+        np.ndarray(values.shape, dtype=dtype, buffer=shm.buf)[:] = values
+        spec[f"{block_name}_shm"] = shm.name
+        spec[f"{block_name}_shape"] = values.shape
+        segments.append(shm)
+
+    return spec, segments
+
+
+def frame_from_shared(spec):
+    """Rebuild the raw-feature DataFrame from shared-memory blocks."""
+    handles = []
+    data = {}
+
+    shm = shared_memory.SharedMemory(name=spec["num_shm"])
+    handles.append(shm)
+    num = np.ndarray(spec["num_shape"], dtype=np.float64, buffer=shm.buf)
+    for j, col in enumerate(spec["num_cols"]):
+        data[col] = num[:, j].copy()
+
+    if spec["cat_cols"]:
+        shm = shared_memory.SharedMemory(name=spec["cat_shm"])
+        handles.append(shm)
+        codes = np.ndarray(spec["cat_shape"], dtype=np.int32, buffer=shm.buf)
+        for j, col in enumerate(spec["cat_cols"]):
+            # from_codes maps the missing-value code -1 back to NaN
+            categories = pd.Index(spec["categories"][col], dtype=object)
+            data[col] = pd.Categorical.from_codes(codes[:, j], categories).astype(object)
+
+    for shm in handles:
+        shm.close()
+
+    return pd.DataFrame(data)[spec["columns"]]
+
+
+# ============================================================================
+# WORKERS
+# ============================================================================
+def _init_worker(spec, y_test, baseline_auc):
+    """Load every model and the shared test set once per worker process."""
+    models = joblib.load(MODELS_ARTIFACT_PATH)["models"]
+
+    # The pool already uses every core; keep each model single-threaded
+    for model in models.values():
+        estimator = model.named_steps.get("model") if hasattr(model, "named_steps") else model
+        if estimator is not None and "n_jobs" in estimator.get_params():
+            estimator.set_params(n_jobs=1)
+
+    _worker_state["models"] = models
+    _worker_state["X"] = frame_from_shared(spec)
+    _worker_state["y"] = np.asarray(y_test)
+    _worker_state["baseline_auc"] = baseline_auc
+
+
+def _permutation_job(model_name, feature, repeat):
+    """Shuffle one raw feature and return the ROC-AUC drop for one model."""
+    X = _worker_state["X"]
+    y = _worker_state["y"]
+    model = _worker_state["models"][model_name]
+
+    rng = np.random.default_rng([RANDOM_STATE, repeat])
+    X_perm = X.assign(**{feature: X[feature].to_numpy()[rng.permutation(len(X))]})
+
+    y_prob = model.predict_proba(X_perm)[:, 1]
+    drop = _worker_state["baseline_auc"][model_name] - roc_auc_score(y, y_prob)
+    return model_name, feature, repeat, drop
+
+
+# ============================================================================
+# ENGINE
+# ============================================================================
+def summarize_importance(drops):
+    """Turn raw per-repeat AUC drops into a ranked importance table."""
+    df = pd.DataFrame(drops, columns=["feature", "repeat", "auc_drop"])
+    importance = (
+        df.groupby("feature")["auc_drop"]
+          .agg(importance_mean="mean", importance_std="std")
+          .fillna(0)
+          .sort_values("importance_mean", ascending=False)
+          .reset_index()
+    )
+    total = importance["importance_mean"].clip(lower=0).sum()
+    importance["importance_pct"] = (
+        importance["importance_mean"].clip(lower=0) / total * 100 if total > 0 else 0.0
+    )
+    importance["importance_pct"] = importance["importance_pct"].round(2)
+    importance["rank"] = range(1, len(importance) + 1)
+    return importance
+
+
+def permutation_feature_importance(model_names=None, n_repeats=N_REPEATS, max_workers=None):
+    """
+    Permutation importance on raw (pre-encoding) features for every trained model.
+    Each permuted raw column moves its whole one-hot group, so contract_type and
+    payment_method are ranked as single features for every model type.
+    """
+    print("\n" + "="*60)
+    print("PERMUTATION FEATURE IMPORTANCE - ALL MODELS")
+    print("="*60)
+
+    artifact = load_all_models()
+    if artifact is None:
+        return None
+
+    models = artifact["models"]
+    X_test = artifact["X_test"]
+    y_test = artifact["y_test"]
+    model_names = list(model_names or models.keys())
+    features = list(X_test.columns)
+
+    # Baselines come from the prediction store written by evaluate_models
+    baseline_auc = {
+        name: roc_auc_score(y_test, get_test_probabilities(name, models[name], X_test))
+        for name in model_names
+    }
+
+    jobs = [
+        (name, feature, repeat)
+        for name in model_names
+        for feature in features
+        for repeat in range(n_repeats)
+    ]
+    max_workers = max_workers or os.cpu_count()
+
+    print(f"\n📊 Models: {model_names}")
+    print(f"🔢 Raw features: {len(features)} | Repeats: {n_repeats} | Jobs: {len(jobs)}")
+    print(f"⚙️  Workers: {max_workers}")
+
+    start_time = time.time()
+    spec, segments = share_frame(X_test)
+    drops = {name: [] for name in model_names}
+
+    try:
+        with ProcessPoolExecutor(
+            max_workers=max_workers,
+            initializer=_init_worker,
+            initargs=(spec, np.asarray(y_test), baseline_auc)
+        ) as executor:
+            chunksize = max(1, len(jobs) // (max_workers * 4))
+            for name, feature, repeat, drop in executor.map(
+                _permutation_job, *zip(*jobs), chunksize=chunksize
+            ):
+                drops[name].append((feature, repeat, drop))
+    finally:
+        for shm in segments:
+            shm.close()
+            shm.unlink()
+
+    print(f"\n⏱️  Permutation jobs finished in {time.time() - start_time:.2f} seconds")
+
+    os.makedirs(OUTPUT_DIR, exist_ok=True)
+    results = {}
+    for name in model_names:
+        importance = summarize_importance(drops[name])
+        importance.insert(0, "model", name)
+        importance["baseline_roc_auc"] = round(baseline_auc[name], 4)
+
+        output_path = os.path.join(OUTPUT_DIR, f"permutation_importance_{name}.csv")
+        importance.to_csv(output_path, index=False)
+        results[name] = importance
+
+        print(f"\n🏆 {name} (baseline ROC-AUC {baseline_auc[name]:.4f}) - top 5:")
+        print(importance.head(5)[["rank", "feature", "importance_mean", "importance_std"]].to_string(index=False))
+        print(f"   ✅ Saved to: {output_path}")
+
+    return results
+
+
+if __name__ == "__main__":
+    results = permutation_feature_importance()
+    if results is not None:
+        print("\n✅ Permutation importance completed for all models!")
@@ -0,0 +1,60 @@
+import os
+import joblib
+import numpy as np
+
+# Directory holding cached test-set scores, one .npy file per (model, X_test)
+PREDICTION_STORE_DIR = "artifacts/predictions"
+
+
+def prediction_key(name, model, X):
+    """
+    Build the cache key for a model's scores on a dataset.
+    The key changes whenever the fitted model or the input data changes.
+    """
+    model_hash = joblib.hash(model)
+    data_hash = joblib.hash(X)
+    return f"{name}_{model_hash[:16]}_{data_hash[:8]}"
+
+
+def load_predictions(key, n_rows=None):
+    """
+    Load cached predict_proba output (one column per class) for a key.
+    Returns None when nothing is cached or the cached array has the wrong shape.
+    """
+    path = os.path.join(PREDICTION_STORE_DIR, f"{key}.npy")
+    if not os.path.exists(path):
+        return None
+
+    proba = np.load(path)
+    # Files from before the full matrix was cached hold only P(churn=1)
+    if proba.ndim != 2 or (n_rows is not None and len(proba) != n_rows):
+        return None
+    return proba
+
+
+def save_predictions(key, proba):
+    """Persist predict_proba output for a key."""
+    os.makedirs(PREDICTION_STORE_DIR, exist_ok=True)
+    path = os.path.join(PREDICTION_STORE_DIR, f"{key}.npy")
+    np.save(path, np.asarray(proba, dtype=np.float64))
+    return path
+
+
+def get_test_proba(name, model, X_test):
+    """
+    Return predict_proba(X_test), running the model only on a cache miss.
+    Evaluation, threshold tuning and feature importance share these scores.
+    """
+    key = prediction_key(name, model, X_test)
+    proba = load_predictions(key, n_rows=len(X_test))
+
+    if proba is None:
+        proba = model.predict_proba(X_test)
+        save_predictions(key, proba)
+
+    return proba
+
+
+def get_test_probabilities(name, model, X_test):
+    """Return P(churn=1) for X_test from the cached predict_proba output."""
+    return get_test_proba(name, model, X_test)[:, 1]
@@ -0,0 +1,239 @@
+import numpy as np
+import pandas as pd
+import json
+import os
+from datetime import datetime
+
+TARGET = "churn"
+ID_COLUMNS = ["customer_id"]
+
+# Columns switch from an exact distinct set to HyperLogLog above this many values
+EXACT_DISTINCT_LIMIT = 10_000
+HLL_PRECISION = 14  # 2^14 registers -> ~0.8% standard error
+
+CHUNK_SIZE = 100_000
+
+
+# ============================================================================
+# HYPERLOGLOG
+# ============================================================================
+class HyperLogLog:
+    """Vectorized HyperLogLog distinct counter over 64-bit pandas hashes."""
+
+    def __init__(self, precision=HLL_PRECISION):
+        self.precision = precision
+        self.m = 1 << precision
+        self.registers = np.zeros(self.m, dtype=np.uint8)
+
+    def add(self, values):
+        hashes = pd.util.hash_array(np.asarray(values, dtype=object))
+        index = (hashes >> np.uint64(64 - self.precision)).astype(np.intp)
+        remainder = hashes & np.uint64((1 << (64 - self.precision)) - 1)
+
+        # Rank = leading zeros in the remaining bits + 1. The remainder has at most
+        # 50 bits, so float64 holds it exactly and frexp's exponent is its bit length.
+        _, bit_length = np.frexp(remainder.astype(np.float64))
+        rank = (64 - self.precision - bit_length + 1).astype(np.uint8)
+
+        np.maximum.at(self.registers, index, rank)
+
+    def merge(self, other):
+        np.maximum(self.registers, other.registers, out=self.registers)
+
+    def count(self):
+        alpha = 0.7213 / (1 + 1.079 / self.m)
+        estimate = alpha * self.m ** 2 / np.sum(np.ldexp(1.0, -self.registers.astype(np.int64)))
+
+        # Small-range correction (linear counting)
+        zeros = int(np.count_nonzero(self.registers == 0))
+        if estimate <= 2.5 * self.m and zeros > 0:
+            estimate = self.m * np.log(self.m / zeros)
+        return int(round(estimate))
+
+
+class DistinctCounter:
+    """Exact distinct set that degrades to HyperLogLog past EXACT_DISTINCT_LIMIT."""
+
+    def __init__(self, limit=EXACT_DISTINCT_LIMIT):
+        self.limit = limit
+        self.values = set()
+        self.hll = None
+
+    def _promote(self):
+        self.hll = HyperLogLog()
+        if self.values:
+            self.hll.add(list(self.values))
+        self.values = set()
+
+    def add(self, series):
+        values = series.dropna().unique()
+        if self.hll is not None:
+            self.hll.add(values)
+            return
+
+        self.values.update(values.tolist())
+        if len(self.values) > self.limit:
+            self._promote()
+
+    def merge(self, other):
+        if self.hll is None and other.hll is None:
+            self.values |= other.values
+            if len(self.values) > self.limit:
+                self._promote()
+            return
+
+        if self.hll is None:
+            self._promote()
+        if other.hll is not None:
+            self.hll.merge(other.hll)
+        elif other.values:
+            self.hll.add(list(other.values))
+
+    def result(self):
+        if self.hll is not None:
+            return {"distinct": self.hll.count(), "method": "hyperloglog"}
+        return {"distinct": len(self.values), "method": "exact"}
+
+
+# ============================================================================
+# SINGLE-PASS PROFILE
+# ============================================================================
+class ChurnProfile:
+    """
+    Mergeable partial aggregates for one pass over the data: row and churn
+    counts, per-churn-class sums/counts of numeric columns, per-category churn
+    counts, missing counts and distinct counts.
+    """
+
+    def __init__(self):
+        self.rows = 0
+        self.class_counts = {}
+        self.numeric = {}      # col -> {class: [sum, count]}
+        self.categories = {}   # col -> {value: [rows, churners]}
+        self.missing = {}
+        self.distinct = {}
+
+    def update(self, chunk):
+        self.rows += len(chunk)
+
+        for col, n_missing in chunk.isna().sum().items():
+            self.missing[col] = self.missing.get(col, 0) + int(n_missing)
+
+        for col in chunk.columns:
+            self.distinct.setdefault(col, DistinctCounter()).add(chunk[col])
+
+        if TARGET not in chunk.columns:
+            return
+
+        target = pd.to_numeric(chunk[TARGET], errors="coerce")
+        labelled = target.notna().to_numpy()
+        target_values = target.to_numpy()[labelled].astype(np.int64)
+        for cls, count in zip(*np.unique(target_values, return_counts=True)):
+            self.class_counts[int(cls)] = self.class_counts.get(int(cls), 0) + int(count)
+
+        # One grouped reduction covers every numeric column at once
+        numeric_cols = [
+            c for c in chunk.columns
+            if c not in ID_COLUMNS + [TARGET] and pd.api.types.is_numeric_dtype(chunk[c])
+        ]
+        if numeric_cols:
+            values = chunk.loc[labelled, numeric_cols].astype(np.float64)
+            grouped = values.groupby(target_values).agg(["sum", "count"])
+            for col in numeric_cols:
+                stats = self.numeric.setdefault(col, {})
+                for cls in grouped.index:
+                    acc = stats.setdefault(int(cls), [0.0, 0])
+                    acc[0] += float(grouped.loc[cls, (col, "sum")])
+                    acc[1] += int(grouped.loc[cls, (col, "count")])
+
+        # Category churn counts via factorize + bincount (no per-column groupby)
+        categorical_cols = [
+            c for c in chunk.columns
+            if c not in ID_COLUMNS + [TARGET] and not pd.api.types.is_numeric_dtype(chunk[c])
+        ]
+        for col in categorical_cols:
+            codes, uniques = pd.factorize(chunk.loc[labelled, col].astype(object), use_na_sentinel=True)
+            valid = codes >= 0
+            rows = np.bincount(codes[valid], minlength=len(uniques))
+            churners = np.bincount(codes[valid], weights=target_values[valid], minlength=len(uniques))
+            counts = self.categories.setdefault(col, {})
+            for value, n, c in zip(uniques, rows, churners):
+                acc = counts.setdefault(str(value), [0, 0])
+                acc[0] += int(n)
+                acc[1] += int(c)
+
+    def merge(self, other):
+        self.rows += other.rows
+        for cls, count in other.class_counts.items():
+            self.class_counts[cls] = self.class_counts.get(cls, 0) + count
+        for col, n in other.missing.items():
+            self.missing[col] = self.missing.get(col, 0) + n
+        for col, counter in other.distinct.items():
+            if col in self.distinct:
+                self.distinct[col].merge(counter)
+            else:
+                self.distinct[col] = counter
+        for col, stats in other.numeric.items():
+            mine = self.numeric.setdefault(col, {})
+            for cls, (total, count) in stats.items():
+                acc = mine.setdefault(cls, [0.0, 0])
+                acc[0] += total
+                acc[1] += count
+        for col, counts in other.categories.items():
+            mine = self.categories.setdefault(col, {})
+            for value, (n, c) in counts.items():
+                acc = mine.setdefault(value, [0, 0])
+                acc[0] += n
+                acc[1] += c
+        return self
+
+    def report(self):
+        labelled = sum(self.class_counts.values())
+        return {
+            "generated_at": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+            "rows": self.rows,
+            "columns": len(self.missing),
+            "churn_distribution": {
+                str(cls): round(count / labelled, 5) for cls, count in sorted(self.class_counts.items())
+            } if labelled else {},
+            "missing_values": dict(sorted(self.missing.items(), key=lambda kv: -kv[1])),
+            "cardinality": {col: counter.result() for col, counter in self.distinct.items()},
+            "mean_by_churn": {
+                col: {
+                    str(cls): round(total / count, 4) if count else None
+                    for cls, (total, count) in sorted(stats.items())
+                }
+                for col, stats in self.numeric.items()
+            },
+            "churn_rate_by_category": {
+                col: {
+                    value: {"rows": n, "churn_rate": round(c / n, 4) if n else None}
+                    for value, (n, c) in sorted(counts.items(), key=lambda kv: -(kv[1][1] / kv[1][0] if kv[1][0] else 0))
+                }
+                for col, counts in self.categories.items()
+            }
+        }
+
+
+def profile_chunks(chunks):
+    """
+    Profile an iterable of DataFrame chunks in one pass.
+    Partial profiles built elsewhere (e.g. per worker) combine with ChurnProfile.merge.
+    """
+    profile = ChurnProfile()
+    for chunk in chunks:
+        profile.update(chunk)
+    return profile.report()
+
+
+def profile_frame(df, chunksize=CHUNK_SIZE):
+    """Profile an in-memory DataFrame in chunks."""
+    return profile_chunks(df.iloc[i:i + chunksize] for i in range(0, len(df), chunksize))
+
+
+def write_report(report, path):
+    """Write a profile report as JSON."""
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, "w") as f:
+        json.dump(report, f, indent=2)
+    return path
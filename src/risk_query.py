@@ -0,0 +1,258 @@
+import os
+import threading
+
+import numpy as np
+import pandas as pd
+import pyarrow.dataset as ds
+
+from src.create_dashboard_dataset import DASHBOARD_COLUMNS
+from src.dashboard_builder import OUTPUT_DIR as DASHBOARD_DIR, list_partitions, read_partition
+from src.feature_engineering import TENURE_BINS, TENURE_LABELS
+
+DASHBOARD_CSV = "dashboard/churn_dashboard_dataset.csv"
+CHUNK_SIZE = 100_000
+
+# Columns with a bitmap per value; filter values match case-insensitively
+INDEXED_COLUMNS = ["contract_type", "payment_method", "risk_segment", "tenure_bucket"]
+RESULT_COLUMNS = DASHBOARD_COLUMNS + ["tenure_bucket"]
+
+# Rebuild once the delta buffer exceeds this fraction of the indexed base
+COMPACT_FRACTION = 0.05
+# 64-bit words unpacked per step while scanning a filter mask for top-K
+SCAN_WORDS = 4096
+
+
+def _pack(flags):
+    """Bool array -> bitmap of little-endian uint64 words (bit i = row i)."""
+    packed = np.packbits(flags, bitorder="little")
+    padded = np.zeros(-(-len(flags) // 64) * 8, dtype=np.uint8)
+    padded[:len(packed)] = packed
+    return padded.view("<u8")
+
+
+def _keys(values):
+    return values.astype(object).where(values.notna(), "").astype(str).str.strip().str.lower()
+
+
+def prepare_scored(scored):
+    """Dashboard-scored rows with tenure_bucket added, in RESULT_COLUMNS order."""
+    df = scored[[col for col in DASHBOARD_COLUMNS if col in scored.columns]].copy()
+    df["customer_id"] = df["customer_id"].astype(str)
+    df["churn_probability"] = df["churn_probability"].astype(np.float64)
+    df["risk_segment"] = df["risk_segment"].astype(object)
+    df["tenure_bucket"] = pd.cut(df["tenure_months"], bins=TENURE_BINS, labels=TENURE_LABELS).astype(object)
+    return df.reindex(columns=RESULT_COLUMNS)
+
+
+def _score_order(df):
+    return df.sort_values(["churn_probability", "customer_id"], ascending=[False, True], ignore_index=True)
+
+
+class RiskIndex:
+    """
+    Filtered top-K / count queries over the scored customer base. The base is
+    held in descending score order with one bitmap per value of each indexed
+    column, so a filter is a few word-wise AND/ORs and top-K is the first K
+    set bits. Re-scored customers go to a small delta buffer and their base
+    row is tombstoned in the `live` bitmap; the delta is folded back into the
+    base once it grows past COMPACT_FRACTION. Thread-safe.
+    """
+
+    def __init__(self, scored, compact_fraction=COMPACT_FRACTION):
+        self._lock = threading.RLock()
+        self.compact_fraction = compact_fraction
+        self._build(prepare_scored(scored))
+
+    def _build(self, base):
+        base = _score_order(base.drop_duplicates("customer_id", keep="last"))
+        self.base = base
+        self.position = pd.Index(base["customer_id"])
+        self.live = _pack(np.ones(len(base), dtype=bool))
+        self.bitmaps = {}
+        for col in INDEXED_COLUMNS:
+            codes, values = pd.factorize(_keys(base[col]))
+            self.bitmaps[col] = {value: _pack(codes == code) for code, value in enumerate(values)}
+        self._set_delta(base.iloc[:0])
+        self.tombstones = 0
+
+    def _set_delta(self, delta):
+        """Keep the delta in score order with its lowercase filter keys alongside."""
+        self.delta = _score_order(delta)
+        self._delta_keys = {col: _keys(self.delta[col]).to_numpy() for col in INDEXED_COLUMNS}
+
+    # ------------------------------------------------------------------
+    # Updates
+    # ------------------------------------------------------------------
+    def _tombstone(self, customer_ids):
+        positions = self.position.get_indexer(customer_ids)
+        positions = np.unique(positions[positions >= 0])
+        bits = np.left_shift(np.uint64(1), (positions & 63).astype(np.uint64))
+        # Only rows still live count; a second upsert/remove of a row is not a new tombstone
+        alive = (self.live[positions >> 6] & bits) != 0
+        if alive.any():
+            np.bitwise_and.at(self.live, positions[alive] >> 6, ~bits[alive])
+            self.tombstones += int(alive.sum())
+
+    def upsert(self, scored):
+        """Add or replace customers with newly scored rows (dashboard columns)."""
+        with self._lock:
+            rows = prepare_scored(scored).drop_duplicates("customer_id", keep="last")
+            self._tombstone(rows["customer_id"])
+            kept = self.delta[~self.delta["customer_id"].isin(rows["customer_id"])]
+            self._set_delta(pd.concat([kept, rows], ignore_index=True))
+            if len(self.delta) > self.compact_fraction * max(len(self.base), 1):
+                self.compact()
+
+    def remove(self, customer_ids):
+        """Drop customers (e.g. churned or deleted accounts) from query results."""
+        with self._lock:
+            customer_ids = pd.Index(customer_ids).astype(str)
+            self._tombstone(customer_ids)
+            self._set_delta(self.delta[~self.delta["customer_id"].isin(customer_ids)])
+
+    def compact(self):
+        """Rebuild the base from its live rows plus the delta buffer."""
+        with self._lock:
+            live_rows = self._live_positions(self.live)
+            self._build(pd.concat([self.base.iloc[live_rows], self.delta], ignore_index=True))
+
+    # ------------------------------------------------------------------
+    # Queries
+    # ------------------------------------------------------------------
+    @staticmethod
+    def _normalize(filters):
+        normalized = {}
+        for col, values in (filters or {}).items():
+            if values is None:
+                continue
+            if col not in INDEXED_COLUMNS:
+                raise ValueError(f"Cannot filter on {col!r}; indexed columns: {INDEXED_COLUMNS}")
+            values = [values] if isinstance(values, str) else list(values)
+            if values:
+                normalized[col] = {str(value).strip().lower() for value in values}
+        return normalized
+
+    def _mask(self, filters):
+        mask = self.live.copy()
+        for col, values in filters.items():
+            union = np.zeros_like(mask)
+            for value in values:
+                bitmap = self.bitmaps[col].get(value)
+                if bitmap is not None:
+                    union |= bitmap
+            mask &= union
+        return mask
+
+    def _delta_matches(self, filters, limit=None):
+        """Matching delta rows in score order, stopping after `limit`."""
+        if self.delta.empty or not filters:
+            return self.delta.iloc[:limit]
+        mask = np.ones(len(self.delta), dtype=bool)
+        for col, values in filters.items():
+            mask &= np.isin(self._delta_keys[col], list(values))
+        return self.delta.iloc[np.flatnonzero(mask)[:limit]]
+
+    @staticmethod
+    def _live_positions(mask, limit=None):
+        """Row positions of the set bits in score order, stopping after `limit`."""
+        found = []
+        n_found = 0
+        for start in range(0, len(mask), SCAN_WORDS):
+            block = mask[start:start + SCAN_WORDS]
+            if not block.any():
+                continue
+            hits = np.flatnonzero(np.unpackbits(block.view(np.uint8), bitorder="little")) + start * 64
+            if limit is not None:
+                hits = hits[:limit - n_found]
+            found.append(hits)
+            n_found += len(hits)
+            if limit is not None and n_found >= limit:
+                break
+        return np.concatenate(found) if found else np.empty(0, dtype=np.int64)
+
+    def top_k(self, k=100, filters=None):
+        """
+        The k highest-probability customers matching `filters`, e.g.
+        {"contract_type": "month-to-month", "payment_method": ["electronic check"]}.
+        Values within a column are ORed, columns are ANDed.
+        """
+        filters = self._normalize(filters)
+        with self._lock:
+            rows = self.base.iloc[self._live_positions(self._mask(filters), limit=k)]
+            delta = self._delta_matches(filters, limit=k)
+        if len(delta):
+            rows = _score_order(pd.concat([rows, delta], ignore_index=True))
+        return rows.head(k).reset_index(drop=True)
+
+    def count(self, filters=None):
+        """Number of customers matching `filters`."""
+        filters = self._normalize(filters)
+        with self._lock:
+            return int(np.bitwise_count(self._mask(filters)).sum()) + len(self._delta_matches(filters))
+
+    def stats(self):
+        with self._lock:
+            return {
+                "customers": int(np.bitwise_count(self.live).sum()) + len(self.delta),
+                "base_rows": len(self.base),
+                "delta_rows": len(self.delta),
+                "tombstones": self.tombstones,
+                "bitmaps": sum(len(values) for values in self.bitmaps.values()),
+                "memory_mb": round(
+                    (self.live.nbytes + sum(b.nbytes for v in self.bitmaps.values() for b in v.values())) / 1024 / 1024,
+                    3
+                )
+            }
+
+
+def iter_scored_base(source=None, chunksize=CHUNK_SIZE):
+    """
+    Stream the scored customer base: the partitioned dashboard dataset when
+    it has been built, else the dashboard CSV. `source` may also be any CSV
+    or Parquet path with the dashboard columns (e.g. artifacts/batch_scores).
+    """
+    if source is None:
+        source = DASHBOARD_DIR if list_partitions(DASHBOARD_DIR) else DASHBOARD_CSV
+
+    if source.endswith(".csv"):
+        yield from pd.read_csv(source, chunksize=chunksize)
+    elif os.path.isdir(source) and list_partitions(source):
+        for key in list_partitions(source):
+            yield read_partition(source, key)
+    else:
+        parquet = ds.dataset(source, format="parquet", exclude_invalid_files=True)
+        for batch in parquet.to_batches(batch_size=chunksize):
+            yield batch.to_pandas()
+
+
+def load_scored_base(source=None):
+    """The whole scored base as one DataFrame (see iter_scored_base)."""
+    return pd.concat(list(iter_scored_base(source)), ignore_index=True)
+
+
+def load_risk_index(source=None):
+    return RiskIndex(load_scored_base(source))
+
+
+if __name__ == "__main__":
+    import argparse
+    import time
+
+    parser = argparse.ArgumentParser(description="Top-K / count query over the scored customer base")
+    parser.add_argument("--source", default=None, help="Scored base (default: dashboard dataset)")
+    parser.add_argument("--k", type=int, default=20)
+    for col in INDEXED_COLUMNS:
+        parser.add_argument(f"--{col.replace('_', '-')}", dest=col, nargs="+", default=None)
+    args = parser.parse_args()
+
+    index = load_risk_index(args.source)
+    filters = {col: getattr(args, col) for col in INDEXED_COLUMNS}
+
+    start = time.perf_counter()
+    top = index.top_k(args.k, filters)
+    total = index.count(filters)
+    elapsed_ms = (time.perf_counter() - start) * 1000
+
+    print(top.to_string(index=False))
+    print(f"\n📊 {total} matching customers | query time {elapsed_ms:.2f} ms")
+    print(f"   {index.stats()}")
@@ -3,6 +3,7 @@ from datetime import datetime
 import os
 
 from src.model_training import load_all_models, MODELS_ARTIFACT_PATH
+from src.instrumentation import stage
 
 
 MODEL_PATH = "artifacts/churn_model_v1.joblib"
@@ -62,7 +63,8 @@ def save_logistic_regression_model():
     }
     
     # Save model
-    joblib.dump(model_artifact, MODEL_PATH)
+    with stage("save_model", path=MODEL_PATH):
+        joblib.dump(model_artifact, MODEL_PATH)
     
     # Print success message
     print("\n" + "="*60)
@@ -0,0 +1,287 @@
+import glob
+import hashlib
+import json
+import os
+import time
+from datetime import datetime
+
+import joblib
+import numpy as np
+import pandas as pd
+
+from src.create_dashboard_dataset import (
+    ACTION_CATEGORIES, MODEL_PATH, RISK_BINS, RISK_LABELS, THRESHOLD, score_dashboard_frame
+)
+
+SCORE_TABLE_PATH = os.getenv(
+    "SCORE_TABLE_PATH",
+    os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "artifacts", "score_table.bin")
+)
+
+# Dashboard columns kept in the table
+SCORED_COLUMNS = ["customer_id", "churn_probability", "churn_flag", "risk_segment", "action_category"]
+
+MAGIC = b"CHURNST1"
+ALIGNMENT = 64
+
+# Seconds between checks for a rebuilt table file
+RELOAD_CHECK_S = 5.0
+
+
+def _align(offset):
+    return -(-offset // ALIGNMENT) * ALIGNMENT
+
+
+def model_version(model_path):
+    """'<artifact name>@<content hash>', the same form the model registry reports."""
+    digest = hashlib.sha256()
+    with open(model_path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            digest.update(block)
+    return f"{os.path.splitext(os.path.basename(model_path))[0]}@{digest.hexdigest()[:10]}"
+
+
+def classify(probability):
+    """(churn_flag, risk_segment, action_category) exactly as score_dashboard_frame assigns them."""
+    code = int(np.searchsorted(RISK_BINS, probability, side="left")) - 1
+    segment = RISK_LABELS[code] if 0 <= code < len(RISK_LABELS) else None
+    return int(probability >= THRESHOLD), segment, ACTION_CATEGORIES.get(segment)
+
+
+# ============================================================================
+# WRITE
+# ============================================================================
+def write_score_table(scored, path=SCORE_TABLE_PATH, metadata=None):
+    """
+    Write dashboard-scored rows (customer_id, churn_probability, churn_flag,
+    risk_segment, action_category) as a fixed-width binary table sorted by
+    customer_id. Layout: magic, header length, JSON header, then one aligned
+    block per column. Replaced atomically so running readers keep the old file.
+    """
+    ids = scored["customer_id"].astype(str).to_numpy()
+    id_width = max(1, max((len(i) for i in ids), default=1))
+    ids = ids.astype(f"S{id_width}")
+
+    order = np.argsort(ids, kind="stable")
+    ids = ids[order]
+    if len(ids) > 1 and (ids[1:] == ids[:-1]).any():
+        raise ValueError("customer_id must be unique in the score table")
+
+    action_labels = [ACTION_CATEGORIES[label] for label in RISK_LABELS]
+    risk_codes = {label: code for code, label in enumerate(RISK_LABELS)}
+    action_codes = {label: code for code, label in enumerate(action_labels)}
+    # One fixed-width block per column; codes index the header label lists (-1 = none)
+    columns = {
+        "customer_id": ids,
+        "churn_probability": scored["churn_probability"].to_numpy(dtype=np.float32)[order],
+        "churn_flag": scored["churn_flag"].to_numpy(dtype=np.uint8)[order],
+        "risk_code": scored["risk_segment"].astype(object).map(risk_codes)
+                                           .fillna(-1).to_numpy(dtype=np.int8)[order],
+        "action_code": scored["action_category"].astype(object).map(action_codes)
+                                                .fillna(-1).to_numpy(dtype=np.int8)[order]
+    }
+
+    header = {
+        "n_rows": int(len(ids)),
+        "risk_labels": RISK_LABELS,
+        "action_labels": action_labels,
+        "threshold": THRESHOLD,
+        "created_at": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+        **(metadata or {}),
+        "columns": {}
+    }
+    # Offsets depend on the header length, so lay out against a padded header size
+    header_size = _align(len(MAGIC) + 4 + len(json.dumps(header)) + 256 * len(columns))
+    offset = header_size
+    for name, values in columns.items():
+        header["columns"][name] = {"dtype": values.dtype.str, "offset": offset}
+        offset = _align(offset + values.nbytes)
+
+    header_bytes = json.dumps(header).encode()
+    if len(MAGIC) + 4 + len(header_bytes) > header_size:
+        raise ValueError("Score table header does not fit its reserved size")
+
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    tmp_path = path + ".tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(MAGIC)
+        f.write(np.uint32(len(header_bytes)).tobytes())
+        f.write(header_bytes)
+        for name, values in columns.items():
+            f.seek(header["columns"][name]["offset"])
+            f.write(np.ascontiguousarray(values).tobytes())
+        f.truncate(offset)
+    os.replace(tmp_path, path)
+    return path
+
+
+def precompute_score_table(source="sql", output_path=SCORE_TABLE_PATH, model_path=MODEL_PATH,
+                           batch_scores=None, chunksize=100_000):
+    """
+    Score every customer as create_dashboard_dataset does and write the
+    table. `source` is "sql" or a Parquet path/directory of the training
+    view (e.g. the incremental snapshot); `batch_scores` reuses the shards
+    of a finished batch_scoring run instead of scoring again.
+    """
+    # The batch scoring stack is only needed here, not by the API reading the table
+    from src.batch_scoring import iter_source_chunks, resolve_cap_bounds
+    from src.data_cleaning import clean_data
+    from src.feature_engineering import engineer_features
+
+    print("\n" + "="*60)
+    print("SCORE TABLE PRECOMPUTE")
+    print("="*60)
+    start_time = time.time()
+
+    if batch_scores:
+        print(f"\n📂 Reading batch scores from: {batch_scores}")
+        shards = sorted(glob.glob(os.path.join(batch_scores, "shard-*.parquet")))
+        scored = pd.concat([
+            pd.read_parquet(shard, columns=SCORED_COLUMNS) for shard in shards
+        ], ignore_index=True)
+        metadata = {"source": batch_scores}
+        manifest_path = os.path.join(batch_scores, "manifest.json")
+        if os.path.exists(manifest_path):
+            with open(manifest_path) as f:
+                batch_model = json.load(f)["config"]["model_path"]
+            if os.path.exists(batch_model):
+                metadata["model_version"] = model_version(batch_model)
+    else:
+        cap_bounds = {col: tuple(b) for col, b in resolve_cap_bounds(source).items()}
+        model = joblib.load(model_path)["model"]
+
+        parts = []
+        for chunk in iter_source_chunks(source, chunksize):
+            scored_chunk = score_dashboard_frame(engineer_features(clean_data(chunk, cap_bounds=cap_bounds)), model)
+            parts.append(scored_chunk[SCORED_COLUMNS])
+            print(f"   Scored {sum(len(p) for p in parts):,} customers")
+        scored = pd.concat(parts, ignore_index=True)
+        metadata = {"source": source, "model_path": model_path, "model_version": model_version(model_path)}
+
+    write_score_table(scored, output_path, metadata)
+    size_mb = os.path.getsize(output_path) / 1024 / 1024
+    print(f"\n✅ Score table with {len(scored):,} customers ({size_mb:.1f} MB) saved to: {output_path}")
+    print(f"⏱️  Total time: {time.time() - start_time:.2f}s")
+    return output_path
+
+
+# ============================================================================
+# READ
+# ============================================================================
+class ScoreTable:
+    """
+    Read-only view of a score table file. The file is memory-mapped once and
+    every column is a zero-copy slice of the mapping, so processes serving the
+    same file share one page-cache copy. Lookups binary-search the sorted,
+    contiguous customer_id block (O(log n) touched pages, no per-process index).
+    """
+
+    def __init__(self, path=SCORE_TABLE_PATH):
+        self.path = path
+        self._open()
+
+    def _open(self):
+        buffer = np.memmap(self.path, dtype=np.uint8, mode="r")
+        if bytes(buffer[:len(MAGIC)]) != MAGIC:
+            raise ValueError(f"{self.path} is not a score table")
+        header_len = int(buffer[len(MAGIC):len(MAGIC) + 4].view("<u4")[0])
+        start = len(MAGIC) + 4
+        header = json.loads(bytes(buffer[start:start + header_len]))
+
+        n_rows = header["n_rows"]
+        columns = {}
+        for name, spec in header["columns"].items():
+            dtype = np.dtype(spec["dtype"])
+            offset = spec["offset"]
+            columns[name] = buffer[offset:offset + n_rows * dtype.itemsize].view(dtype)
+
+        # Published in one assignment: concurrent readers see either the old
+        # table or the new one, never a header from one and columns from the other
+        self._state = (header, columns, buffer, os.stat(self.path))
+        self._next_check = time.monotonic() + RELOAD_CHECK_S
+
+    @property
+    def header(self):
+        return self._state[0]
+
+    @property
+    def columns(self):
+        return self._state[1]
+
+    def maybe_reload(self):
+        """Re-map the file if the precompute step replaced it since it was opened."""
+        now = time.monotonic()
+        if now < self._next_check:
+            return False
+        self._next_check = now + RELOAD_CHECK_S
+        try:
+            stat = os.stat(self.path)
+        except FileNotFoundError:
+            return False
+        current = self._state[3]
+        if (stat.st_ino, stat.st_mtime_ns) == (current.st_ino, current.st_mtime_ns):
+            return False
+        self._open()
+        return True
+
+    def __len__(self):
+        return self.header["n_rows"]
+
+    def lookup(self, customer_id):
+        """The precomputed score for one customer as a dict, or None on a miss."""
+        header, columns, _, _ = self._state
+        ids = columns["customer_id"]
+        try:
+            key = customer_id.encode("ascii")
+        except UnicodeEncodeError:
+            return None
+        if not key or len(key) > ids.dtype.itemsize:
+            return None
+
+        row = int(np.searchsorted(ids, key))
+        if row >= len(ids) or ids[row] != key:
+            return None
+
+        risk_code = int(columns["risk_code"][row])
+        action_code = int(columns["action_code"][row])
+        return {
+            "customer_id": customer_id,
+            "churn_probability": float(columns["churn_probability"][row]),
+            "churn_flag": int(columns["churn_flag"][row]),
+            "risk_segment": header["risk_labels"][risk_code] if risk_code >= 0 else None,
+            "action_category": header["action_labels"][action_code] if action_code >= 0 else None,
+            "model_version": header.get("model_version")
+        }
+
+    def stats(self):
+        header, _, buffer, _ = self._state
+        return {
+            "path": self.path,
+            "customers": header["n_rows"],
+            "size_mb": round(len(buffer) / 1024 / 1024, 3),
+            "created_at": header.get("created_at"),
+            "source": header.get("source")
+        }
+
+
+def load_score_table(path=SCORE_TABLE_PATH):
+    """The memory-mapped table, or None if it has not been precomputed yet."""
+    if not os.path.exists(path):
+        return None
+    return ScoreTable(path)
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Precompute the memory-mapped customer score table")
+    parser.add_argument("--source", default="sql",
+                        help='"sql" or a training-view Parquet file/directory '
+                             '(e.g. data/snapshot/churn_training_features.parquet)')
+    parser.add_argument("--batch-scores", default=None,
+                        help="Build from batch_scoring output (e.g. artifacts/batch_scores) instead of rescoring")
+    parser.add_argument("--model", default=MODEL_PATH)
+    parser.add_argument("--output", default=SCORE_TABLE_PATH)
+    args = parser.parse_args()
+
+    precompute_score_table(args.source, args.output, args.model, args.batch_scores)
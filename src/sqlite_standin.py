@@ -0,0 +1,186 @@
+import os
+import sqlite3
+
+import numpy as np
+import pandas as pd
+
+from config.db_config import DB_CONFIG
+from src.synthetic_data import AS_OF_DATE, RANDOM_STATE, generate_chunk
+
+STANDIN_PATH = DB_CONFIG["sqlite_path"]
+STANDIN_ROWS = 100_000
+
+SOURCE_TABLES = ["stg_telco_raw", "customers", "billing", "usage_data", "support_tickets", "churn_labels"]
+DATE_COLUMNS = ["signup_date", "billing_date", "usage_month", "ticket_date", "churn_date"]
+
+
+def _view_sql(as_of):
+    """
+    TCCP.sql sections 6-8 in SQLite. GETDATE() is pinned to `as_of` so the
+    stand-in matches src/synthetic_data.py; AVG over INT truncates as in SQL Server.
+    """
+    as_of = pd.Timestamp(as_of).strftime("%Y-%m-%d")
+    return [
+        """
+        CREATE VIEW vw_support_agg AS
+        SELECT
+            customer_id,
+            COUNT(*) AS support_ticket_count,
+            AVG(resolution_time_hr) AS avg_resolution_time,
+            SUM(satisfaction_score) / COUNT(satisfaction_score) AS avg_satisfaction_score,
+            MAX(ticket_date) AS last_ticket_date
+        FROM support_tickets
+        GROUP BY customer_id
+        """,
+        """
+        CREATE VIEW vw_usage_agg AS
+        SELECT
+            customer_id,
+            AVG(avg_call_minutes) AS avg_call_minutes,
+            AVG(avg_data_usage_gb) AS avg_data_usage_gb
+        FROM usage_data
+        GROUP BY customer_id
+        """,
+        f"""
+        CREATE VIEW vw_churn_training_features AS
+        SELECT
+            c.customer_id,
+            (CAST(strftime('%Y', '{as_of}') AS INTEGER) - CAST(strftime('%Y', c.signup_date) AS INTEGER)) * 12
+                + CAST(strftime('%m', '{as_of}') AS INTEGER) - CAST(strftime('%m', c.signup_date) AS INTEGER)
+                AS tenure_months,
+            c.contract_type,
+            b.monthly_charges,
+            b.total_charges,
+            b.late_payments,
+            b.payment_method,
+            IFNULL(u.avg_call_minutes, 0.0) AS avg_call_minutes,
+            IFNULL(u.avg_data_usage_gb, 0.0) AS avg_data_usage_gb,
+            IFNULL(s.support_ticket_count, 0) AS support_ticket_count,
+            IFNULL(s.avg_resolution_time, 0.0) AS avg_resolution_time,
+            IFNULL(s.avg_satisfaction_score, 0) AS avg_satisfaction_score,
+            CASE WHEN r.OnlineSecurity = 'Yes' THEN 1 ELSE 0 END AS has_online_security,
+            CASE WHEN r.TechSupport = 'Yes' THEN 1 ELSE 0 END AS has_tech_support,
+            (
+                CASE WHEN r.StreamingTV = 'Yes' THEN 1 ELSE 0 END +
+                CASE WHEN r.StreamingMovies = 'Yes' THEN 1 ELSE 0 END
+            ) AS streaming_services_count,
+            ch.churn
+        FROM customers c
+        JOIN billing b ON c.customer_id = b.customer_id
+        LEFT JOIN vw_usage_agg u ON c.customer_id = u.customer_id
+        LEFT JOIN vw_support_agg s ON c.customer_id = s.customer_id
+        JOIN churn_labels ch ON c.customer_id = ch.customer_id
+        JOIN stg_telco_raw r ON c.customer_id = r.customerID
+        """,
+        """
+        CREATE VIEW vw_churn_deployment_features AS
+        SELECT
+            customer_id,
+            tenure_months,
+            contract_type,
+            monthly_charges,
+            payment_method,
+            support_ticket_count,
+            avg_call_minutes,
+            avg_data_usage_gb,
+            churn
+        FROM vw_churn_training_features
+        """
+    ]
+
+
+def _as_sql_dates(df):
+    """DATE columns as 'YYYY-MM-DD' text (NULL for NaT), the form SQLite compares correctly."""
+    converted = {
+        col: df[col].dt.strftime("%Y-%m-%d").astype(object).where(df[col].notna(), None)
+        for col in DATE_COLUMNS if col in df.columns
+    }
+    return df.assign(**converted)
+
+
+def build_standin(n_rows=STANDIN_ROWS, path=STANDIN_PATH, seed=RANDOM_STATE, as_of=AS_OF_DATE):
+    """
+    Build a SQLite copy of CustomerChurnDB: the TCCP.sql source tables filled
+    with synthetic customers, plus the aggregation, training and deployment
+    views. Lets ingestion run without SQL Server.
+    """
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    if os.path.exists(path):
+        os.remove(path)
+
+    conn = sqlite3.connect(path)
+    try:
+        n_chunks = -(-n_rows // 100_000)
+        for chunk_index in range(n_chunks):
+            _, tables = generate_chunk(chunk_index, n_rows, 100_000, seed, as_of, with_tables=True)
+            for name in SOURCE_TABLES:
+                _as_sql_dates(tables[name]).to_sql(name, conn, if_exists="append", index=False)
+
+        conn.execute("CREATE UNIQUE INDEX ix_stg_telco_raw_id ON stg_telco_raw (customerID)")
+        conn.execute("CREATE UNIQUE INDEX ix_customers_id ON customers (customer_id)")
+        conn.execute("CREATE UNIQUE INDEX ix_churn_labels_id ON churn_labels (customer_id)")
+        for name in ["billing", "usage_data", "support_tickets"]:
+            conn.execute(f"CREATE INDEX ix_{name}_id ON {name} (customer_id)")
+        for name, col in [("support_tickets", "ticket_date"), ("churn_labels", "churn_date")]:
+            conn.execute(f"CREATE INDEX ix_{name}_{col} ON {name} ({col})")
+
+        for statement in _view_sql(as_of):
+            conn.execute(statement)
+        conn.commit()
+    finally:
+        conn.close()
+
+    print(f"✅ SQLite stand-in with {n_rows} customers saved to: {path}")
+    return path
+
+
+def append_activity(n_customers, activity_date, path=STANDIN_PATH, churn_fraction=0.2, seed=RANDOM_STATE):
+    """
+    Simulate a day of source activity: one new support ticket for each of
+    `n_customers` random customers, a churn label for `churn_fraction` of them.
+    Returns the affected customer_ids.
+    """
+    rng = np.random.default_rng(seed)
+    day = pd.Timestamp(activity_date).strftime("%Y-%m-%d")
+
+    conn = sqlite3.connect(path)
+    try:
+        ids = pd.read_sql("SELECT customer_id FROM customers", conn)["customer_id"].to_numpy()
+        chosen = rng.choice(ids, size=min(n_customers, len(ids)), replace=False)
+
+        pd.DataFrame({
+            "customer_id": chosen,
+            "ticket_type": "Billing",
+            "resolution_time_hr": rng.integers(2, 72, len(chosen)).astype(np.float64),
+            "satisfaction_score": rng.integers(1, 6, len(chosen)),
+            "ticket_date": day
+        }).to_sql("support_tickets", conn, if_exists="append", index=False)
+
+        churned = chosen[rng.random(len(chosen)) < churn_fraction]
+        conn.executemany(
+            "UPDATE churn_labels SET churn = 1, churn_date = ? WHERE customer_id = ?",
+            [(day, customer_id) for customer_id in churned]
+        )
+        conn.commit()
+    finally:
+        conn.close()
+
+    return sorted(chosen)
+
+
+def use_standin(path=STANDIN_PATH):
+    """Point get_connection() at the SQLite stand-in for this process."""
+    DB_CONFIG["backend"] = "sqlite"
+    DB_CONFIG["sqlite_path"] = path
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Build the SQLite stand-in for CustomerChurnDB")
+    parser.add_argument("--rows", type=int, default=STANDIN_ROWS)
+    parser.add_argument("--path", default=STANDIN_PATH)
+    parser.add_argument("--seed", type=int, default=RANDOM_STATE)
+    args = parser.parse_args()
+
+    build_standin(args.rows, args.path, args.seed)
@@ -0,0 +1,427 @@
+import numpy as np
+import pandas as pd
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+# Output of the CLI: one Parquet file per chunk of the training view
+OUTPUT_DIR = "data/synthetic"
+
+RANDOM_STATE = 42
+CHUNK_SIZE = 100_000
+
+# TCCP.sql anchors signup dates at 2024-01-01 and evaluates the views at GETDATE();
+# a fixed "as of" date keeps generated data reproducible
+SIGNUP_ANCHOR = pd.Timestamp("2024-01-01")
+AS_OF_DATE = pd.Timestamp("2026-02-14")
+
+# ============================================================================
+# STAGING DISTRIBUTIONS (Telco_Customer_Churn.csv marginals)
+# ============================================================================
+CONTRACTS = np.array(["Month-to-month", "One year", "Two year"], dtype=object)
+CONTRACT_P = [0.550, 0.209, 0.241]
+
+# Tenure (months, 1-72) as a scaled Beta per contract; longer contracts skew older
+TENURE_BETA = {0: (0.6, 1.8), 1: (1.3, 0.9), 2: (2.2, 0.6)}
+MAX_TENURE = 72
+ZERO_TENURE_P = 0.0016  # brand-new customers have a blank TotalCharges
+
+PAYMENT_METHODS = np.array([
+    "Electronic check", "Mailed check", "Bank transfer (automatic)", "Credit card (automatic)"
+], dtype=object)
+PAYMENT_P = [0.336, 0.229, 0.219, 0.216]
+
+INTERNET_SERVICES = np.array(["Fiber optic", "DSL", "No"], dtype=object)
+INTERNET_P = [0.440, 0.343, 0.217]
+
+PHONE_SERVICE_P = 0.903
+MULTIPLE_LINES_P = 0.467   # among phone customers
+SENIOR_P = 0.162
+MALE_P = 0.505
+PARTNER_P = 0.483
+DEPENDENTS_P = 0.300
+PAPERLESS_P = 0.592
+
+# Add-on take-up among internet customers
+ADDON_P = {
+    "OnlineSecurity": 0.366,
+    "OnlineBackup": 0.440,
+    "DeviceProtection": 0.439,
+    "TechSupport": 0.370,
+    "StreamingTV": 0.491,
+    "StreamingMovies": 0.496
+}
+
+# Churn logit: contract intercepts calibrated to the CSV's per-contract churn
+# rates (42.7% / 11.3% / 2.8%, 26.5% overall)
+CHURN_INTERCEPT = np.array([0.08, -1.04, -2.04])  # indexed by contract code
+CHURN_COEF = {
+    "tenure": -0.035,
+    "fiber": 0.75,
+    "echeck": 0.45,
+    "tech_support": -0.45,
+    "online_security": -0.45
+}
+
+REGIONS = np.array(["North", "South", "East", "West"], dtype=object)
+TICKET_TYPES = np.array([
+    "Billing Issue", "Technical Issue", "Service Complaint", "Account Management"
+], dtype=object)
+
+# Tickets per customer (TCCP.sql section 5): cumulative thresholds on RAND()
+CHURN_TICKET_CDF = [0.10, 0.25, 0.45, 0.65, 0.80, 0.90]        # -> 1..7 tickets
+NON_CHURN_TICKET_CDF = [0.70, 0.85, 0.95]                      # -> 0..3 tickets
+
+
+def _yes_no(mask):
+    return np.where(mask, "Yes", "No").astype(object)
+
+
+def _month_index(date):
+    return date.year * 12 + date.month - 1
+
+
+def _signup_dates(tenure):
+    """DATEADD(month, -tenure, '2024-01-01'), vectorized."""
+    index = _month_index(SIGNUP_ANCHOR) - tenure
+    return pd.to_datetime(pd.DataFrame({"year": index // 12, "month": index % 12 + 1, "day": 1}))
+
+
+def chunk_rng(seed, chunk_index):
+    """Independent, reproducible generator for one chunk."""
+    return np.random.default_rng([seed, chunk_index])
+
+
+# ============================================================================
+# STAGING TABLE
+# ============================================================================
+def generate_staging(start, n_rows, rng):
+    """stg_telco_raw-shaped rows for customers start..start+n_rows-1."""
+    customer_ids = np.char.add("SYN-", np.char.zfill(np.arange(start, start + n_rows).astype(str), 9))
+
+    contract = rng.choice(3, size=n_rows, p=CONTRACT_P)
+    tenure = np.empty(n_rows, dtype=np.int64)
+    for code, (a, b) in TENURE_BETA.items():
+        mask = contract == code
+        tenure[mask] = 1 + np.floor(rng.beta(a, b, mask.sum()) * MAX_TENURE).astype(np.int64)
+    tenure = np.minimum(tenure, MAX_TENURE)
+    tenure[(contract == 2) & (rng.random(n_rows) < ZERO_TENURE_P / CONTRACT_P[2])] = 0
+
+    phone = rng.random(n_rows) < PHONE_SERVICE_P
+    multiple = phone & (rng.random(n_rows) < MULTIPLE_LINES_P)
+    internet = rng.choice(3, size=n_rows, p=INTERNET_P)
+    has_internet = internet != 2
+
+    addons = {
+        name: has_internet & (rng.random(n_rows) < p) for name, p in ADDON_P.items()
+    }
+    payment = rng.choice(4, size=n_rows, p=PAYMENT_P)
+    senior = (rng.random(n_rows) < SENIOR_P).astype(np.int64)
+
+    # Monthly charges follow the services a customer holds, plus noise
+    monthly = (
+        np.where(phone, 20.0, 0.0) + np.where(multiple, 5.0, 0.0)
+        + np.select([internet == 0, internet == 1], [50.0, 25.0], 0.0)
+        + 5.0 * (addons["OnlineSecurity"].astype(int) + addons["OnlineBackup"]
+                 + addons["DeviceProtection"] + addons["TechSupport"])
+        + 10.0 * (addons["StreamingTV"].astype(int) + addons["StreamingMovies"])
+        + rng.uniform(-2.0, 2.0, n_rows)
+    )
+    monthly = np.round(np.clip(monthly, 18.25, 118.75), 2)
+
+    total = np.round(monthly * tenure * rng.uniform(0.95, 1.05, n_rows), 2)
+    total_text = np.where(tenure == 0, "", total.astype(str)).astype(object)
+
+    logit = (
+        CHURN_INTERCEPT[contract]
+        + CHURN_COEF["tenure"] * tenure
+        + CHURN_COEF["fiber"] * (internet == 0)
+        + CHURN_COEF["echeck"] * (payment == 0)
+        + CHURN_COEF["tech_support"] * addons["TechSupport"]
+        + CHURN_COEF["online_security"] * addons["OnlineSecurity"]
+    )
+    churn = rng.random(n_rows) < 1 / (1 + np.exp(-logit))
+
+    no_internet = np.where(has_internet, "", "No internet service")
+    stg = pd.DataFrame({
+        "customerID": customer_ids.astype(object),
+        "gender": np.where(rng.random(n_rows) < MALE_P, "Male", "Female").astype(object),
+        "SeniorCitizen": senior,
+        "Partner": _yes_no(rng.random(n_rows) < PARTNER_P),
+        "Dependents": _yes_no(rng.random(n_rows) < DEPENDENTS_P),
+        "tenure": tenure,
+        "PhoneService": _yes_no(phone),
+        "MultipleLines": np.where(phone, _yes_no(multiple), "No phone service").astype(object),
+        "InternetService": INTERNET_SERVICES[internet],
+    })
+    for name, mask in addons.items():
+        stg[name] = np.where(has_internet, _yes_no(mask), no_internet).astype(object)
+    stg["Contract"] = CONTRACTS[contract]
+    stg["PaperlessBilling"] = _yes_no(rng.random(n_rows) < PAPERLESS_P)
+    stg["PaymentMethod"] = PAYMENT_METHODS[payment]
+    stg["MonthlyCharges"] = monthly
+    stg["TotalCharges"] = total_text
+    stg["Churn"] = _yes_no(churn)
+    return stg
+
+
+# ============================================================================
+# CORE TABLES (TCCP.sql section 5)
+# ============================================================================
+def build_tables(stg, rng, as_of=AS_OF_DATE):
+    """customers, billing, usage_data, support_tickets and churn_labels from staging rows."""
+    n_rows = len(stg)
+    tenure = stg["tenure"].to_numpy()
+    senior = stg["SeniorCitizen"].to_numpy()
+    is_churn = (stg["Churn"] == "Yes").to_numpy()
+    tech_support = (stg["TechSupport"] == "Yes").to_numpy()
+    as_of = pd.Timestamp(as_of).normalize()
+    billing_date = as_of - pd.DateOffset(months=1)
+
+    customers = pd.DataFrame({
+        "customer_id": stg["customerID"],
+        "gender": stg["gender"],
+        "senior_citizen": senior.astype(bool),
+        "partner": stg["Partner"],
+        "dependents": stg["Dependents"],
+        "age": np.where(senior == 1, 65 + tenure % 20, 25 + tenure % 35),
+        "region": REGIONS[rng.integers(0, 4, n_rows)],
+        "signup_date": _signup_dates(tenure),
+        "contract_type": stg["Contract"]
+    })
+
+    payment = stg["PaymentMethod"]
+    billing = pd.DataFrame({
+        "customer_id": stg["customerID"],
+        "monthly_charges": stg["MonthlyCharges"],
+        "total_charges": pd.to_numeric(stg["TotalCharges"].replace("", np.nan)),
+        "payment_method": payment,
+        "late_payments": np.select(
+            [payment.str.endswith("check").to_numpy(), (stg["Contract"] == "Month-to-month").to_numpy()],
+            [tenure % 3, tenure % 2],
+            0
+        ),
+        "billing_date": billing_date,
+        "paperless_billing": stg["PaperlessBilling"]
+    })
+
+    phone = (stg["PhoneService"] == "Yes").to_numpy()
+    multiple = (stg["MultipleLines"] == "Yes").to_numpy()
+    internet = stg["InternetService"].to_numpy()
+    usage_data = pd.DataFrame({
+        "customer_id": stg["customerID"],
+        "avg_call_minutes": np.select(
+            [phone & multiple, phone],
+            [300 + tenure % 200 + rng.integers(0, 100, n_rows),
+             150 + tenure % 150 + rng.integers(0, 100, n_rows)],
+            0
+        ).astype(np.float64),
+        "avg_data_usage_gb": np.select(
+            [internet == "Fiber optic", internet == "DSL"],
+            [25 + tenure % 25 + rng.integers(0, 20, n_rows),
+             15 + tenure % 20 + rng.integers(0, 15, n_rows)],
+            0
+        ).astype(np.float64),
+        "internet_service": stg["InternetService"],
+        "phone_service": stg["PhoneService"],
+        "multiple_lines": stg["MultipleLines"],
+        "usage_month": billing_date
+    })
+
+    # Ticket counts depend on churn; one row per ticket
+    rand_val = rng.random(n_rows)
+    ticket_counts = np.where(
+        is_churn,
+        1 + np.searchsorted(CHURN_TICKET_CDF, rand_val, side="right"),
+        np.searchsorted(NON_CHURN_TICKET_CDF, rand_val, side="right")
+    )
+    owner = np.repeat(np.arange(n_rows), ticket_counts)
+    n_tickets = len(owner)
+    owner_tech = tech_support[owner]
+    support_tickets = pd.DataFrame({
+        "customer_id": stg["customerID"].to_numpy()[owner],
+        "ticket_type": TICKET_TYPES[rng.integers(0, 4, n_tickets)],
+        "resolution_time_hr": np.where(
+            owner_tech, 2 + rng.integers(0, 24, n_tickets), 24 + rng.integers(0, 48, n_tickets)
+        ).astype(np.float64),
+        "satisfaction_score": np.where(
+            owner_tech, 4 + rng.integers(0, 2, n_tickets), 1 + rng.integers(0, 3, n_tickets)
+        ),
+        "ticket_date": as_of - pd.to_timedelta(tenure[owner] % 30, unit="D")
+    })
+
+    churn_labels = pd.DataFrame({
+        "customer_id": stg["customerID"],
+        "churn": is_churn.astype(np.int64),
+        "churn_date": pd.Series(
+            as_of - pd.to_timedelta(rng.integers(0, 30, n_rows), unit="D")
+        ).where(is_churn)
+    })
+
+    return {
+        "customers": customers,
+        "billing": billing,
+        "usage_data": usage_data,
+        "support_tickets": support_tickets,
+        "churn_labels": churn_labels
+    }
+
+
+# ============================================================================
+# VIEWS (TCCP.sql sections 6-7)
+# ============================================================================
+def training_view(stg, tables, as_of=AS_OF_DATE):
+    """vw_churn_training_features rows, with the view's aggregation semantics."""
+    as_of = pd.Timestamp(as_of).normalize()
+    customers = tables["customers"]
+    customer_index = pd.Index(customers["customer_id"])
+
+    # vw_support_agg: COUNT, AVG over DECIMAL, integer AVG over INT satisfaction
+    tickets = tables["support_tickets"]
+    owner = customer_index.get_indexer(tickets["customer_id"])
+    n_customers = len(customers)
+    ticket_count = np.bincount(owner, minlength=n_customers)
+    has_tickets = ticket_count > 0
+    safe_count = np.maximum(ticket_count, 1)
+    resolution_sum = np.bincount(owner, weights=tickets["resolution_time_hr"].to_numpy(), minlength=n_customers)
+    satisfaction_sum = np.bincount(owner, weights=tickets["satisfaction_score"].to_numpy(), minlength=n_customers)
+
+    # vw_usage_agg: one usage row per customer, so AVG is the row value
+    usage = tables["usage_data"]
+    billing = tables["billing"]
+
+    signup_month = (
+        customers["signup_date"].dt.year.to_numpy() * 12 + customers["signup_date"].dt.month.to_numpy() - 1
+    )
+
+    return pd.DataFrame({
+        "customer_id": customers["customer_id"].to_numpy(),
+        "tenure_months": (_month_index(as_of) - signup_month).astype(np.int64),
+        "contract_type": customers["contract_type"].to_numpy(),
+        "monthly_charges": billing["monthly_charges"].to_numpy(),
+        "total_charges": billing["total_charges"].to_numpy(),
+        "late_payments": billing["late_payments"].to_numpy(),
+        "payment_method": billing["payment_method"].to_numpy(),
+        "avg_call_minutes": usage["avg_call_minutes"].to_numpy(),
+        "avg_data_usage_gb": usage["avg_data_usage_gb"].to_numpy(),
+        "support_ticket_count": ticket_count,
+        "avg_resolution_time": np.where(has_tickets, np.round(resolution_sum / safe_count, 6), 0.0),
+        "avg_satisfaction_score": np.where(has_tickets, satisfaction_sum.astype(np.int64) // safe_count, 0),
+        "has_online_security": (stg["OnlineSecurity"] == "Yes").to_numpy().astype(np.int64),
+        "has_tech_support": (stg["TechSupport"] == "Yes").to_numpy().astype(np.int64),
+        "streaming_services_count": (
+            (stg["StreamingTV"] == "Yes").to_numpy().astype(np.int64)
+            + (stg["StreamingMovies"] == "Yes").to_numpy()
+        ),
+        "churn": tables["churn_labels"]["churn"].to_numpy()
+    })
+
+
+# ============================================================================
+# CHUNKED GENERATION
+# ============================================================================
+def generate_chunk(chunk_index, n_rows=CHUNK_SIZE, chunk_size=CHUNK_SIZE,
+                   seed=RANDOM_STATE, as_of=AS_OF_DATE, with_tables=False):
+    """
+    Generate one chunk of the customer base. Chunk k always holds customers
+    k*chunk_size .. and is seeded by (seed, k) alone, so any chunk can be
+    regenerated independently and in parallel with identical results.
+    """
+    start = chunk_index * chunk_size
+    rows = min(chunk_size, n_rows - start)
+    rng = chunk_rng(seed, chunk_index)
+
+    stg = generate_staging(start, rows, rng)
+    tables = build_tables(stg, rng, as_of)
+    view = training_view(stg, tables, as_of)
+
+    if with_tables:
+        tables["stg_telco_raw"] = stg
+        return view, tables
+    return view
+
+
+def iter_synthetic_data(n_rows, chunk_size=CHUNK_SIZE, seed=RANDOM_STATE, as_of=AS_OF_DATE):
+    """Stream vw_churn_training_features-shaped chunks (same shape as iter_churn_data)."""
+    n_chunks = -(-n_rows // chunk_size)
+    for chunk_index in range(n_chunks):
+        yield generate_chunk(chunk_index, n_rows, chunk_size, seed, as_of)
+
+
+def generate_synthetic_data(n_rows, chunk_size=CHUNK_SIZE, seed=RANDOM_STATE, as_of=AS_OF_DATE):
+    """The whole synthetic training view as one DataFrame (for in-memory sizes)."""
+    return pd.concat(list(iter_synthetic_data(n_rows, chunk_size, seed, as_of)), ignore_index=True)
+
+
+def _write_chunk(chunk_index, n_rows, chunk_size, seed, as_of, output_dir, with_tables):
+    """Generate one chunk and write it (and optionally the raw tables) as Parquet."""
+    result = generate_chunk(chunk_index, n_rows, chunk_size, seed, as_of, with_tables)
+    name = f"part-{chunk_index:05d}.parquet"
+
+    if with_tables:
+        view, tables = result
+        for table_name, table in tables.items():
+            table_dir = os.path.join(output_dir, table_name)
+            os.makedirs(table_dir, exist_ok=True)
+            table.to_parquet(os.path.join(table_dir, name), index=False)
+    else:
+        view = result
+
+    view_dir = os.path.join(output_dir, "vw_churn_training_features")
+    os.makedirs(view_dir, exist_ok=True)
+    view.to_parquet(os.path.join(view_dir, name), index=False)
+    return len(view)
+
+
+def write_synthetic_parquet(n_rows, output_dir=OUTPUT_DIR, chunk_size=CHUNK_SIZE, seed=RANDOM_STATE,
+                            as_of=AS_OF_DATE, with_tables=False, workers=1):
+    """
+    Write the synthetic training view as chunked Parquet (one file per chunk),
+    optionally alongside the raw tables it was derived from.
+    """
+    print("\n" + "="*60)
+    print("SYNTHETIC DATA GENERATION")
+    print("="*60)
+
+    n_chunks = -(-n_rows // chunk_size)
+    print(f"\n📊 Rows: {n_rows} | Chunks: {n_chunks} x {chunk_size} | Seed: {seed}")
+    print(f"📅 As of: {pd.Timestamp(as_of).date()}")
+    print(f"⚙️  Workers: {workers}")
+
+    start_time = time.time()
+    args = [(i, n_rows, chunk_size, seed, as_of, output_dir, with_tables) for i in range(n_chunks)]
+
+    if workers > 1:
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            written = sum(executor.map(_write_chunk, *zip(*args)))
+    else:
+        written = sum(_write_chunk(*a) for a in args)
+
+    elapsed = time.time() - start_time
+    print(f"\n⏱️  Generated {written} rows in {elapsed:.2f}s ({written / max(elapsed, 1e-9):.0f} rows/s)")
+    print(f"✅ Synthetic data written to: {output_dir}")
+    return written
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Synthetic CustomerChurnDB data mirroring TCCP.sql")
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    parser.add_argument("--chunk-size", type=int, default=CHUNK_SIZE)
+    parser.add_argument("--seed", type=int, default=RANDOM_STATE)
+    parser.add_argument("--as-of", default=str(AS_OF_DATE.date()))
+    parser.add_argument("--output-dir", default=OUTPUT_DIR)
+    parser.add_argument("--tables", action="store_true", help="Also write the raw tables")
+    parser.add_argument("--workers", type=int, default=1)
+    args = parser.parse_args()
+
+    write_synthetic_parquet(
+        n_rows=args.rows,
+        output_dir=args.output_dir,
+        chunk_size=args.chunk_size,
+        seed=args.seed,
+        as_of=pd.Timestamp(args.as_of),
+        with_tables=args.tables,
+        workers=args.workers
+    )
@@ -4,6 +4,43 @@ from sklearn.metrics import precision_score, recall_score, f1_score, accuracy_sc
 import os
 
 from src.model_training import load_all_models, MODELS_ARTIFACT_PATH
+from src.prediction_store import get_test_probabilities
+
+
+def threshold_metrics(y_test, y_prob, thresholds):
+    """
+    Accuracy, precision, recall, F1 and confusion counts at each threshold.
+    """
+    results = []
+    
+    for t in thresholds:
+        y_pred = (y_prob >= t).astype(int)
+        
+        # Calculate metrics
+        precision = precision_score(y_test, y_pred, zero_division=0)
+        recall = recall_score(y_test, y_pred, zero_division=0)
+        f1 = f1_score(y_test, y_pred, zero_division=0)
+        accuracy = accuracy_score(y_test, y_pred)
+        
+        # Calculate confusion matrix
+        tn = np.sum((y_test == 0) & (y_pred == 0))
+        fp = np.sum((y_test == 0) & (y_pred == 1))
+        fn = np.sum((y_test == 1) & (y_pred == 0))
+        tp = np.sum((y_test == 1) & (y_pred == 1))
+        
+        results.append({
+            "threshold": round(t, 2),
+            "accuracy": round(accuracy, 4),
+            "precision": round(precision, 4),
+            "recall": round(recall, 4),
+            "f1_score": round(f1, 4),
+            "true_positives": tp,
+            "false_positives": fp,
+            "true_negatives": tn,
+            "false_negatives": fn,
+        })
+    
+    return pd.DataFrame(results)
 
 
 def threshold_tuning():
@@ -45,44 +82,14 @@ def threshold_tuning():
     model = models["LogisticRegression"]
     print(f"\n🔍 Calculating thresholds for: LogisticRegression")
     
-    # Get predicted probabilities for churn = 1
-    y_prob = model.predict_proba(X_test)[:, 1]
+    # Get predicted probabilities for churn = 1 (reused from evaluate_models when cached)
+    y_prob = get_test_probabilities("LogisticRegression", model, X_test)
     
     # Test thresholds from 0.1 to 0.9 in steps of 0.01
     thresholds = np.arange(0.1, 0.9, 0.01)
-    results = []
     
     print(f"\n📊 Calculating metrics for {len(thresholds)} thresholds...")
-    
-    for t in thresholds:
-        y_pred = (y_prob >= t).astype(int)
-        
-        # Calculate metrics
-        precision = precision_score(y_test, y_pred, zero_division=0)
-        recall = recall_score(y_test, y_pred, zero_division=0)
-        f1 = f1_score(y_test, y_pred, zero_division=0)
-        accuracy = accuracy_score(y_test, y_pred)
-        
-        # Calculate confusion matrix
-        tn = np.sum((y_test == 0) & (y_pred == 0))
-        fp = np.sum((y_test == 0) & (y_pred == 1))
-        fn = np.sum((y_test == 1) & (y_pred == 0))
-        tp = np.sum((y_test == 1) & (y_pred == 1))
-        
-        results.append({
-            "threshold": round(t, 2),
-            "accuracy": round(accuracy, 4),
-            "precision": round(precision, 4),
-            "recall": round(recall, 4),
-            "f1_score": round(f1, 4),
-            "true_positives": tp,
-            "false_positives": fp,
-            "true_negatives": tn,
-            "false_negatives": fn,
-        })
-    
-    # Create DataFrame
-    results_df = pd.DataFrame(results)
+    results_df = threshold_metrics(y_test, y_prob, thresholds)
     
     # Save to CSV
     output_path = "logs/threshold_tuning_results.csv"
@@ -0,0 +1,112 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.data_cleaning import clean_data
+from src.data_ingestion import apply_dtype_plan
+from src.feature_engineering import engineer_features
+from src.synthetic_data import generate_synthetic_data
+
+
+# ============================================================================
+# REFERENCE: clean_data / engineer_features as originally written
+# ============================================================================
+def reference_clean_data(df):
+    df = df.copy()
+    df = df[df["churn"].isin([0, 1])]
+
+    cx_cols = ["support_ticket_count", "avg_resolution_time", "avg_satisfaction_score"]
+    df[cx_cols] = df[cx_cols].fillna(0)
+    usage_cols = ["avg_call_minutes", "avg_data_usage_gb"]
+    df[usage_cols] = df[usage_cols].fillna(0)
+    df["late_payments"] = df["late_payments"].fillna(0)
+    df["total_charges"] = df["total_charges"].fillna(df["monthly_charges"] * df["tenure_months"])
+
+    for col in ["contract_type", "payment_method"]:
+        df[col] = df[col].astype(str).str.strip().str.lower()
+
+    def cap_outliers(series, lower_q=0.01, upper_q=0.99):
+        return series.clip(series.quantile(lower_q), series.quantile(upper_q))
+
+    for col in ["monthly_charges", "total_charges", "avg_call_minutes",
+                "avg_data_usage_gb", "support_ticket_count", "late_payments"]:
+        df[col] = cap_outliers(df[col])
+    return df
+
+
+def reference_engineer_features(df):
+    df = df.copy()
+    df["tenure_bucket"] = pd.cut(
+        df["tenure_months"],
+        bins=[0, 6, 12, 24, 48, 1000],
+        labels=["0-6", "6-12", "12-24", "24-48", "48+"]
+    )
+    df["charges_per_month"] = df["total_charges"] / (df["tenure_months"] + 1)
+    df["high_price_flag"] = (df["monthly_charges"] > df["monthly_charges"].median()).astype(int)
+    df["engagement_score"] = 0.4 * df["avg_call_minutes"] + 0.6 * df["avg_data_usage_gb"]
+    df["cx_risk_score"] = df["support_ticket_count"] * (5 - df["avg_satisfaction_score"])
+    df["payment_risk"] = (df["late_payments"] > 0).astype(int)
+    df["stickiness_score"] = df["has_online_security"] + df["has_tech_support"] + df["streaming_services_count"]
+    return df
+
+
+# ============================================================================
+# FIXTURES
+# ============================================================================
+def messy_view(n_rows=5000, seed=7):
+    """Synthetic training view with missing values, invalid targets and untidy category strings."""
+    rng = np.random.default_rng(seed)
+    df = generate_synthetic_data(n_rows)
+
+    for col in ["support_ticket_count", "avg_resolution_time", "avg_satisfaction_score",
+                "avg_call_minutes", "avg_data_usage_gb", "late_payments", "total_charges"]:
+        df[col] = df[col].astype(np.float64).mask(rng.random(n_rows) < 0.05)
+
+    churn = df["churn"].astype(np.float64)
+    churn[rng.random(n_rows) < 0.03] = 2
+    churn[rng.random(n_rows) < 0.03] = -1
+    churn[rng.random(n_rows) < 0.03] = np.nan
+    df["churn"] = churn
+
+    for col in ["contract_type", "payment_method"]:
+        values = df[col].astype(object)
+        messy = rng.random(n_rows)
+        values = values.where(messy >= 0.1, "  " + values.str.upper() + " ")
+        values = values.where((messy < 0.1) | (messy >= 0.2), values.str.title() + "\t")
+        df[col] = values.mask(messy > 0.98)
+    return df
+
+
+@pytest.fixture(scope="module")
+def view():
+    return messy_view()
+
+
+# ============================================================================
+# TESTS
+# ============================================================================
+@pytest.mark.parametrize("inplace", [False, True])
+def test_clean_data_matches_reference(view, inplace):
+    expected = reference_clean_data(view)
+    result = clean_data(view.copy(), inplace=inplace)
+    pd.testing.assert_frame_equal(result, expected)
+
+
+@pytest.mark.parametrize("inplace", [False, True])
+def test_engineer_features_matches_reference(view, inplace):
+    expected = reference_engineer_features(reference_clean_data(view))
+    result = engineer_features(clean_data(view.copy(), inplace=inplace), inplace=inplace)
+    pd.testing.assert_frame_equal(result, expected)
+
+
+def test_inplace_matches_default_with_dtype_plan(view):
+    planned = apply_dtype_plan(view.dropna(subset=["churn"]))
+    expected = engineer_features(clean_data(planned))
+    result = engineer_features(clean_data(planned.copy(), inplace=True), inplace=True)
+    pd.testing.assert_frame_equal(result, expected)
+
+
+def test_default_mode_leaves_input_untouched(view):
+    before = view.copy()
+    engineer_features(clean_data(view))
+    pd.testing.assert_frame_equal(view, before)